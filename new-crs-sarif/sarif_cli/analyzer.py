@@ -1,96 +1,387 @@
 """
 SAST 분석 실행 모듈 - 다양한 SAST 도구 통합
 """
+import hashlib
+import os
+import shlex
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from pathlib import Path
-from typing import Set, List, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 from loguru import logger
 
-from sarif_cli.core.detector import get_files_by_language
+from sarif_cli.config.settings import config
+from sarif_cli.core import fastjson
+from sarif_cli.core.cache import ResultCache, file_digest, files_fingerprint, get_result_cache
+from sarif_cli.core.cmd import get_tool_version, write_javac_argfile
+from sarif_cli.core.detector import LANGUAGE_EXTENSIONS, FileIndex, get_file_index
 from sarif_cli.models.vulnerability import VulnerabilityResult
 
+# 래퍼 모듈은 import 시점에 한 번만 확인
+try:
+    from sarif_cli.wrappers.codeql.wrapper import CodeQLWrapper
+    HAS_CODEQL = True
+except ImportError:
+    CodeQLWrapper = None
+    HAS_CODEQL = False
 
-def analyze_with_codeql(project_dir: Path, language: str) -> List[VulnerabilityResult]:
+try:
+    from sarif_cli.wrappers.joern_wrapper import JoernAnalyzer
+    HAS_JOERN = True
+except ImportError:
+    JoernAnalyzer = None
+    HAS_JOERN = False
+
+try:
+    from sarif_cli.wrappers.spotbugs_wrapper import SpotBugsWrapper
+    HAS_SPOTBUGS = True
+except ImportError:
+    SpotBugsWrapper = None
+    HAS_SPOTBUGS = False
+
+try:
+    from sarif_cli.wrappers.bandit_wrapper import BanditAnalyzer
+    HAS_BANDIT = True
+except ImportError:
+    BanditAnalyzer = None
+    HAS_BANDIT = False
+
+try:
+    from sarif_cli.wrappers.semgrep_wrapper import SemgrepAnalyzer
+    HAS_SEMGREP = True
+except ImportError:
+    SemgrepAnalyzer = None
+    HAS_SEMGREP = False
+
+
+# CodeQL 빌드 스크립트에서 컴파일할 소스 확장자
+C_SOURCE_SUFFIXES = (".c",)
+CPP_SOURCE_SUFFIXES = (".cpp", ".cc", ".cxx")
+
+# 증분 분석에서 한 번의 도구 실행에 넘길 최대 파일 수 (파일 목록은 명령행 인자이므로 ARG_MAX를 넘지 않도록)
+INCREMENTAL_BATCH_SIZE = 500
+
+
+def _relative_path(file: str, base_prefix: str, path_cache: Dict[str, Path]) -> Path:
+    """
+    결과 파일 경로를 base 기준 상대 경로로 변환합니다.
+    같은 파일에서 여러 결과가 나오는 경우가 많으므로 문자열 단위로 캐시합니다.
+
+    Args:
+        file: 도구가 보고한 파일 경로
+        base_prefix: 구분자로 끝나는 base 경로 문자열 (예: "/work/")
+        path_cache: 파일 문자열 -> 변환 결과 캐시
+    """
+    file_path = path_cache.get(file)
+    if file_path is None:
+        # Try to construct a relative path to the project
+        if file.startswith(base_prefix):
+            file_path = Path(file[len(base_prefix):])
+        else:
+            file_path = Path(file)
+        path_cache[file] = file_path
+    return file_path
+
+
+# 기본 메시지 형식 "<rule_name>: <message>" (미리 바인딩한 format 메서드)
+_default_message: Callable[[Dict[str, Any]], str] = "{0[rule_name]}: {0[message]}".format
+
+
+def _to_results(
+    raw_results: Iterable[Dict[str, Any]],
+    project_dir: Path,
+    default_tool: str,
+    msg_fmt: Callable[[Dict[str, Any]], str] = _default_message,
+    default_severity: str = "warning",
+) -> List[VulnerabilityResult]:
+    """
+    래퍼 결과(dict)를 VulnerabilityResult 리스트로 변환합니다.
+
+    Args:
+        raw_results: 래퍼가 반환한 결과 (제너레이터 가능)
+        project_dir: 프로젝트 디렉토리 (상대 경로 계산 기준)
+        default_tool: 결과에 tool_name이 없을 때 사용할 도구 이름
+        msg_fmt: 결과 dict로부터 메시지를 만드는 함수
+        default_severity: 결과에 severity가 없을 때 사용할 값
+
+    Returns:
+        취약점 결과 리스트
+    """
+    base_prefix = os.path.join(str(project_dir.parent), "")
+    path_cache: Dict[str, Path] = {}
+    get_required = itemgetter("file", "line", "rule_id")
+
+    results = []
+    for r in raw_results:
+        file, line, rule_id = get_required(r)
+        results.append(
+            VulnerabilityResult(
+                file_path=_relative_path(file, base_prefix, path_cache),
+                line=line,
+                column=1,
+                rule_id=rule_id,
+                message=msg_fmt(r),
+                severity=r.get("severity", default_severity),
+                tool_name=r.get("tool_name", default_tool),
+                tool_metadata=r.get("tool_metadata", {}),
+            )
+        )
+    return results
+
+
+# 캐시에서 결과의 tool_metadata 대신 저장하는 키 (tool_metadata 자체는 kv 테이블에 한 번만 저장)
+_TOOL_METADATA_KEY = "tool_metadata_key"
+
+
+def _pack_tool_metadata(
+    cache: ResultCache,
+    result: Dict[str, Any],
+    tools: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    캐시에 저장할 결과의 tool_metadata(SARIF run.tool, 규칙 목록 포함)를 키로 바꿉니다.
+    같은 run의 결과는 같은 객체를 공유하므로 결과마다 규칙 목록 전체를 직렬화하지 않습니다.
+    """
+    tool = result.get("tool_metadata")
+    if not tool:
+        return result
+    key = next((k for k, v in tools.items() if v is tool), None)
+    if key is None:
+        key = hashlib.blake2b(fastjson.dumps(tool).encode(), digest_size=16).hexdigest()
+        tools[key] = tool
+        cache.put_value("tool_metadata", key, tool)
+    packed = {k: v for k, v in result.items() if k != "tool_metadata"}
+    packed[_TOOL_METADATA_KEY] = key
+    return packed
+
+
+def _unpack_tool_metadata(
+    cache: ResultCache,
+    result: Dict[str, Any],
+    tools: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """_pack_tool_metadata로 저장한 결과의 tool_metadata를 복원합니다 (같은 키는 같은 객체)."""
+    key = result.pop(_TOOL_METADATA_KEY, None)
+    if key is None:
+        return result
+    tool = tools.get(key)
+    if tool is None:
+        tool = tools[key] = cache.get_value("tool_metadata", key) or {}
+    result["tool_metadata"] = tool
+    return result
+
+
+def _run_incremental(
+    tool_name: str,
+    language: str,
+    project_dir: Path,
+    files: List[Path],
+    tool_version: str,
+    run: Callable[[List[Path]], Iterable[Dict[str, Any]]],
+    completed: Callable[[], bool],
+) -> List[Dict[str, Any]]:
+    """
+    파일 해시 기반 캐시를 사용하여 변경된 파일만 도구로 분석합니다.
+
+    파일 단위 규칙만 사용하는 도구(Bandit, Semgrep)에만 사용해야 합니다.
+    캐시에는 project_dir 기준 상대 경로로 저장하고, 반환 시 원래 형식으로 복원합니다.
+
+    Args:
+        tool_name: 도구 이름 (캐시 키)
+        language: 언어 (캐시 키)
+        project_dir: 프로젝트 디렉토리
+        files: 분석 대상 파일 목록 (FileIndex의 절대 경로)
+        tool_version: 도구 버전 (캐시 키)
+        run: 분석할 파일 목록을 받아 래퍼 결과를 반환하는 함수
+        completed: 마지막 run이 끝까지 성공했는지 반환하는 함수 (실패한 실행의 결과는 캐시하지 않음)
+
+    Returns:
+        래퍼 결과 리스트 (캐시된 결과 + 새로 분석한 결과)
+    """
+    cache = get_result_cache(config.CACHE_DIR)
+    source_root = project_dir.resolve()
+
+    results: List[Dict[str, Any]] = []
+    misses: Dict[str, str] = {}  # 상대 경로 -> digest
+    tools: Dict[str, Dict[str, Any]] = {}  # tool_metadata 키 -> 객체 (결과들이 같은 객체를 공유)
+    for file in files:
+        rel = file.relative_to(source_root).as_posix()
+        digest = file_digest(file)
+        cached = cache.get(tool_name, language, rel, digest, tool_version)
+        if cached is None:
+            misses[rel] = digest
+            continue
+        for r in cached:
+            results.append(_unpack_tool_metadata(cache, {**r, "file": str(project_dir / r["file"])}, tools))
+
+    logger.info(
+        f"[{tool_name}] {language} 증분 분석: 캐시 적중 {len(files) - len(misses)}개, "
+        f"재분석 {len(misses)}개 파일"
+    )
+    if not misses:
+        return results
+
+    pending = list(misses)
+    for start in range(0, len(pending), INCREMENTAL_BATCH_SIZE):
+        batch = pending[start:start + INCREMENTAL_BATCH_SIZE]
+        fresh: Dict[str, List[Dict[str, Any]]] = {rel: [] for rel in batch}
+        for r in run([project_dir / rel for rel in batch]):
+            results.append(r)
+            try:
+                rel = Path(os.path.abspath(r["file"])).relative_to(source_root).as_posix()
+            except ValueError:
+                continue
+            if rel in fresh:
+                fresh[rel].append(_pack_tool_metadata(cache, {**r, "file": rel}, tools))
+
+        # 시간 초과, 오류 종료, 출력 파싱 실패 등으로 끝나지 않은 실행은 결과가 없는 것과 구분할 수 없으므로 캐시하지 않음
+        if not completed():
+            logger.warning(f"[{tool_name}] {language} 분석이 완료되지 않아 {len(batch)}개 파일의 결과를 캐시하지 않습니다.")
+            continue
+        for rel, file_results in fresh.items():
+            cache.put(tool_name, language, rel, misses[rel], tool_version, file_results)
+
+    return results
+
+
+def _java_build_command(project_dir: Path, file_index: FileIndex, build_files: List[Path]) -> Optional[str]:
+    """
+    인덱싱된 Java 소스를 임시 javac 인자 파일에 기록하고 빌드 명령어를 반환합니다.
+
+    Args:
+        project_dir: 프로젝트 디렉토리 (인자 파일 안의 경로 기준, 빌드 실행 위치)
+        file_index: 파일 인덱스
+        build_files: 생성한 임시 파일을 추가할 리스트 (호출부에서 정리)
+
+    Returns:
+        "javac @<인자 파일 절대 경로>" (Java 소스가 없으면 None)
+    """
+    java_files = file_index.get(".java")
+    if not java_files:
+        return None
+    with tempfile.NamedTemporaryFile(prefix="codeql_javac_", suffix=".txt", delete=False) as tmp:
+        argfile = Path(tmp.name)
+    build_files.append(argfile)
+    source_root = project_dir.resolve()
+    write_javac_argfile(argfile, (f.relative_to(source_root) for f in java_files))
+    return f"javac @{argfile}"
+
+
+def _cpp_build_lines(file_index: FileIndex, source_root: Path) -> List[str]:
+    """
+    C/C++ 소스를 병렬 컴파일하는 빌드 스크립트 라인을 생성합니다.
+
+    Args:
+        file_index: 파일 인덱스
+        source_root: resolve된 프로젝트 디렉토리 (상대 경로 기준)
+
+    Returns:
+        스크립트 라인 리스트 (컴파일할 소스가 없으면 빈 리스트)
+    """
+    c_files = file_index.get(*C_SOURCE_SUFFIXES)
+    cpp_files = file_index.get(*CPP_SOURCE_SUFFIXES)
+    all_files = c_files + cpp_files
+    if not all_files:
+        return []
+
+    compiler = "g++" if cpp_files else "gcc"
+    # Compile files individually to avoid object file collisions and ensure CodeQL traces all of them
+    compile_args = []
+    for file in all_files:
+        rel_path = file.relative_to(source_root)
+        obj_file = str(rel_path).replace("/", "_") + ".o"
+        compile_args += [shlex.quote(str(rel_path)), shlex.quote(obj_file)]
+    # (소스, 오브젝트) 쌍을 xargs로 넘겨 코어 수만큼 병렬 컴파일
+    # CodeQL tracer는 각 컴파일러 exec를 개별적으로 추적함
+    return [
+        f"printf '%s\\0' {' '.join(compile_args)} \\",
+        f"  | xargs -0 -n 2 -P \"$(nproc)\" sh -c 'exec {compiler} -c \"$0\" -o \"$1\"'",
+    ]
+
+
+def _write_build_script(lines: List[str], build_files: List[Path]) -> str:
+    """
+    CodeQL 빌드 스크립트를 시스템 임시 디렉토리에 작성합니다.
+    sh -c 인용 문제를 피하기 위해 명령을 직접 넘기지 않고 스크립트로 실행합니다.
+    분석 대상 트리 밖에 고유한 이름으로 만들므로 CodeQL이 추출하지 않고 동시 실행끼리 충돌하지 않습니다.
+
+    Args:
+        lines: 스크립트 본문 라인
+        build_files: 생성한 임시 파일을 추가할 리스트 (호출부에서 정리)
+
+    Returns:
+        CodeQL에 넘길 빌드 명령어 (스크립트 절대 경로)
+    """
+    with tempfile.NamedTemporaryFile("w", prefix="build_codeql_", suffix=".sh", delete=False) as f:
+        build_files.append(Path(f.name))
+        f.write("#!/bin/bash\n")
+        f.write("set -eo pipefail\n")  # Stop on error
+        for line in lines:
+            f.write(line + "\n")
+    os.chmod(f.name, 0o755)
+    return f.name
+
+
+def _remove_build_files(build_files: List[Path]) -> None:
+    """빌드용으로 만든 임시 파일(스크립트, 인자 파일) 삭제"""
+    for path in build_files:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def analyze_with_codeql(
+    project_dir: Path,
+    language: str,
+    file_index: Optional[FileIndex] = None,
+) -> List[VulnerabilityResult]:
     """
     CodeQL을 사용하여 코드 분석
     
     Args:
         project_dir: 프로젝트 디렉토리
         language: 분석할 언어
+        file_index: 미리 생성된 파일 인덱스 (없으면 새로 조회)
     
     Returns:
         취약점 결과 리스트
     """
     logger.info(f"CodeQL 분석 시작 ({language})")
     
+    if not HAS_CODEQL:
+        logger.warning("CodeQL wrapper를 찾을 수 없습니다. CodeQL 분석을 건너뜁니다.")
+        return []
+    
     try:
-        from sarif_cli.wrappers.codeql.wrapper import CodeQLWrapper
-        
         codeql_wrapper = CodeQLWrapper()
         
-        # TODO: This is a temporary solution for simple projects.
-        # A more robust solution should detect the build system (e.g., make, maven, gradle).
-        build_command = None
-        if language == "java":
-            java_files = list(project_dir.rglob("*.java"))
-            if java_files:
-                # Use find command to compile all Java files
-                build_command = 'find . -name "*.java" -exec javac {} +'
-        elif language in ["c", "cpp"]:
-            c_files = list(project_dir.rglob("*.c"))
-            cpp_files = list(project_dir.rglob("*.cpp"))
-            all_files = c_files + cpp_files
-            if all_files:
-                compiler = "g++" if cpp_files else "gcc"
-                # Compile files individually to avoid object file collisions and ensure CodeQL traces all of them
-                # Create a temporary build script to avoid quoting issues with sh -c
-                build_script_path = project_dir / "build_codeql.sh"
-                with open(build_script_path, "w") as f:
-                    f.write("#!/bin/bash\n")
-                    f.write("set -e\n") # Stop on error
-                    for file in all_files:
-                        rel_path = file.relative_to(project_dir)
-                        obj_file = str(rel_path).replace("/", "_") + ".o"
-                        f.write(f"{compiler} -c {str(rel_path)} -o {obj_file}\n")
-                
-                import os
-                os.chmod(build_script_path, 0o755)
-                
-                build_command = f"./{build_script_path.name}"
+        if file_index is None:
+            file_index = get_file_index(project_dir)
 
+        build_files: List[Path] = []
         try:
+            # TODO: This is a temporary solution for simple projects.
+            # A more robust solution should detect the build system (e.g., make, maven, gradle).
+            build_command = None
+            if language == "java":
+                # 소스 목록을 인자 파일로 넘겨 ARG_MAX와 무관하게 javac 한 번으로 컴파일
+                build_command = _java_build_command(project_dir, file_index, build_files)
+            elif language in ["c", "cpp"]:
+                compile_lines = _cpp_build_lines(file_index, project_dir.resolve())
+                if compile_lines:
+                    build_command = _write_build_script(compile_lines, build_files)
+
+            # 래퍼는 제너레이터이므로 빌드 파일을 지우기 전에 모두 소비
             raw_results = codeql_wrapper.analyze(
                 project_dir=project_dir,
                 language=language,
                 build_command=build_command,
             )
+            results = _to_results(raw_results, project_dir, "CodeQL")
         finally:
-            # Clean up build script if it exists
-            if build_command and "build_codeql.sh" in str(build_command):
-                build_script_path = project_dir / "build_codeql.sh"
-                if build_script_path.exists():
-                    try:
-                        build_script_path.unlink()
-                    except Exception:
-                        pass
-        
-        results = []
-        for r in raw_results:
-            # Try to construct a relative path to the project
-            try:
-                file_path = Path(r["file"]).relative_to(project_dir.parent)
-            except ValueError:
-                file_path = Path(r["file"])
-
-            results.append(VulnerabilityResult(
-                file_path=file_path,
-                line=r["line"],
-                column=1,
-                rule_id=r["rule_id"],
-                message=f"{r['rule_name']}: {r['message']}",
-                severity=r["severity"],
-                tool_name=r.get("tool_name", "CodeQL"),
-                tool_metadata=r.get("tool_metadata", {}),
-            ))
+            _remove_build_files(build_files)
             
         logger.info(f"CodeQL 분석 완료 ({language}): {len(results)}개 발견")
         return results
@@ -100,6 +391,77 @@ def analyze_with_codeql(project_dir: Path, language: str) -> List[VulnerabilityR
         return []
 
 
+def analyze_with_codeql_multi(
+    project_dir: Path,
+    languages: List[str],
+    file_index: Optional[FileIndex] = None,
+) -> List[VulnerabilityResult]:
+    """
+    여러 언어를 하나의 CodeQL 데이터베이스 클러스터로 분석
+    소스 추출과 빌드를 한 번만 수행하고 언어별 쿼리만 따로 실행합니다.
+
+    Args:
+        project_dir: 프로젝트 디렉토리
+        languages: 분석할 언어 목록
+        file_index: 미리 생성된 파일 인덱스 (없으면 새로 조회)
+
+    Returns:
+        취약점 결과 리스트
+    """
+    label = ", ".join(languages)
+    logger.info(f"CodeQL 통합 분석 시작 ({label})")
+
+    if not HAS_CODEQL:
+        logger.warning("CodeQL wrapper를 찾을 수 없습니다. CodeQL 분석을 건너뜁니다.")
+        return []
+
+    try:
+        codeql_wrapper = CodeQLWrapper()
+
+        if file_index is None:
+            file_index = get_file_index(project_dir)
+
+        counts: Dict[str, int] = {}
+
+        def _counted(raw_results: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+            for r in raw_results:
+                counts[r["language"]] = counts.get(r["language"], 0) + 1
+                yield r
+
+        build_files: List[Path] = []
+        try:
+            # 클러스터에는 빌드 명령이 하나만 들어가므로 컴파일 언어의 빌드를 한 스크립트로 묶음
+            build_lines = []
+            if "java" in languages:
+                java_command = _java_build_command(project_dir, file_index, build_files)
+                if java_command:
+                    build_lines.append(java_command)
+            if "c" in languages or "cpp" in languages:
+                build_lines += _cpp_build_lines(file_index, project_dir.resolve())
+            build_command = None
+            if build_lines:
+                build_command = _write_build_script(build_lines, build_files)
+
+            # 래퍼는 제너레이터이므로 빌드 파일을 지우기 전에 모두 소비
+            raw_results = codeql_wrapper.analyze_multi(
+                project_dir=project_dir,
+                languages=languages,
+                build_command=build_command,
+            )
+            results = _to_results(_counted(raw_results), project_dir, "CodeQL")
+        finally:
+            _remove_build_files(build_files)
+
+        for language, count in counts.items():
+            logger.info(f"CodeQL 분석 완료 ({language}): {count}개 발견")
+        logger.info(f"CodeQL 통합 분석 완료 ({label}): {len(results)}개 발견")
+        return results
+
+    except Exception as e:
+        logger.exception(f"CodeQL 통합 분석 중 오류 발생 ({label}): {e}")
+        return []
+
+
 def analyze_with_joern(project_dir: Path, language: str) -> List[VulnerabilityResult]:
     """
     Joern을 사용하여 C/C++ 코드 분석
@@ -113,9 +475,11 @@ def analyze_with_joern(project_dir: Path, language: str) -> List[VulnerabilityRe
     """
     logger.info(f"Joern 분석 시작 ({language})")
     
+    if not HAS_JOERN:
+        logger.warning("Joern wrapper를 찾을 수 없습니다. Joern 분석을 건너뜁니다.")
+        return []
+    
     try:
-        from sarif_cli.wrappers.joern_wrapper import JoernAnalyzer
-        
         analyzer = JoernAnalyzer(project_dir)
         
         # CPG 빌드
@@ -133,50 +497,42 @@ def analyze_with_joern(project_dir: Path, language: str) -> List[VulnerabilityRe
         raw_results = analyzer.query_vulnerabilities()
         
         # VulnerabilityResult로 변환
-        results = []
-        for r in raw_results:
-            try:
-                file_path = Path(r["file"]).relative_to(project_dir.parent)
-            except ValueError:
-                file_path = Path(r["file"])
-            
-            results.append(VulnerabilityResult(
-                file_path=file_path,
-                line=r["line"],
-                column=1,
-                rule_id=r["rule_id"],
-                message=f"{r['rule_name']}: {r.get('code', '')}",
-                severity="warning",
-                tool_name=r.get("tool_name", "Joern"),
-                tool_metadata=r.get("tool_metadata", {}),
-            ))
+        results = _to_results(
+            raw_results,
+            project_dir,
+            "Joern",
+            msg_fmt=lambda r: f"{r['rule_name']}: {r.get('code', '')}",
+        )
         
         logger.info(f"Joern 분석 완료 ({language}): {len(results)}개 발견")
         return results
         
-    except ImportError:
-        logger.warning("Joern wrapper를 찾을 수 없습니다. Joern 분석을 건너뜁니다.")
-        return []
     except Exception as e:
         logger.exception(f"Joern 분석 중 오류 발생 ({language}): {e}")
         return []
 
 
-def analyze_with_spotbugs(project_dir: Path) -> List[VulnerabilityResult]:
+def analyze_with_spotbugs(
+    project_dir: Path,
+    file_index: Optional[FileIndex] = None,
+) -> List[VulnerabilityResult]:
     """
     SpotBugs를 사용하여 Java 코드 분석
     
     Args:
         project_dir: 프로젝트 디렉토리
+        file_index: 미리 생성된 파일 인덱스 (없으면 새로 조회)
     
     Returns:
         취약점 결과 리스트
     """
     logger.info("SpotBugs 분석 시작")
     
+    if not HAS_SPOTBUGS:
+        logger.warning("SpotBugs wrapper를 찾을 수 없습니다. SpotBugs 분석을 건너뜁니다.")
+        return []
+    
     try:
-        from sarif_cli.wrappers.spotbugs_wrapper import SpotBugsWrapper
-        
         spotbugs = SpotBugsWrapper()
         
         # SpotBugs 설치 확인
@@ -184,143 +540,175 @@ def analyze_with_spotbugs(project_dir: Path) -> List[VulnerabilityResult]:
             logger.warning("SpotBugs가 설치되지 않았습니다. SpotBugs 분석을 건너뜁니다.")
             return []
         
-        # 분석 실행
-        raw_results = spotbugs.analyze(project_dir)
+        # 분석 실행 (증분 분석이면 Java 소스가 바뀌지 않은 경우 이전 결과를 재사용)
+        tool_version = spotbugs.version()
+        cache_key = None
+        raw_results = None
+        if config.INCREMENTAL and tool_version:
+            if file_index is None:
+                file_index = get_file_index(project_dir)
+            # SpotBugs는 프로젝트 전체를 분석하므로 Java 소스 전체와 컴파일러/도구 버전으로 키를 만듦
+            cache_key = files_fingerprint(
+                project_dir,
+                file_index.get(".java"),
+                extra=[str(project_dir.resolve()), tool_version, get_tool_version("javac") or ""],
+            )
+            raw_results = get_result_cache(config.CACHE_DIR).get_value("SpotBugs", cache_key)
+            if raw_results is not None:
+                logger.info("SpotBugs 증분 분석: Java 소스가 바뀌지 않아 캐시된 결과 사용")
+
+        if raw_results is None:
+            raw_results = list(spotbugs.analyze(project_dir, file_index=file_index))
+            if cache_key is not None and spotbugs.completed:
+                get_result_cache(config.CACHE_DIR).put_value("SpotBugs", cache_key, raw_results)
         
         # VulnerabilityResult로 변환
-        results = []
-        for r in raw_results:
-            try:
-                file_path = Path(r["file"]).relative_to(project_dir.parent)
-            except ValueError:
-                file_path = Path(r["file"])
-            
-            results.append(VulnerabilityResult(
-                file_path=file_path,
-                line=r["line"],
-                column=1,
-                rule_id=r["rule_id"],
-                message=f"{r['rule_name']}: {r['message']}",
-                severity=r["severity"],
-                tool_name=r.get("tool_name", "SpotBugs"),
-                tool_metadata=r.get("tool_metadata", {}),
-            ))
+        results = _to_results(raw_results, project_dir, "SpotBugs")
         
         logger.info(f"SpotBugs 분석 완료: {len(results)}개 발견")
         return results
         
-    except ImportError:
-        logger.warning("SpotBugs wrapper를 찾을 수 없습니다. SpotBugs 분석을 건너뜁니다.")
-        return []
     except Exception as e:
         logger.exception(f"SpotBugs 분석 중 오류 발생: {e}")
         return []
 
 
-def analyze_with_bandit(project_dir: Path) -> List[VulnerabilityResult]:
+def analyze_with_bandit(
+    project_dir: Path,
+    file_index: Optional[FileIndex] = None,
+) -> List[VulnerabilityResult]:
     """
     Bandit을 사용하여 Python 코드 분석
     
     Args:
         project_dir: 프로젝트 디렉토리
+        file_index: 미리 생성된 파일 인덱스 (없으면 새로 조회)
     
     Returns:
         취약점 결과 리스트
     """
     logger.info("Bandit 분석 시작")
     
+    if not HAS_BANDIT:
+        logger.warning("Bandit wrapper를 찾을 수 없습니다. Bandit 분석을 건너뜁니다.")
+        return []
+    
     try:
-        from sarif_cli.wrappers.bandit_wrapper import BanditAnalyzer
-        
         analyzer = BanditAnalyzer()
+        tool_version = analyzer.version()
         
         # 분석 실행
-        raw_results = analyzer.analyze(project_dir)
+        if config.INCREMENTAL and tool_version:
+            if file_index is None:
+                file_index = get_file_index(project_dir)
+            raw_results = _run_incremental(
+                "Bandit",
+                "python",
+                project_dir,
+                file_index.get(".py"),
+                tool_version,
+                lambda targets: analyzer.analyze(project_dir, targets=targets),
+                lambda: analyzer.completed,
+            )
+        else:
+            raw_results = analyzer.analyze(project_dir, file_index=file_index)
         
         # VulnerabilityResult로 변환
-        results = []
-        for r in raw_results:
-            try:
-                file_path = Path(r["file"]).relative_to(project_dir.parent)
-            except ValueError:
-                file_path = Path(r["file"])
-            
-            results.append(VulnerabilityResult(
-                file_path=file_path,
-                line=r["line"],
-                column=1,
-                rule_id=r["rule_id"],
-                message=f"{r['rule_name']}: {r['message']}",
-                severity=r["severity"],
-                tool_name=r.get("tool_name", "Bandit"),
-                tool_metadata=r.get("tool_metadata", {}),
-            ))
+        results = _to_results(raw_results, project_dir, "Bandit")
         
         logger.info(f"Bandit 분석 완료: {len(results)}개 발견")
         return results
         
-    except ImportError:
-        logger.warning("Bandit wrapper를 찾을 수 없습니다. Bandit 분석을 건너뜁니다.")
-        return []
     except Exception as e:
         logger.exception(f"Bandit 분석 중 오류 발생: {e}")
         return []
 
 
-def analyze_with_semgrep(project_dir: Path, language: str) -> List[VulnerabilityResult]:
+def analyze_with_semgrep(
+    project_dir: Path,
+    language: str,
+    file_index: Optional[FileIndex] = None,
+) -> List[VulnerabilityResult]:
     """
     Semgrep을 사용하여 코드 분석 (경량화된 SARIF 파싱)
     
     Args:
         project_dir: 프로젝트 디렉토리
         language: 분석할 언어
+        file_index: 미리 생성된 파일 인덱스 (증분 분석 시 사용)
     
     Returns:
         취약점 결과 리스트
     """
     logger.info(f"Semgrep 분석 시작 ({language})")
     
+    if not HAS_SEMGREP:
+        logger.warning("Semgrep wrapper를 찾을 수 없습니다. Semgrep 분석을 건너뜁니다.")
+        return []
+    
     try:
-        from sarif_cli.wrappers.semgrep_wrapper import SemgrepAnalyzer
-        
         analyzer = SemgrepAnalyzer()
+        tool_version = analyzer.version()
         
         # 분석 실행 (경량화된 결과 반환)
-        raw_results = analyzer.analyze(project_dir, language)
+        if config.INCREMENTAL and tool_version:
+            # 증분 모드에서는 해당 언어의 소스 파일만 대상으로 함
+            if file_index is None:
+                file_index = get_file_index(project_dir)
+            raw_results = _run_incremental(
+                "Semgrep",
+                language,
+                project_dir,
+                file_index.get(*sorted(LANGUAGE_EXTENSIONS.get(language, ()))),
+                tool_version,
+                lambda targets: analyzer.analyze(project_dir, language, targets=targets),
+                lambda: analyzer.completed,
+            )
+        else:
+            raw_results = analyzer.analyze(project_dir, language)
         
         # VulnerabilityResult로 변환
-        results = []
-        for r in raw_results:
-            try:
-                file_path = Path(r["file"]).relative_to(project_dir.parent)
-            except ValueError:
-                file_path = Path(r["file"])
-            
-            results.append(VulnerabilityResult(
-                file_path=file_path,
-                line=r["line"],
-                column=1,
-                rule_id=r["rule_id"],
-                message=f"{r['rule_name']}: {r['message']}",
-                severity=r["severity"],
-                tool_name=r.get("tool_name", "Semgrep"),
-                tool_metadata=r.get("tool_metadata", {}),
-            ))
+        results = _to_results(raw_results, project_dir, "Semgrep")
         
         logger.info(f"Semgrep 분석 완료 ({language}): {len(results)}개 발견")
         return results
         
-    except ImportError:
-        logger.warning("Semgrep wrapper를 찾을 수 없습니다. Semgrep 분석을 건너뜁니다.")
-        return []
     except Exception as e:
         logger.exception(f"Semgrep 분석 중 오류 발생 ({language}): {e}")
         return []
 
 
+def _deduplicate(results: Iterable[VulnerabilityResult]) -> List[VulnerabilityResult]:
+    """
+    여러 도구가 같은 위치에 같은 규칙으로 보고한 결과를 하나로 합칩니다.
+
+    (파일, 라인, 규칙 ID)가 같으면 처음 나온 결과만 남기고, 같은 결과를 보고한
+    다른 도구 이름은 also_reported_by에 기록합니다. 출력 순서는 처음 나온 순서를 유지합니다.
+
+    Args:
+        results: 작업 등록 순서대로 나열된 취약점 결과
+
+    Returns:
+        중복이 제거된 결과 리스트
+    """
+    seen: Dict[tuple, VulnerabilityResult] = {}
+    for vuln in results:
+        key = (str(vuln.file_path), vuln.line, vuln.rule_id)
+        first = seen.get(key)
+        if first is None:
+            seen[key] = vuln
+        elif vuln.tool_name != first.tool_name and vuln.tool_name not in first.also_reported_by:
+            first.also_reported_by.append(vuln.tool_name)
+
+    return list(seen.values())
+
+
 def analyze_project(project_dir: Path, languages: Set[str]) -> List[VulnerabilityResult]:
     """
     프로젝트 전체 분석 - 언어별 적절한 SAST 도구 실행
+
+    각 도구는 독립적인 외부 프로세스를 실행하므로 스레드 풀에서 동시에 실행합니다.
+    결과 순서는 실행 완료 순서와 무관하게 작업 등록 순서를 유지합니다.
     
     Args:
         project_dir: 프로젝트 디렉토리
@@ -329,41 +717,75 @@ def analyze_project(project_dir: Path, languages: Set[str]) -> List[Vulnerabilit
     Returns:
         모든 취약점 결과 통합 리스트
     """
-    all_results = []
-    
     # C/C++/Java/Python/JS는 CodeQL 사용
     codeql_languages = {"c", "cpp", "java", "python", "javascript"}
+
+    # 파일 인덱스를 한 번만 생성하여 모든 도구가 공유
+    file_index = get_file_index(project_dir)
     
-    for language in languages:
-        if language in codeql_languages:
-            logger.info(f"{language} 분석 실행 (CodeQL 사용)")
-            results = analyze_with_codeql(project_dir, language)
-            all_results.extend(results)
-            
-            # C/C++인 경우 Joern도 추가로 실행
-            if language in ["c", "cpp"]:
-                logger.info(f"{language} 분석 실행 (Joern 사용)")
-                joern_results = analyze_with_joern(project_dir, language)
-                all_results.extend(joern_results)
-            
-            # Java인 경우 SpotBugs도 추가로 실행
-            if language == "java":
-                logger.info(f"{language} 분석 실행 (SpotBugs 사용)")
-                spotbugs_results = analyze_with_spotbugs(project_dir)
-                all_results.extend(spotbugs_results)
-            
-            # Python인 경우 Bandit도 추가로 실행
-            if language == "python":
-                logger.info(f"{language} 분석 실행 (Bandit 사용)")
-                bandit_results = analyze_with_bandit(project_dir)
-                all_results.extend(bandit_results)
-            
-            # 모든 언어에 대해 Semgrep도 추가로 실행 (경량 파서 사용)
-            logger.info(f"{language} 분석 실행 (Semgrep 사용)")
-            semgrep_results = analyze_with_semgrep(project_dir, language)
-            all_results.extend(semgrep_results)
-        else:
+    # (도구 이름, 언어, 함수, 인자) 작업 목록 구성
+    tasks = []
+    codeql_targets: List[str] = []
+    for language in sorted(languages):
+        if language not in codeql_languages:
             logger.warning(f"지원하지 않는 언어: {language}")
-    
+            continue
+
+        # 인덱싱된 소스가 없으면 (예: node_modules에만 존재) 도구 프로세스를 띄우지 않음
+        if not file_index.get(*LANGUAGE_EXTENSIONS[language]):
+            logger.info(f"{language} 소스 파일 없음 - 분석 건너뜀")
+            continue
+
+        codeql_targets.append(language)
+
+        # C/C++인 경우 Joern도 추가로 실행
+        # c와 cpp는 같은 프로젝트 전체로 CPG를 만들고 같은 쿼리를 실행하므로 한 번만 등록
+        if language in ["c", "cpp"] and not any(task[0] == "Joern" for task in tasks):
+            tasks.append(("Joern", language, analyze_with_joern, (project_dir, language)))
+
+        # Java인 경우 SpotBugs도 추가로 실행
+        if language == "java":
+            tasks.append(("SpotBugs", language, analyze_with_spotbugs, (project_dir, file_index)))
+
+        # Python인 경우 Bandit도 추가로 실행
+        if language == "python":
+            tasks.append(("Bandit", language, analyze_with_bandit, (project_dir, file_index)))
+
+        # 모든 언어에 대해 Semgrep도 추가로 실행 (경량 파서 사용)
+        tasks.append(("Semgrep", language, analyze_with_semgrep, (project_dir, language, file_index)))
+
+    # CodeQL은 언어가 여러 개면 데이터베이스 클러스터 하나로 추출을 공유
+    if len(codeql_targets) > 1:
+        tasks.insert(0, ("CodeQL", ", ".join(codeql_targets), analyze_with_codeql_multi,
+                         (project_dir, codeql_targets, file_index)))
+    elif codeql_targets:
+        tasks.insert(0, ("CodeQL", codeql_targets[0], analyze_with_codeql,
+                         (project_dir, codeql_targets[0], file_index)))
+
+    if not tasks:
+        logger.info("총 0개의 취약점 발견")
+        return []
+
+    task_results: List[List[VulnerabilityResult]] = [[] for _ in tasks]
+
+    with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+        futures = {}
+        for idx, (tool_name, language, func, args) in enumerate(tasks):
+            logger.info(f"{language} 분석 실행 ({tool_name} 사용)")
+            futures[executor.submit(func, *args)] = idx
+
+        for future in as_completed(futures):
+            idx = futures[future]
+            tool_name, language, _, _ = tasks[idx]
+            try:
+                task_results[idx] = future.result()
+            except Exception as e:
+                # 한 도구의 실패가 다른 도구 결과에 영향을 주지 않도록 함
+                logger.exception(f"[{tool_name}] {language} 분석 중 오류 발생: {e}")
+                continue
+            logger.info(f"[{tool_name}] {language} 분석 종료: {len(task_results[idx])}개")
+
+    all_results = _deduplicate(vuln for results in task_results for vuln in results)
+
     logger.info(f"총 {len(all_results)}개의 취약점 발견")
     return all_results
@@ -2,6 +2,8 @@
 CLI 진입점 - Typer 기반 커맨드라인 인터페이스
 """
 import typer
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from rich.console import Console
@@ -14,6 +16,18 @@ from sarif_cli.config.settings import config, load_settings
 app = typer.Typer()
 console = Console()
 
+# Aux/LLM 단계에서 결과 파일 확장자로 언어를 추론할 때 사용하는 언어별 확장자 그룹
+LANG_EXTS = {
+    "c": frozenset({".c"}),
+    "cpp": frozenset({".cpp", ".h", ".hpp"}),
+    "java": frozenset({".java"}),
+    "python": frozenset({".py"}),
+    "javascript": frozenset({".js", ".jsx", ".ts", ".tsx"}),
+}
+
+# 확장자 -> 언어 (LANG_EXTS의 역방향 매핑)
+EXT_TO_LANG = {ext: lang for lang, exts in LANG_EXTS.items() for ext in exts}
+
 
 @app.callback(invoke_without_command=True)
 def main(
@@ -53,6 +67,16 @@ def main(
         "--enable-aux",
         help="Aux 분석(Reachability) 활성화",
     ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="파일 해시 기반 결과 캐시로 변경된 파일만 재분석 (Bandit, Semgrep)",
+    ),
+    pretty: bool = typer.Option(
+        False,
+        "--pretty",
+        help="SARIF 파일을 사람이 읽기 쉽게 들여쓰기하여 저장 (기본: 공백 없는 JSON)",
+    ),
     config_file: Optional[Path] = typer.Option(
         None,
         "--config",
@@ -87,6 +111,8 @@ def main(
         llm_url=llm_url,
         llm_key=llm_key,
         enable_aux=enable_aux,
+        incremental=incremental or None,
+        pretty_sarif=pretty or None,
     )
     
     console.print(f"[bold green]🔍 SAST 분석 시작[/bold green]")
@@ -100,6 +126,8 @@ def main(
             console.print(f"[dim]Aux 분석: 비활성화[/dim]")
     else:
         console.print(f"[dim]LLM: 비활성화[/dim]")
+    if config.INCREMENTAL:
+        console.print(f"[cyan]증분 분석: 활성화 (캐시: {config.CACHE_DIR})[/cyan]")
     
     # 1. 출력 디렉토리 생성
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -114,71 +142,98 @@ def main(
     results = analyze_project(input_dir, languages)
     console.print(f"발견된 취약점 후보: {len(results)}개")
     
-    # 3.5 Aux 분석 (설정에 따라)
+    # 언어 추론 (확장자 기반) - Aux/LLM 단계에서 공통으로 사용
+    # 같은 파일의 취약점은 LLM_BATCH_SIZE개씩 묶어 처리 (같은 파일이므로 언어도 같음)
+    by_file = defaultdict(list)
+    for idx, vuln in enumerate(results):
+        vuln.language = EXT_TO_LANG.get(vuln.file_path.suffix.lower(), "unknown")
+        by_file[vuln.file_path].append(idx)
+    batch_size = max(1, config.LLM_BATCH_SIZE)
+    batches = [
+        indices[i:i + batch_size]
+        for indices in by_file.values()
+        for i in range(0, len(indices), batch_size)
+    ]
+    
+    # 3.5 Aux 분석 + 4. LLM 검증 (설정에 따라)
+    # 배치마다 Aux 분석을 마치면 바로 LLM 검증을 제출하여,
+    # 다음 배치의 Aux 분석과 앞선 배치의 LLM 응답 대기가 겹치도록 함
+    patches_map = {}
     if config.ENABLE_AUX:
         console.print("\n[yellow]🔍 Aux 분석(Reachability) 실행 중...[/yellow]")
-        from sarif_cli.core.aux_analyser import AuxAnalyser
-        
-        aux_analysers = {}
-        
-        for vuln in results:
-            # 언어 추론 (확장자 기반)
-            ext = vuln.file_path.suffix.lower()
-            lang = "unknown"
-            if ext in [".c", ".cpp", ".h", ".hpp"]:
-                lang = "c" if ext == ".c" else "cpp"
-            elif ext in [".java"]:
-                lang = "java"
-            elif ext in [".py"]:
-                lang = "python"
-            elif ext in [".js", ".jsx", ".ts", ".tsx"]:
-                lang = "javascript"
-                
-            if lang not in aux_analysers:
-                aux_analysers[lang] = AuxAnalyser(input_dir, lang)
-            
-            aux_result = aux_analysers[lang].analyze_reachability(vuln.file_path, vuln.line)
+        from sarif_cli.core.aux_analyser import get_aux_analyser, is_aux_relevant
+    if config.ENABLE_LLM:
+        console.print("\n[yellow]🤖 LLM 검증 및 패치 생성 중...[/yellow]")
+        from sarif_cli.core.llm_verifier import verify_file_and_generate_patches, PatchResult
+    
+    def _analyze_aux(vulns):
+        # Reachability가 판정에 영향을 주는 취약점만 분석 (없으면 분석기/컨테이너를 만들지 않음)
+        relevant = is_aux_relevant(vulns)
+        targets = [(vuln.file_path, vuln.line) for vuln, flag in zip(vulns, relevant) if flag]
+        # 배치(같은 파일)의 대상을 한 번에 분석하여 컴파일/분석 도구를 한 번만 실행
+        aux_results = get_aux_analyser(input_dir, vulns[0].language).analyze_many(targets) if targets else {}
+        for vuln, flag in zip(vulns, relevant):
+            if not flag:
+                # 분석하지 않은 취약점은 aux_result를 비워 둠 (프롬프트에 도달 불가 근거로 전달되지 않도록)
+                continue
+            aux_result = aux_results[(vuln.file_path, vuln.line)]
             
             # 결과를 VulnerabilityResult에 저장
             vuln.aux_result = {
                 "reachable": aux_result.reachable,
                 "call_stack": aux_result.call_stack,
-                "data_flow": aux_result.data_flow
+                "data_flow": aux_result.data_flow,
+                "confirmed": aux_result.confirmed,
             }
             
             if aux_result.reachable:
                 console.print(f"  ✓ Reachable: {vuln.file_path.name}:{vuln.line}")
     
-    # 4. LLM 검증 (설정에 따라)
-    patches_map = {}
-    if config.ENABLE_LLM:
-        console.print("\n[yellow]🤖 LLM 검증 및 패치 생성 중...[/yellow]")
-        from sarif_cli.core.llm_verifier import verify_and_generate_patch
+    def _verify(vulns):
+        # LLM 검증 및 패치 생성
+        return verify_file_and_generate_patches(
+            vulnerabilities=vulns,
+            project_dir=input_dir,
+            language=vulns[0].language,
+            llm_url=config.LLM_URL,
+            api_key=config.LLM_API_KEY
+        )
+    
+    def _verify_after(aux_future, vulns):
+        # Aux 결과가 프롬프트에 들어가므로 같은 배치의 Aux 분석이 끝난 뒤 검증
+        if aux_future is not None:
+            aux_future.result()
+        return _verify(vulns)
+    
+    # 요청마다 네트워크/모델 대기 시간이 대부분이므로 동시에 실행
+    # Aux 분석은 별도 풀에서 배치(파일)별로 동시에 실행 (언어별 컨테이너 수는 AUX_MAX_WORKERS로 제한)
+    # (작업자 스레드는 첫 submit 시 생성되므로 LLM/Aux 비활성화 시 비용 없음)
+    patch_result_dicts = [None] * len(results)
+    max_workers = max(1, min(config.LLM_MAX_CONCURRENCY, len(batches)))
+    aux_workers = max(1, min(config.AUX_MAX_WORKERS * max(1, len(languages)), len(batches)))
+    with ThreadPoolExecutor(max_workers=aux_workers) as aux_executor, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        aux_futures = []
+        futures = []
+        for indices in batches:
+            vulns = [results[idx] for idx in indices]
+            aux_future = None
+            if config.ENABLE_AUX:
+                aux_future = aux_executor.submit(_analyze_aux, vulns)
+                aux_futures.append(aux_future)
+            if config.ENABLE_LLM:
+                futures.append((indices, executor.submit(_verify_after, aux_future, vulns)))
         
-        for idx, vuln in enumerate(results):
-            # 언어 추론 (확장자 기반)
-            ext = vuln.file_path.suffix.lower()
-            lang = "unknown"
-            if ext in [".c", ".cpp", ".h", ".hpp"]:
-                lang = "c" if ext == ".c" else "cpp"
-            elif ext in [".java"]:
-                lang = "java"
-            elif ext in [".py"]:
-                lang = "python"
-            elif ext in [".js", ".jsx", ".ts", ".tsx"]:
-                lang = "javascript"
-            
-            # LLM 검증 및 패치 생성
-            patch_result_dict = verify_and_generate_patch(
-                vulnerability=vuln,
-                project_dir=input_dir,
-                language=lang,
-                llm_url=config.LLM_URL,
-                api_key=config.LLM_API_KEY
-            )
-            
+        for aux_future in aux_futures:
+            aux_future.result()
+        for indices, future in futures:
+            for idx, patch_result_dict in zip(indices, future.result()):
+                patch_result_dicts[idx] = patch_result_dict
+    
+    if config.ENABLE_LLM:
+        # 출력과 patches_map은 결과 순서대로 처리
+        for idx, (vuln, patch_result_dict) in enumerate(zip(results, patch_result_dicts)):
             # Dict를 PatchResult 객체로 변환 (호환성 유지)
-            from sarif_cli.core.llm_verifier import PatchResult
             patch_result = PatchResult(
                 is_valid=patch_result_dict.get("is_valid", False),
                 confidence=patch_result_dict.get("confidence", 0.0),
@@ -197,7 +252,9 @@ def main(
     
     # 파일별로 취약점과 패치를 그룹화
     from sarif_cli.core.writer import write_sarif_results_with_patches
-    sarif_files = write_sarif_results_with_patches(results, output_dir, patches_map)
+    sarif_files = write_sarif_results_with_patches(
+        results, output_dir, patches_map, pretty=config.PRETTY_SARIF
+    )
     
     console.print(f"\n[bold green]✅ 완료! {len(sarif_files)}개 SARIF 파일 생성[/bold green]")
     for sarif_file in sarif_files:
@@ -2,7 +2,7 @@
 SARIF CLI 설정 모듈
 """
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -25,28 +25,54 @@ class _Settings(BaseSettings):
     LLM_URL: Optional[str] = "http://localhost:11434"
     LLM_API_KEY: Optional[str] = Field(None, alias='llm_key')
     OLLAMA_MODEL: str = "qwen2.5:7b"
+    LLM_MAX_CONCURRENCY: int = 4  # 동시에 보낼 LLM 검증 요청 수 (프로바이더 rate limit에 맞게 조정)
+    LLM_BATCH_SIZE: int = 8  # 한 요청으로 함께 검증할 같은 파일의 취약점 수 (1이면 취약점마다 요청)
 
     # Aux 분석 설정
     ENABLE_AUX: bool = False
     AUX_ANALYSIS_TIMEOUT: int = 300
+    AUX_MAX_WORKERS: int = 2  # 언어별로 동시에 실행할 Aux 분석 컨테이너 수
+    # Reachability가 판정에 영향을 주는 CWE (메모리 안전성 계열) - 이 외의 취약점은 Aux 분석 생략, 비우면 모두 분석
+    AUX_RELEVANT_CWES: Set[str] = {"CWE-119", "CWE-120", "CWE-121", "CWE-122", "CWE-125", "CWE-787", "CWE-416", "CWE-476"}
+
+    # 증분 분석 설정 (파일 내용 해시 기반 결과 캐시)
+    INCREMENTAL: bool = False
+    CACHE_DIR: Path = Path(".sarif_cli_cache")
+    CODEQL_DB_CACHE_SIZE: int = 3  # 보관할 CodeQL 데이터베이스 수 (초과 시 오래된 것부터 삭제)
+
+    # 출력 설정
+    PRETTY_SARIF: bool = False  # SARIF 파일을 들여쓰기하여 저장 (기본은 공백 없는 JSON)
 
     # 경로 설정
-    BASE_DIR: Path = Path(__file__).resolve().parent
+    BASE_DIR: Path = Path(__file__).resolve().parent.parent  # sarif_cli 패키지 루트
     PROMPTS_DIR: Path = BASE_DIR / "prompts"
     BASIC_PROMPT_FILE: Path = PROMPTS_DIR / "basic.txt"
     AUX_ENHANCED_PROMPT_FILE: Path = PROMPTS_DIR / "aux_enhanced.txt"
+    BATCH_PROMPT_FILE: Path = PROMPTS_DIR / "batch.txt"
 
 
 config = _Settings()
 
+# load_settings 인자 이름(대문자) -> 필드 이름 (alias로도 지정 가능, 예: llm_key -> LLM_API_KEY)
+_FIELD_NAMES = {name: name for name in _Settings.model_fields}
+_FIELD_NAMES.update(
+    {field.alias.upper(): name for name, field in _Settings.model_fields.items() if field.alias}
+)
+
 
 def load_settings(**kwargs) -> _Settings:
     """
     설정 객체를 로드하고 CLI 인자로 업데이트합니다.
     None이 아닌 CLI 인자만 사용하여 기존 설정을 덮어씁니다.
     """
-    # None 값을 제거하여 명시적으로 제공된 인자만 사용
-    cli_args = {k.upper(): v for k, v in kwargs.items() if v is not None}
-    global config
-    config = _Settings(**cli_args)
+    # 환경 변수와 .env는 import 시 config를 만들 때 이미 반영했으므로 다시 읽지 않고,
+    # 명시적으로 제공된(None이 아닌) CLI 인자만 덮어씀
+    # 다른 모듈이 `from ... import config`로 참조하고 있으므로 객체를 교체하지 않고 기존 인스턴스의 값을 갱신
+    for key, value in kwargs.items():
+        if value is None:
+            continue
+        name = _FIELD_NAMES.get(key.upper())
+        if name is None:
+            continue  # extra='ignore'와 같이 알 수 없는 인자는 무시
+        setattr(config, name, value)
     return config
@@ -1,12 +1,14 @@
 """Core functionality for SARIF CLI."""
 
-from .detector import detect_languages, get_files_by_language
+from .detector import FileIndex, detect_languages, get_file_index, get_files_by_language
 from .llm_verifier import verify_and_generate_patch, PatchResult
 from .aux_analyser import AuxAnalyser
 from .writer import write_sarif_results_with_patches
 
 __all__ = [
+    "FileIndex",
     "detect_languages",
+    "get_file_index",
     "get_files_by_language",
     "verify_and_generate_patch",
     "PatchResult",
@@ -2,22 +2,79 @@
 Auxiliary Analyser Module
 Provides additional static analysis (Reachability, Data Flow) to enhance LLM verification.
 """
+import queue
+import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Any, Iterable, Optional, List, Dict, Set, Tuple
 from loguru import logger
 
 from sarif_cli.config.settings import config
 
+# Reachability 분석을 지원하는 언어
+SUPPORTED_LANGUAGES = frozenset({"c", "cpp", "java"})
+
 @dataclass
 class AuxAnalysisResult:
     reachable: bool
     call_stack: List[str]
     data_flow: List[str]
+    # True면 호출 그래프 탐색으로 판정한 결과 (False면 휴리스틱/오류/미지원/일부 소스만 분석한 결과이므로 판정에 쓰지 않음)
+    confirmed: bool = False
     
     def __str__(self):
         return f"Reachable: {self.reachable}, Stack: {len(self.call_stack)} frames"
 
+# 규칙 ID/태그의 CWE 표기 (CWE-119, external/cwe/cwe-119 등)
+_CWE_RE = re.compile(r"cwe[-_/]?0*(\d+)", re.IGNORECASE)
+
+
+def is_aux_relevant(vulnerabilities: Iterable[Any]) -> List[bool]:
+    """
+    취약점별로 Aux 분석이 판정에 도움이 되는지 반환합니다.
+    규칙 ID와 SARIF 규칙 태그(tool_metadata)의 CWE가 AUX_RELEVANT_CWES에 포함된 경우만 True이며,
+    설정이 비어 있으면 모두 True입니다. 대상이 아닌 취약점은 분석기(Docker 컨테이너)를 만들지 않고 건너뜁니다.
+
+    Args:
+        vulnerabilities: VulnerabilityResult 목록
+
+    Returns:
+        vulnerabilities와 같은 순서의 분석 대상 여부
+    """
+    relevant_cwes = config.AUX_RELEVANT_CWES
+    vulnerabilities = list(vulnerabilities)
+    if not relevant_cwes:
+        return [True] * len(vulnerabilities)
+
+    # 같은 run의 결과는 tool 객체를 공유하므로 tool마다 규칙 태그를 한 번만 훑음
+    rule_cwes_by_tool: Dict[int, Dict[str, Set[str]]] = {}
+    flags = []
+    for vuln in vulnerabilities:
+        cwes = {f"CWE-{n}" for n in _CWE_RE.findall(vuln.rule_id)}
+        tool = vuln.tool_metadata
+        if tool:
+            rule_cwes = rule_cwes_by_tool.get(id(tool))
+            if rule_cwes is None:
+                rule_cwes = rule_cwes_by_tool[id(tool)] = _rule_cwes(tool)
+            cwes |= rule_cwes.get(vuln.rule_id, set())
+        flags.append(bool(cwes & relevant_cwes))
+    return flags
+
+
+def _rule_cwes(tool: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """run.tool의 규칙 목록에서 {규칙 ID: 태그의 CWE 집합} 맵 생성"""
+    rule_cwes: Dict[str, Set[str]] = {}
+    for rule in tool.get("driver", {}).get("rules", []):
+        tags = rule.get("properties", {}).get("tags", [])
+        cwes = {f"CWE-{n}" for tag in tags for n in _CWE_RE.findall(str(tag))}
+        if cwes and "id" in rule:
+            rule_cwes[rule["id"]] = cwes
+    return rule_cwes
+
+
 class AuxAnalyser:
     """
     Auxiliary Analyser that wraps heavy static analysis tools (SVF, SootUp).
@@ -28,39 +85,135 @@ class AuxAnalyser:
         self.project_dir = project_dir
         self.language = language
         self.enabled = config.ENABLE_AUX
+        self.supported = language in SUPPORTED_LANGUAGES
         
     def analyze_reachability(self, file_path: Path, line: int) -> AuxAnalysisResult:
         """
         Analyze reachability of a specific line in a file.
         """
+        return self.analyze_many([(file_path, line)])[(file_path, line)]
+
+    def analyze_many(self, targets: List[Tuple[Path, int]]) -> Dict[Tuple[Path, int], AuxAnalysisResult]:
+        """
+        여러 (파일, 라인)의 Reachability를 한 번에 분석합니다.
+        캐시에 없는 대상만 모아 도구를 한 번 실행하므로 컴파일/분석 도구 시작 비용이 대상 수만큼 들지 않습니다.
+
+        Args:
+            targets: (파일 경로, 라인 번호) 목록
+
+        Returns:
+            (파일 경로, 라인 번호) -> 분석 결과
+        """
         if not self.enabled:
-            return AuxAnalysisResult(
+            disabled = AuxAnalysisResult(
                 reachable=False, 
                 call_stack=["Aux analysis disabled"], 
                 data_flow=["No data"]
             )
+            return {target: disabled for target in targets}
             
-        logger.info(f"Running Aux Analysis for {file_path}:{line} ({self.language})")
-        
-        logger.info(f"Running Aux Analysis for {file_path}:{line} ({self.language})")
-        
+        if not self.supported:
+            logger.warning(f"Aux analysis not supported for language: {self.language}")
+            unsupported = AuxAnalysisResult(False, ["Not supported"], [])
+            return {target: unsupported for target in targets}
+
+        results: Dict[Tuple[Path, int], AuxAnalysisResult] = {}
         try:
-            if self.language in ["c", "cpp"]:
-                from sarif_cli.core.aux_tools.svf_analyser import SVFAnalyser
-                analyser = SVFAnalyser(self.project_dir)
-                return analyser.analyze(file_path, line)
-            elif self.language == "java":
-                from sarif_cli.core.aux_tools.sootup_analyser import SootUpAnalyser
-                analyser = SootUpAnalyser(self.project_dir)
-                return analyser.analyze(file_path, line)
-            else:
-                logger.warning(f"Aux analysis not supported for language: {self.language}")
-                return AuxAnalysisResult(False, ["Not supported"], [])
-                
+            # 같은 파일/라인은 컨테이너 실행과 컴파일을 다시 하지 않음 (파일이 바뀌면 stamp가 달라짐)
+            keys = {}
+            for file_path, line in targets:
+                key = (self.project_dir, self.language, file_path, _file_stamp(self.project_dir, file_path), line)
+                cached = _cache_get(key)
+                if cached is not None:
+                    results[(file_path, line)] = cached
+                else:
+                    keys[(file_path, line)] = key
+            if not keys:
+                return results
+
+            logger.info(f"Running Aux Analysis for {len(keys)} target(s) ({self.language})")
+            # c와 cpp는 같은 SVF 분석기 풀을 사용
+            # 분석기(컨테이너) 하나는 한 번에 한 요청만 처리하고, 풀의 분석기 수만큼 동시에 분석
+            pool = _get_tool_pool(self.project_dir, "cpp" if self.language == "c" else self.language)
+            analyser = pool.get()
+            try:
+                analysed = analyser.analyze_many(list(keys))
+            finally:
+                pool.put(analyser)
+            for target, key in keys.items():
+                results[target] = analysed[target]
+                _cache_put(key, analysed[target])
+            return results
         except Exception as e:
             logger.error(f"Aux analysis failed: {e}")
-            return AuxAnalysisResult(
+            failed = AuxAnalysisResult(
                 reachable=False,
                 call_stack=[f"Error: {e}"],
                 data_flow=[]
             )
+            return {target: results.get(target, failed) for target in targets}
+
+
+@lru_cache(maxsize=None)
+def get_aux_analyser(project_dir: Path, language: str) -> AuxAnalyser:
+    """(프로젝트, 언어)당 하나의 AuxAnalyser를 반환합니다."""
+    return AuxAnalyser(project_dir, language)
+
+
+@lru_cache(maxsize=None)
+def _get_tool_pool(project_dir: Path, language: str) -> "queue.Queue[Any]":
+    """
+    언어별 도구 분석기(SVF/SootUp) 풀을 (프로젝트, 언어)당 한 번만 생성합니다.
+    도구 분석기는 각자 Docker 컨테이너 상태를 가지므로 풀에서 꺼낸 분석기는 한 스레드만 사용하며,
+    컨테이너는 첫 분석 때 시작되므로 실제로 동시에 쓰인 수만큼만 뜹니다.
+    생성에 실패하면 캐시되지 않으므로 다음 호출에서 다시 시도합니다.
+    """
+    if language in ["c", "cpp"]:
+        from sarif_cli.core.aux_tools.svf_analyser import SVFAnalyser as tool_cls
+    else:
+        from sarif_cli.core.aux_tools.sootup_analyser import SootUpAnalyser as tool_cls
+    pool: "queue.Queue[Any]" = queue.Queue()
+    for _ in range(max(1, config.AUX_MAX_WORKERS)):
+        pool.put(tool_cls(project_dir))
+    return pool
+
+
+def _file_stamp(project_dir: Path, file_path: Path) -> Optional[Tuple[int, int]]:
+    """
+    결과 파일의 (mtime_ns, size) - 파일이 수정되면 캐시를 무효화하기 위한 키
+    결과 경로는 프로젝트의 상위 디렉토리 기준 상대 경로일 수 있으므로 후보 경로를 차례로 확인합니다.
+    """
+    for candidate in (file_path, project_dir.parent / file_path, project_dir / file_path):
+        try:
+            st = candidate.stat()
+        except OSError:
+            continue
+        return st.st_mtime_ns, st.st_size
+    return None
+
+
+# 분석 결과 캐시 (프로세스 내, LRU)
+# 키: (project_dir, language, file_path, file stamp, line)
+# 반환 객체는 호출부 사이에 공유되므로 수정하지 않아야 합니다.
+_RESULT_CACHE_SIZE = 512
+_result_cache: "OrderedDict[tuple, AuxAnalysisResult]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _cache_get(key: tuple) -> Optional[AuxAnalysisResult]:
+    with _result_cache_lock:
+        result = _result_cache.get(key)
+        if result is not None:
+            _result_cache.move_to_end(key)
+        return result
+
+
+def _cache_put(key: tuple, result: AuxAnalysisResult) -> None:
+    # 도구 오류 결과는 저장하지 않아 일시적인 실패는 다음 호출에서 다시 시도
+    if result.call_stack and result.call_stack[0].startswith("Error:"):
+        return
+    with _result_cache_lock:
+        _result_cache[key] = result
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
@@ -1,37 +1,59 @@
-import docker
-from docker.errors import ImageNotFound
+import atexit
+import threading
+from functools import cached_property
 from loguru import logger
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Set, Tuple
+
+from sarif_cli.config.settings import config
 
 class DockerManager:
     """
     Simplified Docker Manager for running Aux tools
     """
+    # 프로세스 내에서 존재를 확인한(또는 pull한) 이미지 - 컨테이너 시작마다 daemon에 묻지 않음
+    _checked_images: Set[str] = set()
+    _checked_lock = threading.Lock()
+    # 분석 도구의 산출물(bitcode, class 파일 등)을 쓰는 컨테이너 내부 디렉토리 (tmpfs)
+    WORK_DIR = "/work"
+
     def __init__(self, image_name: str, work_dir: Path):
-        self.client = docker.from_env()
         self.image_name = image_name
         self.work_dir = work_dir.resolve()
         self.container = None
+        self._cleanup_registered = False
+
+    @cached_property
+    def client(self):
+        """Docker 클라이언트 - docker SDK는 Aux 분석을 실제로 실행할 때 처음 로드"""
+        import docker
+        return docker.from_env()
 
     def ensure_image(self):
-        try:
-            self.client.images.get(self.image_name)
-            logger.debug(f"Image {self.image_name} exists")
-        except ImageNotFound:
-            logger.warning(f"Image {self.image_name} not found. Attempting to pull...")
+        if self.image_name in self._checked_images:
+            return
+        with self._checked_lock:
+            if self.image_name in self._checked_images:
+                return
+            from docker.errors import ImageNotFound
             try:
-                self.client.images.pull(self.image_name)
-            except Exception as e:
-                logger.error(f"Failed to pull image {self.image_name}: {e}")
-                raise
+                self.client.images.get(self.image_name)
+                logger.debug(f"Image {self.image_name} exists")
+            except ImageNotFound:
+                logger.warning(f"Image {self.image_name} not found. Attempting to pull...")
+                try:
+                    self.client.images.pull(self.image_name)
+                except Exception as e:
+                    logger.error(f"Failed to pull image {self.image_name}: {e}")
+                    raise
+            self._checked_images.add(self.image_name)
 
     def start_container(self, env: Optional[dict] = None):
         self.ensure_image()
         
-        # Mount work_dir to /src
+        # Mount work_dir to /src (소스는 읽기만 하고, 컴파일 산출물은 tmpfs인 WORK_DIR에 기록)
         volumes = {
-            str(self.work_dir): {'bind': '/src', 'mode': 'rw'}
+            str(self.work_dir): {'bind': '/src', 'mode': 'ro'}
         }
         
         try:
@@ -42,30 +64,61 @@ class DockerManager:
                 tty=True,
                 volumes=volumes,
                 environment=env or {},
-                working_dir="/src"
+                working_dir="/src",
+                # 분석 도구는 네트워크가 필요 없으므로 네트워크 설정을 생략하여 기동 시간 단축
+                network_mode="none",
+                # 중지하면 daemon이 바로 삭제 (비정상 종료 시에도 컨테이너가 남지 않음)
+                auto_remove=True,
+                # 루트 파일시스템은 읽기 전용, 쓰기는 tmpfs인 /tmp와 WORK_DIR에만
+                read_only=True,
+                tmpfs={"/tmp": "", self.WORK_DIR: "size=1g"},
             )
             logger.debug(f"Container started: {self.container.id}")
         except Exception as e:
             logger.error(f"Failed to start container: {e}")
             raise
+        
+        # 컨테이너를 여러 분석에 재사용하므로 프로세스 종료 시 정리
+        if not self._cleanup_registered:
+            atexit.register(self.cleanup)
+            self._cleanup_registered = True
 
-    def exec_command(self, cmd: str) -> Tuple[int, str]:
+    def ensure_container(self, env: Optional[dict] = None):
+        """컨테이너가 없으면 시작하고, 있으면 그대로 재사용합니다."""
+        if self.container is None:
+            self.start_container(env)
+
+    def exec_command(self, cmd: str, timeout: Optional[int] = None) -> Tuple[int, str]:
+        """
+        컨테이너에서 명령을 실행합니다.
+        timeout(초, 기본 AUX_ANALYSIS_TIMEOUT)이 지나면 컨테이너 안에서 명령을 SIGKILL로 종료하므로
+        멈춘 컴파일러/분석 도구가 exec를 계속 붙잡지 않습니다 (종료 코드 137).
+        """
         if not self.container:
             raise RuntimeError("Container not started")
+        if timeout is None:
+            timeout = config.AUX_ANALYSIS_TIMEOUT
             
         logger.debug(f"Exec: {cmd}")
         try:
-            exit_code, output = self.container.exec_run(f"bash -c '{cmd}'")
+            # 인자 목록으로 전달하여 cmd를 다시 인용하지 않음 (cmd 안의 따옴표를 그대로 사용 가능)
+            exit_code, output = self.container.exec_run(
+                ["timeout", "-s", "KILL", str(timeout), "bash", "-c", cmd]
+            )
+            if exit_code == 137:
+                logger.warning(f"Exec timed out after {timeout}s: {cmd}")
             return exit_code, output.decode('utf-8', errors='replace')
         except Exception as e:
             logger.error(f"Exec failed: {e}")
+            # 컨테이너가 종료된 경우 등 - 정리하여 다음 ensure_container에서 새로 시작
+            self.cleanup()
             return -1, str(e)
 
     def cleanup(self):
         if self.container:
             try:
+                # auto_remove로 시작했으므로 중지하면 daemon이 삭제
                 self.container.stop()
-                self.container.remove()
                 logger.debug("Container removed")
             except Exception as e:
                 logger.warning(f"Failed to remove container: {e}")
@@ -1,5 +1,7 @@
 import os
+import shlex
 from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
 from loguru import logger
 from .docker_manager import DockerManager
 from sarif_cli.core.aux_analyser import AuxAnalysisResult
@@ -13,26 +15,38 @@ class SootUpAnalyser:
     # In a real scenario, this should be 'sootup/sootup' or similar.
     IMAGE_NAME = "sootup/sootup" 
 
-    def __init__(self, project_dir: Path):
+    def __init__(self, project_dir: Path, docker: Optional[DockerManager] = None):
         self.project_dir = project_dir.resolve()
-        self.docker = DockerManager(self.IMAGE_NAME, self.project_dir)
+        # 컨테이너는 분석마다 새로 띄우지 않고 첫 분석 때 시작하여 재사용 (프로세스 종료 시 정리)
+        self.docker = docker or DockerManager(self.IMAGE_NAME, self.project_dir)
 
     def analyze(self, file_path: Path, line: int) -> AuxAnalysisResult:
+        return self.analyze_many([(file_path, line)])[(file_path, line)]
+
+    def analyze_many(self, targets: Iterable[Tuple[Path, int]]) -> Dict[Tuple[Path, int], AuxAnalysisResult]:
+        """
+        여러 (파일, 라인)을 한 번에 분석합니다.
+        대상 파일들을 javac 한 번으로 컴파일하고, SootUp은 클래스당 한 번만 실행합니다.
+        """
+        targets = list(targets)
         try:
-            self.docker.start_container()
+            self.docker.ensure_container()
             
             # 1. Compile Java file (if not already compiled)
             # We assume 'javac' is available in the container
-            try:
-                rel_path = file_path.relative_to(self.project_dir)
-            except ValueError:
-                rel_path = file_path.name
-            
-            # Check if .class file exists (heuristic)
-            class_file = rel_path.with_suffix(".class")
+            rel_paths = []
+            for file_path, _ in targets:
+                try:
+                    rel_paths.append(str(file_path.relative_to(self.project_dir)))
+                except ValueError:
+                    rel_paths.append(file_path.name)
             
-            # Try to compile
-            compile_cmd = f"javac {rel_path}"
+            # Try to compile (소스 마운트는 읽기 전용이므로 class 파일은 WORK_DIR 아래에 기록)
+            # 파일 이름은 분석 대상 프로젝트에서 오므로 셸에서 확장되지 않도록 shlex.quote로 인용
+            classes_dir = f"{self.docker.WORK_DIR}/classes"
+            compile_cmd = f"javac -d {shlex.quote(classes_dir)} " + " ".join(
+                shlex.quote(p) for p in dict.fromkeys(rel_paths)
+            )
             exit_code, output = self.docker.exec_command(compile_cmd)
             
             if exit_code != 0:
@@ -48,23 +62,24 @@ class SootUpAnalyser:
             # e.g., src/main/java/com/example/App.java -> com.example.App
             # This is hard without parsing package declaration.
             # Fallback: use filename without extension
-            class_name = file_path.stem
-            
-            sootup_cmd = f"java -jar /opt/sootup/sootup-cli.jar --input-dir . --class-name {class_name} --analysis reachability"
-            
-            exit_code, output = self.docker.exec_command(sootup_cmd)
-            
-            reachable = False
-            call_stack = []
-            
-            if exit_code == 0 and "Reachable" in output:
-                reachable = True
-                call_stack = ["main", "...", f"{class_name}:{line}"]
+            # 결과는 클래스 단위이므로 같은 클래스의 라인들은 SootUp 실행 결과를 공유
+            class_reachable: Dict[str, bool] = {}
+            results: Dict[Tuple[Path, int], AuxAnalysisResult] = {}
+            for file_path, line in targets:
+                class_name = file_path.stem
+                if class_name not in class_reachable:
+                    sootup_cmd = f"java -jar /opt/sootup/sootup-cli.jar --input-dir {shlex.quote(classes_dir)} --class-name {shlex.quote(class_name)} --analysis reachability"
+                    exit_code, output = self.docker.exec_command(sootup_cmd)
+                    class_reachable[class_name] = exit_code == 0 and "Reachable" in output
+                
+                reachable = class_reachable[class_name]
+                call_stack = ["main", "...", f"{class_name}:{line}"] if reachable else []
+                results[(file_path, line)] = AuxAnalysisResult(reachable, call_stack, ["Data flow analysis not implemented"])
             
-            return AuxAnalysisResult(reachable, call_stack, ["Data flow analysis not implemented"])
+            return results
 
         except Exception as e:
             logger.error(f"SootUp Analysis Error: {e}")
-            return AuxAnalysisResult(False, [f"Error: {e}"], [])
-        finally:
+            # 컨테이너 상태를 알 수 없으므로 정리하고 다음 분석에서 새로 시작
             self.docker.cleanup()
+            return {target: AuxAnalysisResult(False, [f"Error: {e}"], []) for target in targets}
@@ -1,9 +1,14 @@
+import bisect
 import os
+import re
+import shlex
+from collections import deque
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from loguru import logger
 from .docker_manager import DockerManager
 from sarif_cli.core.aux_analyser import AuxAnalysisResult
+from sarif_cli.core.detector import get_file_index
 
 class SVFAnalyser:
     """
@@ -12,36 +17,61 @@ class SVFAnalyser:
     """
     # Using a lightweight SVF image or the one from crs-sarif if available
     # For now, we'll use a placeholder or assume 'svf-tools/SVF' is available/built
-    IMAGE_NAME = "svf-tools/svf" 
+    IMAGE_NAME = "svf-tools/svf"
 
-    def __init__(self, project_dir: Path):
+    def __init__(self, project_dir: Path, docker: Optional[DockerManager] = None):
         self.project_dir = project_dir.resolve()
-        self.docker = DockerManager(self.IMAGE_NAME, self.project_dir)
+        # 컨테이너는 분석마다 새로 띄우지 않고 첫 분석 때 시작하여 재사용 (프로세스 종료 시 정리)
+        self.docker = docker or DockerManager(self.IMAGE_NAME, self.project_dir)
 
     def analyze(self, file_path: Path, line: int) -> AuxAnalysisResult:
+        return self.analyze_many([(file_path, line)])[(file_path, line)]
+
+    def analyze_many(self, targets: Iterable[Tuple[Path, int]]) -> Dict[Tuple[Path, int], AuxAnalysisResult]:
+        """
+        여러 (파일, 라인)을 한 번에 분석합니다.
+        대상 파일들을 한 번의 exec으로 컴파일하고 wpa도 한 번만 실행합니다.
+        """
+        targets = list(targets)
         try:
-            self.docker.start_container()
-            
+            self.docker.ensure_container()
+
             # 1. Compile to LLVM Bitcode (.bc)
             # We need to find the relative path from project root
-            try:
-                rel_path = file_path.relative_to(self.project_dir)
-            except ValueError:
-                # If file_path is absolute but not in project_dir, try to handle or fail
-                rel_path = file_path.name # Fallback
-            
-            bc_file = f"{rel_path}.bc"
-            
+            rel_paths: Dict[Path, str] = {}
+            for file_path, _ in targets:
+                if file_path not in rel_paths:
+                    try:
+                        rel_paths[file_path] = str(file_path.relative_to(self.project_dir))
+                    except ValueError:
+                        # If file_path is absolute but not in project_dir, try to handle or fail
+                        rel_paths[file_path] = file_path.name # Fallback
+            sources = list(dict.fromkeys(rel_paths.values()))
+
             # Simple compilation command - might fail for complex projects
             # -g: generate debug info (crucial for line mapping)
             # -c: compile only
             # -emit-llvm: generate bitcode
-            compile_cmd = f"clang -c -emit-llvm -g {rel_path} -o {bc_file}"
-            
+            # 소스 마운트는 읽기 전용이므로 bitcode는 WORK_DIR에 기록 (경로의 /를 __로 바꿔 파일명 충돌 방지)
+            # 파일별 성공 여부를 "OK:<파일>" 줄로 출력
+            # 파일 이름은 분석 대상 프로젝트에서 오므로 셸에서 확장되지 않도록 shlex.quote로 인용
+            work = self.docker.WORK_DIR
+            compile_cmd = "; ".join(
+                f"clang -c -emit-llvm -g {shlex.quote(src)} -o {shlex.quote(f'{work}/{self._bc_name(src)}')} 2>&1"
+                f" && echo {shlex.quote(f'OK:{src}')}"
+                for src in sources
+            )
             exit_code, output = self.docker.exec_command(compile_cmd)
-            if exit_code != 0:
+            compiled = {line[3:] for line in output.splitlines() if line.startswith("OK:")}
+            if len(compiled) < len(sources):
                 logger.warning(f"SVF Compilation failed: {output}")
-                return AuxAnalysisResult(False, ["Compilation failed"], [])
+
+            results: Dict[Tuple[Path, int], AuxAnalysisResult] = {}
+            for target in targets:
+                if rel_paths[target[0]] not in compiled:
+                    results[target] = AuxAnalysisResult(False, ["Compilation failed"], [])
+            if not compiled:
+                return results
 
             # 2. Run SVF (wpa)
             # -ander: Andersen's pointer analysis (fast, less precise)
@@ -49,38 +79,184 @@ class SVFAnalyser:
             # We need to check reachability to the target line.
             # SVF doesn't have a direct "is line X reachable" CLI flag easily accessible without custom traversal.
             # However, we can check if the function containing the line is reachable from main.
-            
+
             # First, find the function name for the line (using llvm-dis or simple parsing? No, SVF can do it)
             # Let's use a heuristic: Run wpa and check if the function is in the call graph.
-            
-            wpa_cmd = f"wpa -ander -dump-callgraph {bc_file}"
+
+            # wpa는 callgraph 파일을 현재 디렉토리에 쓰므로 WORK_DIR에서 실행
+            # 파일명이 -로 시작해도 옵션으로 해석되지 않도록 ./를 붙임
+            bc_files = " ".join(shlex.quote(f"./{self._bc_name(src)}") for src in sources if src in compiled)
+            wpa_cmd = f"cd {shlex.quote(work)} && wpa -ander -dump-callgraph {bc_files}"
             exit_code, output = self.docker.exec_command(wpa_cmd)
-            
+
             if exit_code != 0:
                 logger.warning(f"SVF Analysis failed: {output}")
-                return AuxAnalysisResult(False, ["Analysis failed"], [])
-            
+                for target in targets:
+                    results.setdefault(target, AuxAnalysisResult(False, ["Analysis failed"], []))
+                return results
+
             # 3. Parse Results
-            # This is tricky without a custom SVF pass.
-            # For this MVP, we will assume if compilation and wpa succeed, and we find the function in the callgraph, it's "potentially reachable".
-            # To be more precise, we would need to parse the dot file.
-            
-            # Let's look for "callgraph_final.dot"
-            exit_code, dot_content = self.docker.exec_command("cat callgraph_final.dot")
-            
-            reachable = False
-            call_stack = []
-            
-            if exit_code == 0 and len(dot_content) > 0:
-                # Heuristic: If the dot file is generated, we consider it a success.
-                # Real reachability requires parsing the graph from 'main' to target function.
-                reachable = True 
-                call_stack = ["main", "...", f"Function at {rel_path}:{line}"]
-            
-            return AuxAnalysisResult(reachable, call_stack, ["Data flow analysis not implemented"])
+            # 호출 그래프에서 진입 함수(main 등)부터 BFS로 대상 라인을 포함한 함수까지의 경로를 찾음
+            # 대상 함수는 bitcode의 디버그 정보(DISubprogram 시작 라인)로 결정
+            exit_code, dot_content = self.docker.exec_command(f"cat {shlex.quote(f'{work}/callgraph_final.dot')}")
+            if exit_code != 0 or not dot_content:
+                for target in targets:
+                    results.setdefault(target, AuxAnalysisResult(False, [], ["Data flow analysis not implemented"]))
+                return results
+            callgraph = parse_callgraph_dot(dot_content)
+
+            debug_cmd = "; ".join(
+                f"echo {shlex.quote(f'FILE:{src}')}; llvm-dis {shlex.quote(f'{work}/{self._bc_name(src)}')} -o -"
+                f' | grep -E "^!.*(DISubprogram|DIFile)\\("'
+                for src in sources if src in compiled
+            )
+            _, debug_output = self.docker.exec_command(debug_cmd)
+            functions = parse_debug_functions(debug_output)
+
+            # 호출 그래프가 프로그램 전체(인덱스된 C/C++ 번역 단위 모두)로 만들어진 경우에만
+            # "경로 없음"을 미도달로 확정 (일부 파일만 링크했다면 다른 파일의 호출이 빠져 있을 수 있음)
+            whole_program = self._program_sources() <= compiled
+            if not whole_program:
+                logger.debug("SVF: 일부 소스만 분석하여 미도달 판정은 확정하지 않음")
+            entries = [name for name in ENTRY_FUNCTIONS if name in callgraph]
+            reachable_paths = _shortest_paths(callgraph, entries)
+            for file_path, line in targets:
+                if (file_path, line) in results:
+                    continue
+                src = rel_paths[file_path]
+                function = _enclosing_function(functions.get(src, []), line)
+                if not entries or function is None:
+                    # 진입 함수나 대상 함수를 알 수 없으면 판정하지 않음 (도달 가능할 수 있다고 보고 LLM에 맡김)
+                    results[(file_path, line)] = AuxAnalysisResult(
+                        True, ["...", f"Function at {src}:{line}"], ["Data flow analysis not implemented"]
+                    )
+                    continue
+                path = reachable_paths.get(function)
+                call_stack = path + [f"{src}:{line}"] if path else []
+                results[(file_path, line)] = AuxAnalysisResult(
+                    path is not None,
+                    call_stack,
+                    ["Data flow analysis not implemented"],
+                    confirmed=path is not None or whole_program,
+                )
+            return results
 
         except Exception as e:
             logger.error(f"SVF Analysis Error: {e}")
-            return AuxAnalysisResult(False, [f"Error: {e}"], [])
-        finally:
+            # 컨테이너 상태를 알 수 없으므로 정리하고 다음 분석에서 새로 시작
             self.docker.cleanup()
+            return {target: AuxAnalysisResult(False, [f"Error: {e}"], []) for target in targets}
+
+    def _program_sources(self) -> Set[str]:
+        """프로그램 전체를 이루는 C/C++ 번역 단위(헤더 제외)의 프로젝트 기준 상대 경로"""
+        index = get_file_index(self.project_dir)
+        return {str(f.relative_to(self.project_dir)) for f in index.get(*TRANSLATION_UNIT_EXTENSIONS)}
+
+    @staticmethod
+    def _bc_name(src: str) -> str:
+        """소스 상대 경로에 대응하는 WORK_DIR 안의 bitcode 파일명"""
+        return src.replace("/", "__") + ".bc"
+
+
+# 도달 가능성 판정의 시작점 (프로그램 진입점, libFuzzer 하네스)
+ENTRY_FUNCTIONS = ("main", "LLVMFuzzerTestOneInput")
+
+# wpa에 링크할 번역 단위 확장자 (헤더는 단독으로 컴파일하지 않음)
+TRANSLATION_UNIT_EXTENSIONS = (".c", ".cpp", ".cc", ".cxx")
+
+# SVF 호출 그래프 DOT: 노드는 "Node0x... [..., label=\"{CallGraphNode ID: N \{fun: name\}...}\"]",
+# 간선은 "Node0x...(:포트) -> Node0x...". 이름을 직접 쓰는 일반 DOT("a" -> "b")도 허용
+_DOT_NODE_RE = re.compile(r'^\s*(\w+)\s*\[.*?fun:\s*([^\\}"|]+)')
+_DOT_EDGE_RE = re.compile(r'^\s*("[^"]+"|\w+)(?::\w+)?\s*->\s*("[^"]+"|\w+)')
+_DI_FILE_RE = re.compile(r'^(![0-9]+) = !DIFile\(filename: "([^"]*)"')
+_DI_SUBPROGRAM_RE = re.compile(r'name: "([^"]*)"(?:, linkageName: "([^"]*)")?.*?[ (]file: (![0-9]+), line: ([0-9]+)')
+
+
+def parse_callgraph_dot(dot: str) -> Dict[str, Set[str]]:
+    """
+    호출 그래프 DOT을 한 번 순회하여 함수 이름 기준 인접 리스트를 만듭니다.
+
+    Returns:
+        호출하는 함수 이름 -> 호출되는 함수 이름 집합
+    """
+    names: Dict[str, str] = {}
+    edges: List[Tuple[str, str]] = []
+    for text in dot.splitlines():
+        edge = _DOT_EDGE_RE.match(text)
+        if edge:
+            edges.append((edge.group(1), edge.group(2)))
+            continue
+        node = _DOT_NODE_RE.match(text)
+        if node:
+            names[node.group(1)] = node.group(2).strip()
+
+    adjacency: Dict[str, Set[str]] = {}
+    for src, dst in edges:
+        caller = names.get(src, src.strip('"'))
+        callee = names.get(dst, dst.strip('"'))
+        adjacency.setdefault(caller, set()).add(callee)
+        adjacency.setdefault(callee, set())
+    for name in names.values():
+        adjacency.setdefault(name, set())
+    return adjacency
+
+
+def parse_debug_functions(output: str) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    llvm-dis 출력의 DIFile/DISubprogram 메타데이터에서 소스 파일별 함수 정의 시작 라인을 추출합니다.
+    출력은 소스마다 "FILE:<상대 경로>" 줄로 시작합니다.
+
+    Returns:
+        소스 상대 경로 -> 시작 라인 순으로 정렬된 (시작 라인, 함수 이름) 목록
+            (함수 이름은 호출 그래프와 같은 LLVM 이름: C++은 linkageName)
+    """
+    functions: Dict[str, List[Tuple[int, str]]] = {}
+    src = None
+    files: Dict[str, str] = {}
+    subprograms: List[Tuple[str, str, int]] = []
+
+    def flush():
+        if src is None:
+            return
+        entries = functions.setdefault(src, [])
+        for file_ref, name, line in subprograms:
+            filename = os.path.normpath(files.get(file_ref, ""))
+            if filename == os.path.normpath(src) or filename.endswith("/" + src):
+                entries.append((line, name))
+        entries.sort()
+
+    for text in output.splitlines():
+        if text.startswith("FILE:"):
+            flush()
+            src, files, subprograms = text[5:], {}, []
+            continue
+        di_file = _DI_FILE_RE.match(text)
+        if di_file:
+            files[di_file.group(1)] = di_file.group(2)
+            continue
+        # 선언(외부 함수)은 제외하고 정의만 사용
+        if "DISubprogram(" in text and ("DISPFlagDefinition" in text or "distinct !DISubprogram" in text):
+            sp = _DI_SUBPROGRAM_RE.search(text)
+            if sp:
+                subprograms.append((sp.group(3), sp.group(2) or sp.group(1), int(sp.group(4))))
+    flush()
+    return functions
+
+
+def _enclosing_function(functions: List[Tuple[int, str]], line: int) -> Optional[str]:
+    """시작 라인이 line 이하인 함수 중 가장 가까운 함수 (정의 범위 정보가 없으므로 근사)"""
+    index = bisect.bisect_right(functions, (line, "\uffff")) - 1
+    return functions[index][1] if index >= 0 else None
+
+
+def _shortest_paths(callgraph: Dict[str, Set[str]], entries: List[str]) -> Dict[str, List[str]]:
+    """진입 함수들에서 BFS로 도달 가능한 함수와 그 최단 호출 경로"""
+    paths: Dict[str, List[str]] = {entry: [entry] for entry in entries}
+    queue = deque(entries)
+    while queue:
+        caller = queue.popleft()
+        for callee in callgraph.get(caller, ()):
+            if callee not in paths:
+                paths[callee] = paths[caller] + [callee]
+                queue.append(callee)
+    return paths
@@ -0,0 +1,314 @@
+"""
+분석 결과 캐시 모듈 - 파일 내용 해시 기반 증분 분석
+
+(도구, 언어, 파일) 단위로 마지막 분석 결과를 SQLite에 저장하고,
+파일 내용 해시와 도구 버전이 같으면 저장된 결과를 재사용합니다.
+LLM 검증 응답처럼 입력 해시로 식별되는 값은 같은 DB의 키-값 테이블에 저장합니다.
+도구가 생성한 SARIF 보고서의 파싱 결과도 보고서 해시(또는 분석 입력 해시) 단위로 저장합니다.
+CodeQL 데이터베이스처럼 생성 비용이 큰 디렉토리는 소스 트리 fingerprint 단위로 보관합니다 (LRU).
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from sarif_cli.core import fastjson
+
+
+def file_digest(path: Path) -> str:
+    """파일 내용의 SHA-256 해시"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    파일 단위 분석 결과 캐시 (SQLite)
+
+    분석 스레드들이 하나의 연결을 공유하므로 모든 접근은 lock으로 직렬화합니다.
+    """
+
+    def __init__(self, cache_dir: Path):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "results.sqlite"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    tool TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    tool_version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (tool, language, file)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS kv (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def get(
+        self,
+        tool: str,
+        language: str,
+        file: str,
+        digest: str,
+        tool_version: str,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        캐시된 결과 조회
+
+        Returns:
+            해시와 도구 버전이 일치하면 결과 리스트, 아니면 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM results "
+                "WHERE tool = ? AND language = ? AND file = ? AND digest = ? AND tool_version = ?",
+                (tool, language, file, digest, tool_version),
+            ).fetchone()
+        if row is None:
+            return None
+        return fastjson.loads(row[0])
+
+    def put(
+        self,
+        tool: str,
+        language: str,
+        file: str,
+        digest: str,
+        tool_version: str,
+        results: List[Dict[str, Any]],
+    ) -> None:
+        """결과 저장 (같은 파일의 이전 결과는 덮어씀)"""
+        payload = fastjson.dumps(results)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (tool, language, file, digest, tool_version, payload),
+            )
+
+
+    def get_value(self, namespace: str, key: str) -> Optional[Any]:
+        """키 단위 캐시 조회 (LLM 응답 등, 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM kv WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return fastjson.loads(row[0])
+
+    def put_value(self, namespace: str, key: str, value: Any) -> None:
+        """키 단위 캐시 저장 (JSON 직렬화 가능한 값)"""
+        payload = fastjson.dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv VALUES (?, ?, ?)",
+                (namespace, key, payload),
+            )
+
+
+@lru_cache(maxsize=None)
+def _get_cache(cache_dir: str) -> ResultCache:
+    logger.info(f"분석 결과 캐시 사용: {cache_dir}")
+    return ResultCache(Path(cache_dir))
+
+
+def get_result_cache(cache_dir: Path) -> ResultCache:
+    """캐시 디렉토리당 하나의 ResultCache 인스턴스를 반환합니다."""
+    return _get_cache(str(cache_dir.resolve()))
+
+
+def report_digest(path: Path) -> str:
+    """SARIF 보고서 내용의 BLAKE2b 해시 (파싱 결과 캐시 키)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _report_cache_path(cache_dir: Path, digest: str, kind: str) -> Path:
+    return cache_dir / kind / f"{digest}.json"
+
+
+def load_parsed_report(
+    cache_dir: Path,
+    digest: str,
+    kind: str = "sarif",
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    save_parsed_report로 저장한 파싱 결과를 읽습니다.
+
+    Args:
+        cache_dir: 캐시 디렉토리
+        digest: 캐시 키 (보고서 해시 등)
+        kind: 캐시 종류 (하위 디렉토리 이름)
+
+    Returns:
+        래퍼 결과 리스트 (캐시가 없거나 손상된 경우 None)
+    """
+    path = _report_cache_path(cache_dir, digest, kind)
+    try:
+        data = fastjson.load_file(path)
+        tools = data["tools"]
+        results = data["results"]
+        # 같은 run의 결과가 tool_metadata 객체를 다시 공유하도록 복원
+        for r in results:
+            r["tool_metadata"] = tools[r.pop("tool_index")]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+        logger.warning(f"SARIF 파싱 캐시를 읽을 수 없습니다 ({path}): {e}")
+        return None
+    return results
+
+
+def save_parsed_report(
+    cache_dir: Path,
+    digest: str,
+    results: List[Dict[str, Any]],
+    kind: str = "sarif",
+) -> None:
+    """
+    SARIF 보고서의 파싱 결과를 저장합니다.
+    결과마다 공유되는 tool_metadata(run.tool, 규칙 목록 포함)는 한 번만 저장합니다.
+    """
+    tools: List[Dict[str, Any]] = []
+    tool_index: Dict[int, int] = {}
+    entries = []
+    for r in results:
+        tool = r.get("tool_metadata", {})
+        idx = tool_index.get(id(tool))
+        if idx is None:
+            idx = tool_index[id(tool)] = len(tools)
+            tools.append(tool)
+        entry = {k: v for k, v in r.items() if k != "tool_metadata"}
+        entry["tool_index"] = idx
+        entries.append(entry)
+
+    path = _report_cache_path(cache_dir, digest, kind)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fastjson.dump_file(tmp_path, {"tools": tools, "results": entries}, indent=False)
+        # 동시에 같은 보고서를 저장해도 완성된 파일만 보이도록 원자적으로 교체
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"SARIF 파싱 캐시 저장 실패 ({path}): {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def files_fingerprint(
+    root: Path,
+    files: Iterable[Path],
+    extra: Iterable[str] = (),
+) -> str:
+    """
+    파일 목록의 fingerprint (root 기준 상대 경로, 수정 시각, 크기 기반 BLAKE2b 해시)
+
+    파일 내용을 읽지 않고 stat만 사용하므로 큰 트리에서도 빠릅니다.
+    도구가 읽는 소스 파일만 해시하므로, 빌드나 도구가 프로젝트 안에 쓰는
+    산출물(.o, class 파일, 보고서 등)은 fingerprint에 영향을 주지 않습니다.
+
+    Args:
+        root: 프로젝트 루트 디렉토리
+        files: 해시할 파일 목록 (FileIndex의 경로)
+        extra: 함께 해시할 값 (도구 버전 등)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for value in extra:
+        h.update(value.encode())
+        h.update(b"\0")
+    for path in sorted(os.path.relpath(f, root) for f in files):
+        try:
+            st = os.stat(os.path.join(root, path))
+        except OSError:
+            continue
+        h.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    return h.hexdigest()
+
+
+class DirectoryCache:
+    """
+    키 단위로 디렉토리를 보관하는 LRU 캐시
+
+    항목은 임시 이름(staging)으로 만든 뒤 rename으로 등록하므로,
+    생성 중이거나 실패한 디렉토리가 캐시 항목으로 보이지 않습니다.
+    사용 시각은 디렉토리 mtime으로 기록하며, 최대 개수를 넘으면 오래된 항목부터 삭제합니다.
+    """
+
+    _STAGING_SUFFIX = ".staging"
+
+    def __init__(self, root: Path, max_entries: int):
+        self.root = root
+        self.max_entries = max(1, max_entries)
+
+    def get(self, key: str) -> Optional[Path]:
+        """캐시된 디렉토리 경로 (없으면 None)"""
+        path = self.root / key
+        if not path.is_dir():
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def staging_path(self, key: str) -> Path:
+        """put에 넘길 디렉토리를 만들 임시 경로 (캐시와 같은 파일시스템)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root / f"{key}.{uuid.uuid4().hex}{self._STAGING_SUFFIX}"
+
+    def put(self, key: str, staging: Path) -> Path:
+        """
+        staging 디렉토리를 캐시에 등록하고 최종 경로를 반환합니다.
+        다른 프로세스가 같은 키를 먼저 등록했다면 staging을 버리고 기존 항목을 사용합니다.
+        """
+        path = self.root / key
+        try:
+            os.rename(staging, path)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not path.is_dir():
+                raise
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep: Path) -> None:
+        entries = []
+        for entry in self.root.iterdir():
+            if entry == keep or entry.name.endswith(self._STAGING_SUFFIX) or not entry.is_dir():
+                continue
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        # keep을 포함해 max_entries개만 남김
+        for _, entry in entries[self.max_entries - 1:]:
+            logger.info(f"오래된 캐시 항목 삭제: {entry}")
+            shutil.rmtree(entry, ignore_errors=True)
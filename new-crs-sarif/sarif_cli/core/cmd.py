@@ -1,7 +1,13 @@
+import os
+import shlex
+import signal
 import subprocess
 import sys
 from abc import ABC
-from typing import NamedTuple
+from contextlib import ExitStack
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Optional
 from loguru import logger
 
 
@@ -11,6 +17,51 @@ class ProcessRunRet(NamedTuple):
     stderr: str
 
 
+@lru_cache(maxsize=None)
+def get_tool_version(executable: str, flag: str = "--version") -> Optional[str]:
+    """
+    `<executable> --version` 출력의 첫 줄을 반환합니다 (프로세스당 한 번 실행).
+    버전 옵션이 다른 도구는 flag로 지정합니다 (예: spotbugs -version).
+    실행할 수 없으면 None을 반환합니다.
+    """
+    try:
+        result = subprocess.run(
+            [executable, flag],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug(f"{executable} 버전 확인 실패: {e}")
+        return None
+    output = (result.stdout or result.stderr).strip()
+    return output.splitlines()[0] if output else None
+
+
+def kill_process_group(proc: subprocess.Popen) -> None:
+    """start_new_session=True로 시작한 프로세스와 그 자식 프로세스를 모두 종료합니다."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        proc.kill()
+
+
+def write_javac_argfile(argfile: Path, sources: Iterable[Path]) -> None:
+    """
+    javac 인자 파일(@argfile)을 작성합니다.
+    소스가 많아도 명령줄 길이 제한(ARG_MAX)에 걸리지 않고 javac 한 번으로 컴파일할 수 있습니다.
+
+    Args:
+        argfile: 작성할 인자 파일 경로
+        sources: 컴파일할 소스 파일 경로
+    """
+    with open(argfile, "w", encoding="utf-8") as f:
+        for source in sources:
+            # 공백이 있는 경로를 위해 따옴표로 감싸고 \, "를 이스케이프
+            escaped = str(source).replace("\\", "\\\\").replace('"', '\\"')
+            f.write(f'"{escaped}"\n')
+
+
 class BaseCommander(ABC):
     def __init__(self, quiet=False):
         self.quiet = quiet
@@ -26,68 +77,69 @@ class BaseCommander(ABC):
         stdout_file: str | None = None,
         stderr_file: str | None = None,
     ) -> ProcessRunRet:
-        if isinstance(cmd, list):
-            cmd = " ".join(cmd)
+        # 목록으로 받은 명령은 셸을 거치지 않고 바로 실행 (셸 fork/파싱 비용, 인젝션 위험 없음)
+        # 문자열 명령은 파이프/리디렉션을 쓸 수 있으므로 기존처럼 셸로 실행
+        shell = isinstance(cmd, str)
 
         if not quiet:
-            logger.debug(f"Running command: {cmd}")
+            logger.debug(f"Running command: {cmd if shell else shlex.join(cmd)}")
 
         try:
             if quiet:
-                result = subprocess.run(
-                    cmd,
-                    input=input,
-                    shell=True,
-                    cwd=cwd,
-                    check=True,
-                    text=True,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    timeout=timeout,
-                )
-            elif not pipe:
-                result = subprocess.run(
-                    cmd,
-                    input=input,
-                    shell=True,
-                    cwd=cwd,
-                    check=True,
-                    text=True,
-                    stdout=sys.stdout,
-                    stderr=sys.stderr,
-                    timeout=timeout,
-                )
-            else:
-                result = subprocess.run(
-                    cmd,
-                    input=input,
-                    shell=True,
-                    cwd=cwd,
-                    check=True,
-                    text=True,
-                    capture_output=True,
-                    timeout=timeout,
-                )
-
-            return ProcessRunRet(result.returncode, result.stdout, result.stderr)
-
-        except subprocess.CalledProcessError as e:
-            logger.error(
-                f"Error occurred while running CMD: {cmd} at {cwd}. Error: {e}"
-            )
-
-            return ProcessRunRet(e.returncode, e.stdout, e.stderr)
+                return self._run_process(cmd, shell, input, cwd, timeout, subprocess.DEVNULL, subprocess.DEVNULL)
+            if not pipe:
+                return self._run_process(cmd, shell, input, cwd, timeout, sys.stdout, sys.stderr)
+            # stdout_file/stderr_file이 지정된 스트림은 파일에 바로 기록 (메모리에 모으지 않음, 반환값은 빈 문자열)
+            with ExitStack() as stack:
+                stdout = stack.enter_context(open(stdout_file, "a")) if stdout_file else subprocess.PIPE
+                stderr = stack.enter_context(open(stderr_file, "a")) if stderr_file else subprocess.PIPE
+                return self._run_process(cmd, shell, input, cwd, timeout, stdout, stderr)
 
+        except OSError as e:
+            # 셸 없이 실행한 명령을 찾을 수 없는 경우 (셸의 command not found와 같은 종료 코드)
+            logger.error(f"Failed to run CMD: {cmd} at {cwd}. Error: {e}")
+
+            return ProcessRunRet(127, "", str(e))
+
+    def _run_process(
+        self,
+        cmd: str | list[str],
+        shell: bool,
+        input: str | None,
+        cwd: str | None,
+        timeout: int | None,
+        stdout: Any,
+        stderr: Any,
+    ) -> ProcessRunRet:
+        """
+        명령을 실행하고 종료 코드를 그대로 반환합니다.
+        일부 도구(wpa 등)는 부분 성공에도 0이 아닌 코드를 반환하므로 예외로 바꾸지 않고 호출부가 판단합니다.
+        timeout이 지나면 셸의 자식 프로세스까지 프로세스 그룹 전체를 종료하고 회수합니다.
+        """
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if input is not None else None,
+            stdout=stdout,
+            stderr=stderr,
+            shell=shell,
+            cwd=cwd,
+            text=True,
+            start_new_session=True,
+        )
+        try:
+            out, err = proc.communicate(input=input, timeout=timeout)
         except subprocess.TimeoutExpired as e:
+            kill_process_group(proc)
+            out, err = proc.communicate()
             logger.error(f"Timeout occurred while running CMD: {cmd} at {cwd}")
             logger.error(e)
+            return ProcessRunRet(-1, out or "", err or "")
+        except BaseException:
+            # Ctrl-C 등으로 중단되면 실행 중인 프로세스도 함께 종료
+            kill_process_group(proc)
+            proc.wait()
+            raise
 
-            return ProcessRunRet(-1, e.stdout, e.stderr)
-
-        finally:
-            if stdout_file and result.stdout:
-                with open(stdout_file, "a") as f:
-                    f.write(result.stdout)
-            if stderr_file and result.stderr:
-                with open(stderr_file, "a") as f:
-                    f.write(result.stderr)
+        if proc.returncode != 0:
+            logger.warning(f"CMD exited with status {proc.returncode}: {cmd} at {cwd}")
+        return ProcessRunRet(proc.returncode, out or "", err or "")
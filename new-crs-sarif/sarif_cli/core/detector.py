@@ -1,20 +1,109 @@
 """
 언어 감지 모듈 - 파일 확장자 기반 언어 자동 감지
 """
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Set
+from typing import Dict, List, Set
 from loguru import logger
 
 
 # 언어별 파일 확장자 매핑
 LANGUAGE_EXTENSIONS = {
-    "c": {".c", ".h"},
-    "cpp": {".cpp", ".cc", ".cxx", ".hpp", ".hxx", ".h++"},
-    "java": {".java"},
-    "python": {".py"},
-    "javascript": {".js", ".jsx", ".ts", ".tsx"},
+    "c": frozenset({".c", ".h"}),
+    "cpp": frozenset({".cpp", ".cc", ".cxx", ".hpp", ".hxx", ".h++"}),
+    "java": frozenset({".java"}),
+    "python": frozenset({".py"}),
+    "javascript": frozenset({".js", ".jsx", ".ts", ".tsx"}),
 }
 
+# 확장자 -> 언어 (LANGUAGE_EXTENSIONS의 역방향 매핑, 파일당 O(1) 분류)
+EXT_TO_LANG = {ext: lang for lang, exts in LANGUAGE_EXTENSIONS.items() for ext in exts}
+
+# 소스 탐색 시 어느 깊이에서나 건너뛸 디렉토리 (의존성, 바이트코드 캐시)
+# 숨김 디렉토리(.git, .venv 등)는 별도로 모두 제외
+SKIP_DIRS = frozenset({
+    "node_modules",
+    "__pycache__",
+})
+
+# 빌드 산출물/가상환경 디렉토리 - 실제 소스 패키지(com/acme/build, src/out 등)와 이름이 겹칠 수 있으므로
+# 프로젝트 루트에 있거나 같은 디렉토리에 빌드 파일(BUILD_MARKERS)이 있을 때만 건너뜀 (모듈별 target/ 등)
+BUILD_OUTPUT_DIRS = frozenset({
+    "build",
+    "target",
+    "out",
+    "dist",
+    "venv",
+})
+
+BUILD_MARKERS = frozenset({
+    "pom.xml",
+    "build.gradle",
+    "build.gradle.kts",
+    "build.xml",
+    "CMakeLists.txt",
+    "Makefile",
+    "meson.build",
+    "package.json",
+    "setup.py",
+    "pyproject.toml",
+})
+
+
+@dataclass
+class FileIndex:
+    """프로젝트 파일 인덱스 - 확장자(소문자)별 파일 경로 목록"""
+    by_ext: Dict[str, List[Path]] = field(default_factory=dict)
+
+    def get(self, *suffixes: str) -> List[Path]:
+        """주어진 확장자들에 해당하는 파일 목록 반환 (인자 순서대로)"""
+        return [f for suffix in suffixes for f in self.by_ext.get(suffix, [])]
+
+
+def _scan_project(project_dir: Path) -> FileIndex:
+    """
+    디렉토리를 한 번만 순회하여 확장자별 파일 인덱스를 생성합니다.
+    숨김 디렉토리(.git 등)와 SKIP_DIRS는 탐색하지 않고, BUILD_OUTPUT_DIRS는 프로젝트 루트이거나
+    같은 디렉토리에 빌드 파일이 있을 때만 탐색하지 않습니다.
+    """
+    by_ext: Dict[str, List[Path]] = defaultdict(list)
+    top = os.fspath(project_dir)
+    for root, dirs, files in os.walk(top):
+        skip_build = root == top or not BUILD_MARKERS.isdisjoint(files)
+        dirs[:] = [
+            d for d in dirs
+            if d not in SKIP_DIRS
+            and not d.startswith(".")
+            and not (skip_build and d in BUILD_OUTPUT_DIRS)
+        ]
+        for name in files:
+            suffix = os.path.splitext(name)[1].lower()
+            if suffix:
+                by_ext[suffix].append(Path(root) / name)
+    return FileIndex(by_ext=dict(by_ext))
+
+
+@lru_cache(maxsize=None)
+def _get_index(project_dir: str) -> FileIndex:
+    return _scan_project(Path(project_dir))
+
+
+def get_file_index(project_dir: Path) -> FileIndex:
+    """
+    프로젝트의 파일 인덱스를 반환합니다.
+    같은 프로세스 안에서는 디렉토리당 한 번만 순회합니다.
+
+    Args:
+        project_dir: 프로젝트 디렉토리
+
+    Returns:
+        FileIndex (경로는 resolve된 절대 경로)
+    """
+    return _get_index(str(project_dir.resolve()))
+
 
 def detect_languages(project_dir: Path) -> Set[str]:
     """
@@ -26,43 +115,41 @@ def detect_languages(project_dir: Path) -> Set[str]:
     Returns:
         감지된 언어 집합 (예: {"c", "java"})
     """
+    # 파일 인덱스(디렉토리당 한 번 순회)의 확장자만 확인하므로 파일마다 다시 stat하지 않음
+    file_index = get_file_index(project_dir)
     detected_languages = set()
-    
-    # 모든 파일 순회
-    for file_path in project_dir.rglob("*"):
-        if not file_path.is_file():
-            continue
-        
-        ext = file_path.suffix.lower()
-        
-        # 언어별 확장자 매칭
-        for language, extensions in LANGUAGE_EXTENSIONS.items():
-            if ext in extensions:
-                detected_languages.add(language)
-                logger.info(f"감지: {file_path.name} → {language}")
+    file_count = 0
+    for ext, files in file_index.by_ext.items():
+        language = EXT_TO_LANG.get(ext)
+        if language is not None:
+            detected_languages.add(language)
+            file_count += len(files)
     
     if not detected_languages:
         logger.warning("지원되는 언어를 찾을 수 없습니다.")
+    else:
+        logger.info(f"감지: {', '.join(sorted(detected_languages))} (소스 파일 {file_count}개)")
     
     return detected_languages
 
 
-def get_files_by_language(project_dir: Path, language: str) -> list[Path]:
+def get_files_by_language(
+    project_dir: Path,
+    language: str,
+    file_index: FileIndex | None = None,
+) -> list[Path]:
     """
     특정 언어의 소스 파일만 반환합니다.
     
     Args:
         project_dir: 프로젝트 디렉토리
         language: 언어 (예: "c", "java")
+        file_index: 미리 생성된 파일 인덱스 (없으면 get_file_index 사용)
     
     Returns:
         해당 언어의 파일 경로 리스트
     """
-    extensions = LANGUAGE_EXTENSIONS.get(language, set())
-    files = []
-    
-    for file_path in project_dir.rglob("*"):
-        if file_path.is_file() and file_path.suffix.lower() in extensions:
-            files.append(file_path)
-    
-    return files
+    if file_index is None:
+        file_index = get_file_index(project_dir)
+    extensions = LANGUAGE_EXTENSIONS.get(language, frozenset())
+    return file_index.get(*sorted(extensions))
@@ -0,0 +1,75 @@
+"""
+JSON 헬퍼 - 도구 출력(SARIF, Bandit JSON 등) 파싱, SARIF 결과 및 분석 캐시 저장용
+
+orjson(선택 의존성)이 설치되어 있으면 사용하고, 없으면 표준 json을 사용합니다.
+"""
+import json
+import mmap
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    JSON 문자열(또는 UTF-8 바이트)을 파싱합니다.
+
+    Raises:
+        json.JSONDecodeError: JSON 형식이 올바르지 않은 경우
+            (orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data: Any) -> str:
+    """JSON 문자열로 직렬화합니다 (공백 없이, 비 ASCII 문자는 이스케이프하지 않음)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def load_file(path: Path) -> Any:
+    """
+    JSON 파일을 파싱합니다.
+    orjson이 있으면 파일을 mmap으로 매핑해 넘기므로, 파일 전체를 bytes로 한 번 더 복사하지 않습니다.
+
+    Raises:
+        json.JSONDecodeError: JSON 형식이 올바르지 않은 경우
+    """
+    with open(path, "rb") as f:
+        if orjson is None:
+            return json.loads(f.read())
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # 빈 파일 등 mmap할 수 없는 경우
+            return orjson.loads(f.read())
+        with mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def dump_file(path: Path, data: Any, indent: bool = True) -> None:
+    """
+    JSON을 UTF-8로 저장합니다 (비 ASCII 문자는 이스케이프하지 않음).
+    문서 전체를 메모리에서 직렬화한 뒤 한 번에 기록하므로 json.dump처럼 토큰마다 write를 호출하지 않습니다.
+
+    Args:
+        path: 저장할 파일 경로
+        data: JSON 직렬화 가능한 값
+        indent: True면 2칸 들여쓰기 (--pretty), False면 공백 없이 (기본 SARIF 출력, 캐시)
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        Path(path).write_bytes(orjson.dumps(data, option=option))
+        return
+    if indent:
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    Path(path).write_text(text, encoding="utf-8")
@@ -2,19 +2,29 @@
 LLM 검증 모듈 - 취약점 검증 및 패치 생성
 OpenAI compatible API 사용 (Ollama 포함)
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
 from pathlib import Path
 from loguru import logger
 from pydantic import BaseModel
+import hashlib
+import json
+import mmap
 import os
+from functools import lru_cache
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-
-from sarif_cli.analyzer import VulnerabilityResult
+from sarif_cli.models.vulnerability import VulnerabilityResult
 from sarif_cli.config.settings import config
-from sarif_cli.core.aux_analyser import AuxAnalyser
+from sarif_cli.core.aux_analyser import get_aux_analyser, is_aux_relevant
+from sarif_cli.core.cache import get_result_cache
+
+# 응답 형식이나 프롬프트 구성 방식이 바뀌면 올려서 LLM 결과 캐시를 무효화
+PROMPT_VERSION = 1
+
+# 대상 라인 앞뒤로 포함할 context 라인 수
+CONTEXT_LINES = 5
+# 이 크기 이상의 소스 파일은 mmap으로 읽음 (context 앞부분은 디코딩 없이 건너뜀)
+MMAP_THRESHOLD = 1 << 20  # 1MB
+_SKIP_CHUNK = 1 << 20
 
 
 class PatchResult(BaseModel):
@@ -53,67 +63,27 @@ def verify_and_generate_patch(
             return {"is_valid": False, "explanation": "Source code not found"}
         
         # Aux 분석 실행 (이미 수행된 경우 재사용)
-        aux_result = vulnerability.aux_result
-        if not aux_result and config.ENABLE_AUX:
-            aux_analyser = AuxAnalyser(project_dir, language)
-            aux_analysis_obj = aux_analyser.analyze_reachability(vulnerability.file_path, vulnerability.line)
-            aux_result = {
-                "reachable": aux_analysis_obj.reachable,
-                "call_stack": aux_analysis_obj.call_stack,
-                "data_flow": aux_analysis_obj.data_flow
-            }
+        aux_result = _get_aux_result(vulnerability, project_dir, language)
+        verdict = _unreachable_verdict(aux_result)
+        if verdict is not None:
+            logger.info(f"도달 불가로 LLM 검증 생략: {vulnerability.file_path}:{vulnerability.line}")
+            return verdict
         
-        # 프롬프트 선택 및 로드
-        if config.ENABLE_AUX:
+        # 프롬프트 선택 및 로드 (Aux 분석 대상이 아닌 취약점은 도달 가능성 정보 없이 기본 프롬프트 사용)
+        if config.ENABLE_AUX and aux_result:
             prompt_file = config.AUX_ENHANCED_PROMPT_FILE
             logger.info(f"Aux Enhanced Prompt 사용: {prompt_file}")
         else:
             prompt_file = config.BASIC_PROMPT_FILE
             logger.info(f"Basic Prompt 사용: {prompt_file}")
             
-        try:
-            prompt_content = prompt_file.read_text(encoding="utf-8")
-            # Split system and human prompts (assuming separated by ---)
-            parts = prompt_content.split("---")
-            if len(parts) >= 2:
-                system_prompt = parts[0].strip()
-                human_prompt_template = parts[1].strip()
-            else:
-                # Fallback if format is wrong
-                system_prompt = "You are a security expert."
-                human_prompt_template = prompt_content
-        except Exception as e:
-            logger.error(f"프롬프트 파일 로드 실패: {e}")
+        prompts = _load_prompt(prompt_file)
+        if prompts is None:
             return {"is_valid": False, "explanation": "Prompt load failed"}
 
         # LLM 초기화
         logger.info(f"LLM 검증 시작: {vulnerability.rule_id} at {vulnerability.file_path}:{vulnerability.line}")
         
-        # 로컬 LLM (Ollama 등 OpenAI compatible API)
-        model_name = config.OLLAMA_MODEL
-        
-        # Ollama는 /v1을 base_url에 포함해야 함
-        base_url = config.LLM_URL
-        if not base_url.endswith("/v1"):
-            base_url = f"{base_url}/v1"
-        
-        logger.info(f"로컬 LLM 사용: {base_url}, 모델: {model_name}")
-        llm = ChatOpenAI(
-            base_url=base_url,
-            api_key="not-needed",  # 로컬 LLM은 API 키 불필요
-            model=model_name,
-            temperature=0.3
-        )
-        
-        # 프롬프트 템플릿 작성
-        prompt_template = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("human", human_prompt_template)
-        ])
-        
-        # 체인 생성
-        chain = prompt_template | llm | JsonOutputParser()
-        
         # 실행
         input_vars = {
             "rule_id": vulnerability.rule_id,
@@ -130,7 +100,7 @@ def verify_and_generate_patch(
             input_vars["aux_call_stack"] = "\n".join(aux_result.get("call_stack", []))
             input_vars["aux_data_flow"] = "\n".join(aux_result.get("data_flow", []))
             
-        result = chain.invoke(input_vars)
+        result = _invoke(prompts, input_vars)
         
         logger.info(f"검증 완료: {result.get('is_valid')}, 신뢰도: {result.get('confidence')}")
         return result
@@ -146,6 +116,243 @@ def verify_and_generate_patch(
         }
 
 
+def verify_file_and_generate_patches(
+    vulnerabilities: List[VulnerabilityResult],
+    project_dir: Path,
+    language: str,
+    llm_url: str = "http://localhost:11434",
+    api_key: str = "not-needed"
+) -> List[Dict[str, Any]]:
+    """
+    같은 파일의 취약점 여러 개를 LLM 요청 한 번으로 검증 및 패치 생성
+    소스 코드 context를 파일당 한 번만 보내므로 취약점마다 요청할 때보다 프롬프트 토큰이 줄어듭니다.
+    
+    Args:
+        vulnerabilities: 취약점 목록 (모두 같은 파일)
+        project_dir: 프로젝트 디렉토리
+        language: 언어
+        llm_url: LLM API URL
+        api_key: API 키
+        
+    Returns:
+        vulnerabilities와 같은 순서의 검증 결과 및 패치 (JSON) 리스트
+    """
+    if len(vulnerabilities) == 1:
+        return [verify_and_generate_patch(vulnerabilities[0], project_dir, language, llm_url, api_key)]
+    
+    # 도달 불가로 확인된 취약점은 LLM에 보내지 않고 나머지만 검증
+    verdicts = [_unreachable_verdict(_get_aux_result(v, project_dir, language)) for v in vulnerabilities]
+    if any(verdict is not None for verdict in verdicts):
+        pending = [v for v, verdict in zip(vulnerabilities, verdicts) if verdict is None]
+        logger.info(f"도달 불가로 LLM 검증 생략: {vulnerabilities[0].file_path} ({len(vulnerabilities) - len(pending)}개)")
+        pending_results = iter(
+            verify_file_and_generate_patches(pending, project_dir, language, llm_url, api_key) if pending else ()
+        )
+        return [verdict if verdict is not None else next(pending_results) for verdict in verdicts]
+    
+    file_path = vulnerabilities[0].file_path
+    try:
+        source_code = read_source_file(file_path, project_dir, lines=[v.line for v in vulnerabilities])
+        if not source_code:
+            logger.warning(f"소스 코드를 읽을 수 없음: {file_path}")
+            return [{"is_valid": False, "explanation": "Source code not found"} for _ in vulnerabilities]
+        
+        prompts = _load_prompt(config.BATCH_PROMPT_FILE)
+        if prompts is None:
+            return [{"is_valid": False, "explanation": "Prompt load failed"} for _ in vulnerabilities]
+        
+        findings = []
+        for idx, vuln in enumerate(vulnerabilities):
+            finding = f"[{idx}] Line {vuln.line} | Rule: {vuln.rule_id} | Severity: {vuln.severity}\n    Message: {vuln.message}"
+            aux_result = _get_aux_result(vuln, project_dir, language)
+            if config.ENABLE_AUX and aux_result:
+                finding += (
+                    f"\n    Reachable: {'Yes' if aux_result.get('reachable') else 'No'}"
+                    f"\n    Call stack: {' -> '.join(aux_result.get('call_stack', []))}"
+                    f"\n    Data flow: {' -> '.join(aux_result.get('data_flow', []))}"
+                )
+            findings.append(finding)
+        
+        logger.info(f"LLM 일괄 검증 시작: {file_path} ({len(vulnerabilities)}개)")
+        response = _invoke(prompts, {
+            "file_path": str(file_path),
+            "findings": "\n".join(findings),
+            "source_code": source_code,
+        })
+        
+        # idx로 결과를 매칭하고, 응답에서 빠진 항목은 검증 실패로 처리
+        items = response.get("results", []) if isinstance(response, dict) else response
+        by_idx = {}
+        for item in items or []:
+            if isinstance(item, dict) and isinstance(item.get("idx"), int):
+                by_idx[item["idx"]] = item
+        results = [
+            by_idx.get(idx, {"is_valid": False, "confidence": 0.0, "explanation": "No verdict in batch response", "patch_code": None})
+            for idx in range(len(vulnerabilities))
+        ]
+        logger.info(f"일괄 검증 완료: {file_path} ({sum(bool(r.get('is_valid')) for r in results)}개 유효)")
+        return results
+        
+    except Exception as e:
+        logger.exception(f"LLM 일괄 검증 중 오류 발생: {e}")
+        return [
+            {
+                "is_valid": False,
+                "confidence": 0.0,
+                "explanation": f"Error during verification: {str(e)}",
+                "patch_code": None
+            }
+            for _ in vulnerabilities
+        ]
+
+
+def _get_aux_result(
+    vulnerability: VulnerabilityResult,
+    project_dir: Path,
+    language: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Aux 분석 결과 (이미 수행된 경우 재사용)
+    Aux 비활성화 시나 분석 대상 CWE가 아닌 경우 None (분석하지 않은 것을 도달 불가로 전달하지 않음)
+    """
+    aux_result = vulnerability.aux_result
+    if not aux_result and config.ENABLE_AUX and is_aux_relevant([vulnerability])[0]:
+        aux_analyser = get_aux_analyser(project_dir, language)
+        aux_analysis_obj = aux_analyser.analyze_reachability(vulnerability.file_path, vulnerability.line)
+        aux_result = {
+            "reachable": aux_analysis_obj.reachable,
+            "call_stack": aux_analysis_obj.call_stack,
+            "data_flow": aux_analysis_obj.data_flow,
+            "confirmed": aux_analysis_obj.confirmed,
+        }
+        vulnerability.aux_result = aux_result
+    return aux_result
+
+
+def _unreachable_verdict(aux_result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    호출 그래프에서 진입점으로부터 도달할 수 없다고 확인된 경우 LLM 없이 내릴 판정
+    (휴리스틱/오류 결과로는 판정하지 않으므로 None)
+    """
+    if not aux_result or not aux_result.get("confirmed") or aux_result.get("reachable"):
+        return None
+    return {
+        "is_valid": False,
+        "confidence": 0.9,
+        "explanation": "Unreachable from program entry points (call graph analysis)",
+        "patch_code": None,
+    }
+
+
+def _load_prompt(prompt_file: Path) -> Optional[Tuple[str, str]]:
+    """
+    프롬프트 파일을 읽어 (system, human) 프롬프트로 분리
+    파일이 수정되지 않았다면 이전에 읽은 내용을 재사용합니다.
+    
+    Returns:
+        (system 프롬프트, human 프롬프트 템플릿), 읽기 실패 시 None
+    """
+    try:
+        return _read_prompt(str(prompt_file), prompt_file.stat().st_mtime_ns)
+    except Exception as e:
+        logger.error(f"프롬프트 파일 로드 실패: {e}")
+        return None
+
+
+@lru_cache(maxsize=8)
+def _read_prompt(prompt_file: str, mtime_ns: int) -> Tuple[str, str]:
+    """프롬프트 파일 내용 분리 (mtime_ns는 파일이 바뀌면 캐시를 무효화하기 위한 키)"""
+    prompt_content = Path(prompt_file).read_text(encoding="utf-8")
+    # Split system and human prompts (assuming separated by ---)
+    parts = prompt_content.split("---")
+    if len(parts) >= 2:
+        return parts[0].strip(), parts[1].strip()
+    # Fallback if format is wrong
+    return "You are a security expert.", prompt_content
+
+
+def _invoke(prompts: Tuple[str, str], input_vars: Dict[str, Any]) -> Any:
+    """
+    프롬프트와 입력으로 LLM을 호출하고 JSON 응답을 반환합니다.
+    증분 분석이 켜져 있으면 (프롬프트, 입력, 모델)이 같은 이전 응답을 재사용합니다.
+    """
+    if not config.INCREMENTAL:
+        return _get_chain(prompts).invoke(input_vars)
+    
+    h = hashlib.blake2b(digest_size=16)
+    for part in (str(PROMPT_VERSION), config.OLLAMA_MODEL, *prompts, json.dumps(input_vars, sort_keys=True, default=str)):
+        h.update(part.encode())
+        h.update(b"\0")
+    key = h.hexdigest()
+    
+    cache = get_result_cache(config.CACHE_DIR)
+    cached = cache.get_value("llm", key)
+    if cached is not None:
+        logger.info("캐시된 LLM 검증 결과 사용")
+        return cached
+    result = _get_chain(prompts).invoke(input_vars)
+    cache.put_value("llm", key, result)
+    return result
+
+
+def _get_chain(prompts: Tuple[str, str]):
+    """현재 설정(LLM URL, 모델)과 프롬프트에 대한 체인 (같은 조합이면 재사용)"""
+    return _build_chain(config.LLM_URL, config.OLLAMA_MODEL, *prompts)
+
+
+@lru_cache(maxsize=8)
+def _build_chain(llm_url: str, model_name: str, system_prompt: str, human_prompt_template: str):
+    """
+    프롬프트 → LLM → JSON 파서 체인 생성
+    체인(템플릿 파싱 결과 포함)은 상태 없이 여러 스레드에서 호출할 수 있으므로 캐시하여 재사용합니다.
+    """
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+    
+    llm = _get_llm(llm_url, model_name)
+    
+    # 프롬프트 템플릿 작성
+    prompt_template = ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("human", human_prompt_template)
+    ])
+    
+    # 체인 생성
+    return prompt_template | llm | JsonOutputParser()
+
+
+@lru_cache(maxsize=4)
+def _get_llm(llm_url: str, model_name: str):
+    """
+    (LLM URL, 모델)당 하나의 ChatOpenAI 클라이언트
+    프롬프트가 다른 체인들도 같은 HTTP 연결 풀(keep-alive)을 공유하므로 요청마다 연결을 새로 맺지 않습니다.
+    """
+    # langchain_openai는 import 비용이 커서(openai SDK 포함) LLM을 실제로 호출할 때만 로드
+    from langchain_openai import ChatOpenAI
+    from openai import DefaultHttpxClient
+    import httpx
+    
+    # 로컬 LLM (Ollama 등 OpenAI compatible API)
+    # Ollama는 /v1을 base_url에 포함해야 함
+    base_url = llm_url
+    if not base_url.endswith("/v1"):
+        base_url = f"{base_url}/v1"
+    
+    logger.info(f"로컬 LLM 사용: {base_url}, 모델: {model_name}")
+    # 동시 요청 수(LLM_MAX_CONCURRENCY)만큼 연결을 유지하여 재사용
+    concurrency = max(1, config.LLM_MAX_CONCURRENCY)
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency)
+    )
+    return ChatOpenAI(
+        base_url=base_url,
+        api_key="not-needed",  # 로컬 LLM은 API 키 불필요
+        model=model_name,
+        temperature=0.3,
+        http_client=http_client,
+    )
+
+
 def _generate_rule_based_patch(
     vulnerability: VulnerabilityResult,
     source_code: str
@@ -170,30 +377,109 @@ def _generate_rule_based_patch(
     )
 
 
-def _get_code_context(source_code: str, line_num: int, context_lines: int = 5) -> str:
+def _get_code_context(
+    source_lines: Iterable[str],
+    line_num: int,
+    context_lines: int = CONTEXT_LINES,
+    first_index: int = 0
+) -> str:
     """
     특정 라인 주변의 코드 context 추출
+    대상 범위까지만 읽으므로 파일 객체를 넘기면 파일 전체를 읽지 않습니다.
     
     Args:
-        source_code: 전체 소스 코드
+        source_lines: 소스 라인 iterable (파일 객체 등, 라인 끝 개행 포함 가능)
         line_num: 대상 라인 번호 (1-indexed)
         context_lines: context로 포함할 앞뒤 라인 수
+        first_index: source_lines의 첫 라인 인덱스 (0-indexed, 앞부분을 건너뛰고 읽은 경우)
     
     Returns:
         context 코드
     """
-    lines = source_code.split("\n")
     start = max(0, line_num - context_lines - 1)
-    end = min(len(lines), line_num + context_lines)
+    end = line_num + context_lines
     
     context_lines_list = []
-    for i in range(start, end):
-        prefix = ">>> " if i == line_num - 1 else "    "
-        context_lines_list.append(f"{prefix}{i+1:4d} | {lines[i]}")
+    count = first_index
+    # 건너뛴 라인은 모두 개행으로 끝남
+    last = "\n" if first_index else ""
+    for i, text in enumerate(source_lines, first_index):
+        if i >= end:
+            break
+        count, last = i + 1, text
+        if i >= start:
+            prefix = ">>> " if i == line_num - 1 else "    "
+            code = text[:-1] if text.endswith("\n") else text
+            context_lines_list.append(f"{prefix}{i+1:4d} | {code}")
+    else:
+        # 파일 끝까지 읽은 경우: 개행으로 끝나는(또는 빈) 파일은 마지막 빈 줄을 포함 (str.split("\n")과 동일)
+        if (count == 0 or last.endswith("\n")) and start <= count < end:
+            prefix = ">>> " if count == line_num - 1 else "    "
+            context_lines_list.append(f"{prefix}{count+1:4d} | ")
     
     return "\n".join(context_lines_list)
 
 
+def _get_code_contexts(
+    source_lines: Iterable[str],
+    line_nums: List[int],
+    context_lines: int = CONTEXT_LINES,
+    first_index: int = 0
+) -> str:
+    """
+    여러 라인 주변의 코드 context를 한 번에 추출 (겹치는 범위는 합쳐서 한 번만 포함)
+    
+    Args:
+        source_lines: 소스 라인 iterable (파일 객체 등, 라인 끝 개행 포함 가능)
+        line_nums: 대상 라인 번호 목록 (1-indexed)
+        context_lines: context로 포함할 앞뒤 라인 수
+        first_index: source_lines의 첫 라인 인덱스 (0-indexed, 앞부분을 건너뛰고 읽은 경우)
+    
+    Returns:
+        context 코드 (떨어진 범위 사이는 "...."로 구분)
+    """
+    targets = set(line_nums)
+    # 0-indexed [start, end) 범위를 정렬 후 병합
+    ranges = []
+    for start, end in sorted((max(0, n - context_lines - 1), n + context_lines) for n in targets):
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    if not ranges:
+        return ""
+    
+    context_lines_list = []
+    range_idx = 0
+    for i, text in enumerate(source_lines, first_index):
+        while range_idx < len(ranges) and i >= ranges[range_idx][1]:
+            range_idx += 1
+        if range_idx == len(ranges):
+            break
+        if i < ranges[range_idx][0]:
+            continue
+        if i == ranges[range_idx][0] and context_lines_list:
+            context_lines_list.append("    ....")
+        prefix = ">>> " if i + 1 in targets else "    "
+        code = text[:-1] if text.endswith("\n") else text
+        context_lines_list.append(f"{prefix}{i+1:4d} | {code}")
+    
+    return "\n".join(context_lines_list)
+
+
+# 규칙 기반 패치 테이블: (rule_id 키워드, 소문자 rule_id 키워드, 패치)
+# 패치는 고정 안내 문구이거나, 라인에서 찾을 함수별 (함수, 대체 함수, 덧붙일 주석) 목록
+_BUFFER_REPLACEMENTS = (
+    ("strcpy", "strncpy", "  // TODO: Add size parameter for strncpy"),
+    ("gets", "fgets", "  // TODO: Add size and stream parameters for fgets"),
+)
+_RULE_PATCHES = (
+    (("CWE-119",), ("buffer",), _BUFFER_REPLACEMENTS),  # Buffer Overflow
+    (("CWE-89", "SQL"), (), "// Use PreparedStatement instead of string concatenation"),  # SQL Injection
+    (("NP_ALWAYS_NULL",), ("null",), "// Add null check before dereferencing"),
+)
+
+
 def generate_simple_patch(
     vulnerability: VulnerabilityResult,
     source_code: str
@@ -208,35 +494,69 @@ def generate_simple_patch(
     Returns:
         패치 코드
     """
-    lines = source_code.split("\n")
-    target_line = vulnerability.line - 1
-    
-    if target_line < 0 or target_line >= len(lines):
+    original_line = _nth_line(source_code, vulnerability.line)
+    if original_line is None:
         return "// Unable to generate patch: invalid line number"
     
-    original_line = lines[target_line]
-    
-    # 규칙 기반 패치 예시
-    if "CWE-119" in vulnerability.rule_id or "buffer" in vulnerability.rule_id.lower():  # Buffer Overflow
-        if "strcpy" in original_line:
-            patched_line = original_line.replace("strcpy", "strncpy")
-            patched_line += f"  // TODO: Add size parameter for strncpy"
-            return patched_line
-        elif "gets" in original_line:
-            patched_line = original_line.replace("gets", "fgets")
-            patched_line += f"  // TODO: Add size and stream parameters for fgets"
-            return patched_line
-    
-    elif "CWE-89" in vulnerability.rule_id or "SQL" in vulnerability.rule_id:  # SQL Injection
-        return "// Use PreparedStatement instead of string concatenation"
+    # 규칙 기반 패치 예시 - 처음 일치하는 규칙만 적용
+    rule_id = vulnerability.rule_id
+    rule_id_lower = rule_id.lower()
+    for keywords, lower_keywords, patch in _RULE_PATCHES:
+        if not (any(k in rule_id for k in keywords) or any(k in rule_id_lower for k in lower_keywords)):
+            continue
+        if isinstance(patch, str):
+            return patch
+        for func, replacement, note in patch:
+            if func in original_line:
+                return original_line.replace(func, replacement) + note
+        break
     
-    elif "NP_ALWAYS_NULL" in vulnerability.rule_id or "null" in vulnerability.rule_id.lower():
-        return "// Add null check before dereferencing"
-    
-    return f"// TODO: Manual review required for {vulnerability.rule_id}"
+    return f"// TODO: Manual review required for {rule_id}"
+
+
+def _skip_lines(mm: mmap.mmap, count: int) -> int:
+    """
+    mmap에서 앞의 count개 라인을 건너뛴 바이트 위치를 반환합니다 (라인이 count개보다 적으면 -1).
+    청크 단위로 개행 수만 세므로 건너뛴 부분은 디코딩하지 않습니다.
+    """
+    pos = 0
+    skipped = 0
+    size = len(mm)
+    while skipped < count and pos < size:
+        chunk = mm[pos:pos + _SKIP_CHUNK]
+        newlines = chunk.count(b"\n")
+        if skipped + newlines >= count:
+            break
+        skipped += newlines
+        pos += len(chunk)
+    while skipped < count:
+        nl = mm.find(b"\n", pos)
+        if nl < 0:
+            return -1
+        pos = nl + 1
+        skipped += 1
+    return pos
+
 
+def _iter_lines(mm: mmap.mmap, pos: int) -> Iterator[str]:
+    """mmap의 pos 위치부터 라인을 반환합니다 (텍스트 모드 파일처럼 \r\n은 \n으로)."""
+    size = len(mm)
+    while pos < size:
+        nl = mm.find(b"\n", pos)
+        stop = size if nl < 0 else nl + 1
+        text = mm[pos:stop].decode("utf-8", errors="replace")
+        if text.endswith("\r\n"):
+            text = text[:-2] + "\n"
+        yield text
+        pos = stop
 
-def read_source_file(file_path: Path, project_dir: Path = None, line: int = 0) -> Optional[str]:
+
+def read_source_file(
+    file_path: Path,
+    project_dir: Path = None,
+    line: int = 0,
+    lines: Optional[List[int]] = None
+) -> Optional[str]:
     """
     소스 파일 읽기
     
@@ -244,6 +564,7 @@ def read_source_file(file_path: Path, project_dir: Path = None, line: int = 0) -
         file_path: 파일 경로
         project_dir: 프로젝트 디렉토리 (옵션)
         line: 라인 번호 (옵션, 컨텍스트 추출용)
+        lines: 라인 번호 목록 (옵션, 여러 라인의 컨텍스트를 한 번에 추출)
     
     Returns:
         파일 내용 또는 컨텍스트
@@ -262,13 +583,50 @@ def read_source_file(file_path: Path, project_dir: Path = None, line: int = 0) -
             logger.error(f"파일을 찾을 수 없음: {abs_path}")
             return None
             
+        if abs_path.stat().st_size >= MMAP_THRESHOLD:
+            with open(abs_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not (lines or line > 0):
+                    # 파일 전체: 매핑한 메모리에서 바로 디코딩하여 bytes 복사본을 만들지 않음
+                    # (텍스트 모드 읽기와 같도록 \r\n, \r은 \n으로)
+                    with memoryview(mm) as view:
+                        text = str(view, "utf-8")
+                    return text.replace("\r\n", "\n").replace("\r", "\n")
+                # 큰 파일은 context 시작 라인까지 디코딩하지 않고 건너뜀
+                first_index = max(0, min(lines or [line]) - CONTEXT_LINES - 1)
+                pos = _skip_lines(mm, first_index)
+                if pos < 0:
+                    # context 범위가 파일 끝 이후
+                    return ""
+                source_lines = _iter_lines(mm, pos)
+                if lines:
+                    return _get_code_contexts(source_lines, lines, first_index=first_index)
+                return _get_code_context(source_lines, line, first_index=first_index)
+        
         with open(abs_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            
-        if line > 0:
-            return _get_code_context(content, line)
-        return content
+            if lines:
+                return _get_code_contexts(f, lines)
+            if line > 0:
+                # 대상 라인 주변만 필요하므로 해당 범위까지만 읽음
+                return _get_code_context(f, line)
+            return f.read()
             
     except Exception as e:
         logger.error(f"파일 읽기 실패 {file_path}: {e}")
         return None
+
+
+def _nth_line(source_code: str, line_num: int) -> Optional[str]:
+    """
+    line_num번째 라인 (1-indexed, 라인 끝의 \r 제외, 없으면 None)
+    대상 라인까지만 개행을 찾으므로 파일 전체를 라인 리스트로 나누지 않습니다.
+    """
+    if line_num < 1:
+        return None
+    start = 0
+    for _ in range(line_num - 1):
+        start = source_code.find("\n", start) + 1
+        if start == 0:
+            return None
+    end = source_code.find("\n", start)
+    line = source_code[start:] if end < 0 else source_code[start:end]
+    return line[:-1] if line.endswith("\r") else line
@@ -0,0 +1,120 @@
+"""
+SARIF 입력 파싱 모듈 - 도구가 생성한 SARIF에서 (tool, result) 쌍을 순서대로 추출
+
+큰 SARIF 파일은 ijson(선택 의존성)이 설치되어 있으면 스트리밍으로 파싱하여
+전체 문서를 메모리에 올리지 않습니다. 그 외에는 한 번에 파싱합니다 (orjson이 있으면 사용).
+"""
+import io
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Tuple
+
+from sarif_cli.core import fastjson
+
+try:
+    import ijson
+except ImportError:  # 선택 의존성
+    ijson = None
+
+
+# 이 크기 이상의 파일만 스트리밍 파싱 (작은 파일은 json이 더 빠름)
+STREAM_THRESHOLD = 1 << 20  # 1MB
+
+# 호출부에서 파싱 오류를 잡을 때 사용할 예외 튜플
+SARIF_DECODE_ERRORS: Tuple[type, ...] = (json.JSONDecodeError,)
+if ijson is not None:
+    SARIF_DECODE_ERRORS += (ijson.JSONError,)
+
+_RUN_PREFIX = "runs.item"
+_TOOL_PREFIX = "runs.item.tool"
+_RESULT_PREFIX = "runs.item.results.item"
+
+
+def iter_sarif_data(sarif_data: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    이미 로드된 SARIF 문서에서 (run.tool, result) 쌍을 반환합니다.
+    같은 run의 결과는 동일한 tool 객체를 공유합니다.
+    """
+    for run in sarif_data.get("runs", []):
+        tool = run.get("tool", {})
+        for result in run.get("results", []):
+            yield tool, result
+
+
+def rule_short_descriptions(tool: Dict[str, Any]) -> Dict[str, str]:
+    """
+    run.tool의 규칙 목록에서 {규칙 ID: shortDescription.text} 맵을 만듭니다.
+    결과 변환에는 규칙 이름만 필요하므로 규칙 객체 전체 대신 문자열만 보관합니다.
+    """
+    return {
+        rule["id"]: text
+        for rule in tool.get("driver", {}).get("rules", [])
+        if (text := rule.get("shortDescription", {}).get("text")) is not None
+    }
+
+
+def _iter_streaming(fp: BinaryIO) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    ijson 이벤트 스트림에서 tool 객체와 result 객체만 조립합니다.
+    SARIF 생성기는 run마다 tool을 results보다 먼저 기록하므로
+    result를 만날 때는 해당 run의 tool이 이미 조립되어 있습니다.
+    """
+    tool: Dict[str, Any] = {}
+    builder = None
+    builder_prefix = None
+
+    for prefix, event, value in ijson.parse(fp, use_float=True):
+        if builder is None:
+            if event != "start_map":
+                continue
+            if prefix == _RUN_PREFIX:
+                tool = {}
+            elif prefix in (_TOOL_PREFIX, _RESULT_PREFIX):
+                builder = ijson.ObjectBuilder()
+                builder_prefix = prefix
+                builder.event(event, value)
+            continue
+
+        builder.event(event, value)
+        if event == "end_map" and prefix == builder_prefix:
+            if builder_prefix == _TOOL_PREFIX:
+                tool = builder.value
+            else:
+                yield tool, builder.value
+            builder = None
+
+
+def iter_sarif_results(report_path: Path) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    SARIF 파일에서 (run.tool, result) 쌍을 순서대로 반환합니다.
+
+    Args:
+        report_path: SARIF 파일 경로
+
+    Yields:
+        (tool 객체, result 객체)
+
+    Raises:
+        SARIF_DECODE_ERRORS: JSON 형식이 올바르지 않은 경우
+    """
+    if ijson is not None and report_path.stat().st_size >= STREAM_THRESHOLD:
+        with open(report_path, "rb") as f:
+            yield from _iter_streaming(f)
+        return
+
+    yield from iter_sarif_data(fastjson.load_file(report_path))
+
+
+def iter_sarif_bytes(data: bytes) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    도구 표준 출력 등 메모리에 있는 SARIF 문서에서 (run.tool, result) 쌍을 순서대로 반환합니다.
+    큰 문서는 iter_sarif_results와 같이 스트리밍으로 파싱하여 문서 전체를 dict로 만들지 않습니다.
+
+    Raises:
+        SARIF_DECODE_ERRORS: JSON 형식이 올바르지 않은 경우
+    """
+    if ijson is not None and len(data) >= STREAM_THRESHOLD:
+        yield from _iter_streaming(io.BytesIO(data))
+        return
+
+    yield from iter_sarif_data(fastjson.loads(data))
@@ -1,23 +1,39 @@
 """
 SARIF 출력 모듈 - 분석 결과를 SARIF 2.1.0 형식으로 저장
 """
-import json
 from pathlib import Path
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from datetime import datetime, timezone
 from loguru import logger
 
-from sarif_cli.analyzer import VulnerabilityResult
+from sarif_cli.core import fastjson
+from sarif_cli.models.vulnerability import VulnerabilityResult
+
+SARIF_SCHEMA = "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json"
+
+
+def _utc_now() -> str:
+    """현재 UTC 시각 (SARIF endTimeUtc 형식, 예: 2024-01-01T00:00:00.000000Z)"""
+    # datetime.utcnow()는 Python 3.12부터 deprecated - timezone-aware 시각을 같은 형식으로 출력
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _make_locations(artifact: Dict[str, str], line: int, column: int) -> List[Dict[str, Any]]:
+    """결과의 locations 배열 (physicalLocation 하나)"""
+    return [{"physicalLocation": {"artifactLocation": artifact, "region": {"startLine": line, "startColumn": column}}}]
 
 
 def create_sarif_run(
     tool_name: str,
     tool_metadata: Dict[str, Any],
     vulnerabilities: List[VulnerabilityResult],
-    vuln_to_patch: Dict[Any, Any] = None
+    vuln_to_patch: Dict[Any, Any] = None,
+    end_time: Optional[str] = None
 ) -> dict:
     """
     단일 도구에 대한 SARIF run 객체 생성
+    end_time(endTimeUtc)을 주면 그대로 사용하여 여러 run이 같은 시각을 공유합니다.
     """
     results = []
     vuln_to_patch = vuln_to_patch or {}
@@ -35,30 +51,20 @@ def create_sarif_run(
     tool = tool_metadata if tool_metadata else {"driver": driver}
     
     for vuln in vulnerabilities:
+        # 위치와 패치가 같은 artifactLocation 객체를 공유 (출력 JSON은 동일)
+        artifact = {"uri": str(vuln.file_path)}
         result = {
             "ruleId": vuln.rule_id,
             "level": vuln.severity,
             "message": {
                 "text": vuln.message
             },
-            "locations": [
-                {
-                    "physicalLocation": {
-                        "artifactLocation": {
-                            "uri": str(vuln.file_path)
-                        },
-                        "region": {
-                            "startLine": vuln.line,
-                            "startColumn": vuln.column
-                        }
-                    }
-                }
-            ]
+            "locations": _make_locations(artifact, vuln.line, vuln.column)
         }
         
         # 패치 정보 추가
-        if vuln in vuln_to_patch:
-            patch_info = vuln_to_patch[vuln]
+        patch_info = vuln_to_patch.get(vuln)
+        if patch_info is not None:
             if patch_info.patch_code:
                 result["fixes"] = [
                     {
@@ -67,9 +73,7 @@ def create_sarif_run(
                         },
                         "artifactChanges": [
                             {
-                                "artifactLocation": {
-                                    "uri": str(vuln.file_path)
-                                },
+                                "artifactLocation": artifact,
                                 "replacements": [
                                     {
                                         "deletedRegion": {
@@ -91,6 +95,11 @@ def create_sarif_run(
             result["properties"] = result.get("properties", {})
             result["properties"]["aux_analysis"] = vuln.aux_result
 
+        # 중복 제거로 합쳐진 다른 도구 정보 추가
+        if vuln.also_reported_by:
+            result["properties"] = result.get("properties", {})
+            result["properties"]["also_reported_by"] = vuln.also_reported_by
+
         results.append(result)
     
     run = {
@@ -99,7 +108,7 @@ def create_sarif_run(
         "invocations": [
             {
                 "executionSuccessful": True,
-                "endTimeUtc": datetime.utcnow().isoformat() + "Z"
+                "endTimeUtc": end_time or _utc_now()
             }
         ]
     }
@@ -109,23 +118,26 @@ def create_sarif_run(
 
 def write_sarif_results(
     vulnerabilities: List[VulnerabilityResult],
-    output_dir: Path
+    output_dir: Path,
+    pretty: bool = False
 ) -> List[Path]:
     """
     취약점 결과를 SARIF 파일로 저장
     """
-    return write_sarif_results_with_patches(vulnerabilities, output_dir, {})
+    return write_sarif_results_with_patches(vulnerabilities, output_dir, {}, pretty)
 
 
 def write_sarif_results_with_patches(
     vulnerabilities: List[VulnerabilityResult],
     output_dir: Path,
-    patches_map: Dict[int, Any]
+    patches_map: Dict[int, Any],
+    pretty: bool = False
 ) -> List[Path]:
     """
     취약점 결과와 패치를 SARIF 파일로 저장
     - 도구별 개별 SARIF 파일 생성 ({tool}.sarif)
     - 통합 SARIF 파일 생성 (output.sarif)
+    - 기본은 공백 없는 JSON (기계가 읽는 출력), pretty=True면 2칸 들여쓰기
     """
     sarif_files = []
     
@@ -136,26 +148,25 @@ def write_sarif_results_with_patches(
             vuln_to_patch[vulnerabilities[idx]] = patch
             
     # 2. 도구별 그룹화
-    tool_groups = {}
+    tool_groups = defaultdict(list)
     for vuln in vulnerabilities:
-        tool = vuln.tool_name
-        if tool not in tool_groups:
-            tool_groups[tool] = []
-        tool_groups[tool].append(vuln)
+        tool_groups[vuln.tool_name].append(vuln)
         
     runs = []
+    # 모든 run의 종료 시각은 한 번만 계산
+    end_time = _utc_now()
     
     # 3. 각 도구별 SARIF 생성 및 runs 추가
     for tool_name, vulns in tool_groups.items():
         # 메타데이터는 첫 번째 취약점에서 가져옴
         tool_metadata = vulns[0].tool_metadata
         
-        run = create_sarif_run(tool_name, tool_metadata, vulns, vuln_to_patch)
+        run = create_sarif_run(tool_name, tool_metadata, vulns, vuln_to_patch, end_time)
         runs.append(run)
         
         # 개별 파일 저장 ({tool-name}.sarif)
         tool_sarif = {
-            "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
+            "$schema": SARIF_SCHEMA,
             "version": "2.1.0",
             "runs": [run]
         }
@@ -164,23 +175,20 @@ def write_sarif_results_with_patches(
         tool_filename = f"{safe_tool_name}.sarif"
         tool_path = output_dir / tool_filename
         
-        with open(tool_path, "w", encoding="utf-8") as f:
-            json.dump(tool_sarif, f, indent=2, ensure_ascii=False)
+        fastjson.dump_file(tool_path, tool_sarif, indent=pretty)
             
         logger.info(f"개별 도구 SARIF 생성: {tool_path}")
         sarif_files.append(tool_path)
         
     # 4. 통합 파일 저장 (output.sarif)
     merged_sarif = {
-        "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
+        "$schema": SARIF_SCHEMA,
         "version": "2.1.0",
         "runs": runs
     }
     
     merged_path = output_dir / "output.sarif"
-    with open(merged_path, "w", encoding="utf-8") as f:
-        json.dump(merged_sarif, f, indent=2, ensure_ascii=False)
-    
+    fastjson.dump_file(merged_path, merged_sarif, indent=pretty)
     logger.info(f"통합 SARIF 생성: {merged_path}")
     sarif_files.append(merged_path)
     
@@ -1,26 +1,27 @@
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
+
+# slots=True: 결과가 수만 개일 때 인스턴스별 __dict__ 메모리를 줄임
+# eq=False: writer가 결과 객체를 dict 키(vuln_to_patch)로 쓰므로 identity 기반 hash 유지
+@dataclass(slots=True, eq=False)
 class VulnerabilityResult:
     """취약점 분석 결과"""
-    def __init__(
-        self,
-        file_path: Path,
-        line: int,
-        column: int,
-        rule_id: str,
-        message: str,
-        severity: str = "warning",
-        tool_name: str = "SARIF-CLI",
-        tool_metadata: Dict[str, Any] = None,
-        aux_result: Dict[str, Any] = None,
-    ):
-        self.file_path = file_path
-        self.line = line
-        self.column = column
-        self.rule_id = rule_id
-        self.message = message
-        self.severity = severity
-        self.tool_name = tool_name
-        self.tool_metadata = tool_metadata or {}
-        self.aux_result = aux_result
+    file_path: Path
+    line: int
+    column: int
+    rule_id: str
+    message: str
+    severity: str = "warning"
+    tool_name: str = "SARIF-CLI"
+    tool_metadata: Dict[str, Any] = field(default_factory=dict)
+    aux_result: Optional[Dict[str, Any]] = None
+    # 결과 파일 확장자로 추론한 언어 (Aux/LLM 단계에서 사용, cli에서 한 번 설정)
+    language: str = "unknown"
+    # 같은 (파일, 라인, 규칙)을 함께 보고한 다른 도구 이름
+    also_reported_by: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.tool_metadata is None:
+            self.tool_metadata = {}
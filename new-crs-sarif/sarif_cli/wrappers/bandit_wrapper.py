@@ -1,13 +1,28 @@
 """
 Bandit 래퍼 - Python 보안 취약점 분석
 """
+import os
 import subprocess
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
 from loguru import logger
 import shutil
 
+from sarif_cli.core import fastjson
+from sarif_cli.core.cmd import get_tool_version
+from sarif_cli.core.detector import FileIndex, get_file_index
+
+# 한 번의 Bandit 실행에 넘길 최대 파일 수 (파일 목록은 명령행 인자이므로 ARG_MAX를 넘지 않도록)
+MAX_FILES_PER_RUN = 500
+
+# Bandit severity -> 표준 severity
+_SEVERITY_MAP = {
+    "HIGH": "error",
+    "MEDIUM": "warning",
+    "LOW": "note",
+}
+
 
 def ensure_bandit_installed() -> bool:
     """Bandit이 설치되어 있는지 확인"""
@@ -22,89 +37,138 @@ class BanditAnalyzer:
     
     def __init__(self):
         self.bandit_cmd = shutil.which("bandit")
+        # 마지막 analyze가 출력을 끝까지 파싱했는지 (실패한 실행의 빈 결과를 캐시하지 않도록)
+        self.completed = False
     
-    def analyze(self, project_dir: Path) -> List[Dict[str, Any]]:
+    def version(self) -> Optional[str]:
+        """설치된 Bandit 버전 (캐시 무효화 키로 사용)"""
+        return get_tool_version(self.bandit_cmd) if self.bandit_cmd else None
+
+    def analyze(
+        self,
+        project_dir: Path,
+        file_index: Optional[FileIndex] = None,
+        targets: Optional[List[Path]] = None,
+    ) -> Iterator[Dict[str, Any]]:
         """
         Bandit을 사용하여 Python 코드 분석
         
         Args:
             project_dir: 프로젝트 디렉토리
+            file_index: 미리 생성된 파일 인덱스 (없으면 새로 조회)
+            targets: 분석할 파일 목록 (지정 시 project_dir 전체 대신 해당 파일만 분석)
         
-        Returns:
-            취약점 정보 리스트
+        Yields:
+            취약점 정보
         """
+        self.completed = False
         if not ensure_bandit_installed():
-            return []
+            return
         
         logger.info(f"Bandit 분석 시작: {project_dir}")
         
         # Python 파일 찾기
-        python_files = list(project_dir.rglob("*.py"))
-        if not python_files:
-            logger.warning("분석할 Python 파일이 없습니다.")
-            return []
-        
+        # 디렉토리를 넘기면 Bandit이 자체 기준으로 탐색하므로, 빌드 산출물/의존성 제외 기준이
+        # 파일 인덱스와 같도록 항상 인덱스의 파일 목록을 넘김
+        if targets is None:
+            if file_index is None:
+                file_index = get_file_index(project_dir)
+            targets = file_index.get(".py")
+            if not targets:
+                logger.warning("분석할 Python 파일이 없습니다.")
+                return
+        elif not targets:
+            return
+
+        # 프로젝트 경로 자체가 결과 경로에 섞이지 않도록 project_dir에서 상대 경로로 실행
+        # (인덱스 경로는 resolve된 절대 경로, 증분 분석 대상은 project_dir 기준 경로)
+        source_root = project_dir.resolve()
+        scan_paths = []
+        for target in targets:
+            try:
+                scan_paths.append(str(target.relative_to(source_root)))
+            except ValueError:
+                scan_paths.append(os.path.relpath(target, project_dir))
+
+        # 결과 변환 (project_dir 기준 상대 경로로 보고되므로 project_dir 경로로 되돌림)
+        base = str(project_dir)
+        count = 0
+        for start in range(0, len(scan_paths), MAX_FILES_PER_RUN):
+            data = self._run(project_dir, scan_paths[start:start + MAX_FILES_PER_RUN])
+            if data is None:
+                return
+            for issue in data.get("results", []):
+                count += 1
+                filename = issue.get("filename")
+                yield {
+                    "file": os.path.normpath(os.path.join(base, filename)) if filename else "unknown",
+                    "line": issue.get("line_number", 0),
+                    "rule_id": issue.get("test_id", "unknown"),
+                    "rule_name": issue.get("test_name", "unknown"),
+                    "message": issue.get("issue_text", ""),
+                    "severity": self._map_severity(issue.get("issue_severity", "LOW")),
+                    "confidence": issue.get("issue_confidence", "LOW"),
+                    "code": issue.get("code", ""),
+                }
+
+        self.completed = True
+        logger.info(f"Bandit 분석 완료: {count}개 발견")
+    
+    def _run(self, project_dir: Path, scan_paths: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Bandit을 한 번 실행하고 JSON 출력을 반환합니다.
+
+        Args:
+            project_dir: 실행 위치 (scan_paths의 기준 디렉토리)
+            scan_paths: 분석할 파일의 상대 경로 목록
+
+        Returns:
+            Bandit JSON 출력 (실행 또는 파싱에 실패하면 None)
+        """
         # Bandit 실행 (JSON 출력)
         cmd = [
             "bandit",
-            "-r",  # recursive
-            str(project_dir),
             "-f", "json",  # JSON format
             "-ll",  # Low confidence, Low severity 이상만
+            "--",  # 파일 이름이 옵션으로 해석되지 않도록
+            *scan_paths,
         ]
-        
+
         try:
+            # JSON 출력은 바이트 그대로 파서에 넘김 (전체 출력을 str로 디코딩한 뒤 다시 파싱하지 않음)
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
+                cwd=project_dir,
                 timeout=120,
             )
-            
+
             # Bandit은 취약점을 발견하면 exit code 1을 반환
             # 0: 취약점 없음, 1: 취약점 발견
             if result.returncode not in [0, 1]:
                 logger.warning(f"Bandit 실행 중 오류 발생 (Exit code: {result.returncode})")
-                logger.warning(f"stderr: {result.stderr}")
-                return []
-            
+                logger.warning(f"stderr: {result.stderr.decode('utf-8', errors='replace')}")
+                return None
+
             # JSON 파싱
             try:
-                data = json.loads(result.stdout)
+                return fastjson.loads(result.stdout)
             except json.JSONDecodeError as e:
                 logger.error(f"Bandit JSON 출력 파싱 실패: {e}")
-                logger.debug(f"stdout: {result.stdout}")
-                return []
-            
-            # 결과 변환
-            vulnerabilities = []
-            for issue in data.get("results", []):
-                vulnerabilities.append({
-                    "file": issue.get("filename", "unknown"),
-                    "line": issue.get("line_number", 0),
-                    "rule_id": issue.get("test_id", "unknown"),
-                    "rule_name": issue.get("test_name", "unknown"),
-                    "message": issue.get("issue_text", ""),
-                    "severity": self._map_severity(issue.get("issue_severity", "LOW")),
-                    "confidence": issue.get("issue_confidence", "LOW"),
-                    "code": issue.get("code", ""),
-                })
-            
-            logger.info(f"Bandit 분석 완료: {len(vulnerabilities)}개 발견")
-            return vulnerabilities
-            
+                logger.debug("stdout: {}", result.stdout)
+                return None
+
         except subprocess.TimeoutExpired:
             logger.error("Bandit 실행 시간 초과 (120초)")
-            return []
+            return None
         except Exception as e:
             logger.exception(f"Bandit 실행 중 오류: {e}")
-            return []
-    
+            return None
+
     def _map_severity(self, bandit_severity: str) -> str:
         """Bandit severity를 표준 severity로 매핑"""
-        severity_map = {
-            "HIGH": "error",
-            "MEDIUM": "warning",
-            "LOW": "note",
-        }
-        return severity_map.get(bandit_severity.upper(), "warning")
+        # Bandit은 대문자로 출력하므로 그대로 조회하고, 아닌 경우에만 대문자로 변환
+        severity = _SEVERITY_MAP.get(bandit_severity)
+        if severity is None:
+            severity = _SEVERITY_MAP.get(bandit_severity.upper(), "warning")
+        return severity
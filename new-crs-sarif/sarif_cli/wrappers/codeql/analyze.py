@@ -1,12 +1,58 @@
+import hashlib
 import json
 import os
+import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 
 from loguru import logger
 
-from .common import run, temporary_dir
+from .common import codeql_path, run, temporary_dir
 from .database import Database
+from sarif_cli.config.settings import config
+
+
+def _available_cpus() -> int:
+    # 컨테이너/CI에서는 cpu_count()가 호스트 CPU 수를 반환하므로 affinity 기준으로 계산
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 2
+
+
+# 분석 스레드 수 (사용 가능한 CPU의 절반, 최소 1)
+_CODEQL_THREADS = max(1, _available_cpus() // 2)
+
+# 언어 -> (SARIF category, 다운로드된 쿼리 팩의 쿼리 스위트)
+LANG_TO_SUITE = {
+    "c": ("cpp", "codeql/cpp-queries:codeql-suites/cpp-security-and-quality.qls"),
+    "java": ("java", "codeql/java-queries:codeql-suites/java-security-and-quality.qls"),
+    "python": ("python", "codeql/python-queries:codeql-suites/python-security-and-quality.qls"),
+    "javascript": ("javascript", "codeql/javascript-queries:codeql-suites/javascript-security-and-quality.qls"),
+}
+
+
+@lru_cache(maxsize=None)
+def query_suite_digest(suite: str) -> Optional[str]:
+    """
+    쿼리 스위트가 가리키는 쿼리 목록의 해시 (프로세스당 한 번 계산)
+
+    `codeql resolve queries` 결과 경로에는 쿼리 팩 버전이 포함되므로,
+    팩이 업데이트되면 해시도 바뀝니다. 확인할 수 없으면 None을 반환합니다.
+    """
+    try:
+        result = subprocess.run(
+            [codeql_path(), "resolve", "queries", "--format=json", suite],
+            capture_output=True,
+            timeout=300,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug(f"쿼리 스위트 확인 실패 ({suite}): {e}")
+        return None
+    if result.returncode != 0:
+        logger.debug(f"쿼리 스위트 확인 실패 ({suite}): {result.stderr.decode(errors='replace').strip()}")
+        return None
+    return hashlib.blake2b(result.stdout, digest_size=16).hexdigest()
 
 
 def run_codeql_analysis(
@@ -21,64 +67,24 @@ def run_codeql_analysis(
     if output is None:
         output = temporary_dir() / f"{run_name}.sarif"
 
-    nproc = os.cpu_count()
-
     # Run CodeQL analysis based on language
-    if language == "c":
-        run(
-            [
-                "database",
-                "analyze",
-                str(db.path),
-                "--format=sarif-latest",
-                "--threads=" + str(int(nproc / 2)),
-                "--output",
-                str(output),
-                "--sarif-category=cpp",
-                # 다운로드된 쿼리 팩 사용
-                "codeql/cpp-queries:codeql-suites/cpp-security-and-quality.qls",
-            ],
-        )
-    elif language == "java":
-        run(
-            [
-                "database",
-                "analyze",
-                str(db.path),
-                "--format=sarif-latest",
-                "--threads=" + str(int(nproc / 2)),
-                "--output",
-                str(output),
-                "--sarif-category=java",
-                # 다운로드된 쿼리 팩 사용
-                "codeql/java-queries:codeql-suites/java-security-and-quality.qls",
-            ],
-        )
-    elif language == "python":
-        run(
-            [
-                "database",
-                "analyze",
-                str(db.path),
-                "--format=sarif-latest",
-                "--threads=" + str(int(nproc / 2)),
-                "--output",
-                str(output),
-                "--sarif-category=python",
-                "codeql/python-queries:codeql-suites/python-security-and-quality.qls",
-            ],
-        )
-    elif language == "javascript":
-        run(
-            [
-                "database",
-                "analyze",
-                str(db.path),
-                "--format=sarif-latest",
-                "--threads=" + str(int(nproc / 2)),
-                "--output",
-                str(output),
-                "--sarif-category=javascript",
-                "codeql/javascript-queries:codeql-suites/javascript-security-and-quality.qls",
-            ],
-        )
+    if language not in LANG_TO_SUITE:
+        logger.warning(f"CodeQL 쿼리 스위트가 정의되지 않은 언어: {language}")
+        return
+    category, suite = LANG_TO_SUITE[language]
+    args = [
+        "database",
+        "analyze",
+        str(db.path),
+        "--format=sarif-latest",
+        f"--threads={_CODEQL_THREADS}",
+        "--output",
+        str(output),
+        f"--sarif-category={category}",
+    ]
+    if config.INCREMENTAL:
+        # 쿼리 팩의 사전 컴파일본을 쓸 수 없을 때(CLI 버전 불일치 등) 컴파일 결과를 실행 간에 재사용
+        compilation_cache = config.CACHE_DIR / "codeql_compile"
+        compilation_cache.mkdir(parents=True, exist_ok=True)
+        args.append(f"--compilation-cache={compilation_cache.resolve()}")
+    run(args + [suite])
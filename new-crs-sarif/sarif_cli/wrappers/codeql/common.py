@@ -1,19 +1,26 @@
 import os
+import shutil
 import subprocess
 import tempfile
+import threading
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Deque
 
 from loguru import logger
 
-from sarif_cli.core.cmd import BaseCommander
+from sarif_cli.core.cmd import ProcessRunRet, kill_process_group
 
 # Configuration
-def _find_codeql_path():
-    """CodeQL 실행 파일 경로를 찾습니다."""
-    import shutil
-    from pathlib import Path
-    
+@lru_cache(maxsize=None)
+def codeql_path() -> str:
+    """
+    CodeQL 실행 파일 경로를 찾습니다.
+    import 시점이 아니라 처음 사용할 때 한 번만 탐색합니다.
+    """
     # 1. PATH에서 찾기
     codeql_in_path = shutil.which("codeql")
     if codeql_in_path:
@@ -34,7 +41,6 @@ def _find_codeql_path():
     # 찾지 못한 경우 기본값 반환 (에러는 나중에 발생)
     return "codeql"
 
-codeql_path = _find_codeql_path()
 library_path = None
 
 
@@ -83,26 +89,82 @@ def temporary_file(create=True, prefix=None, suffix=None) -> Path:
     return path
 
 
-def run(args, *, container_id: str | None = None, timeout: int | None = None):
-    command = [codeql_path] + list(map(str, args))
+# 임시 데이터베이스(수 GB) 삭제를 분석 흐름과 분리하기 위한 단일 작업자
+# ThreadPoolExecutor 작업자는 인터프리터 종료 시 join되므로 삭제가 중간에 끊기지 않음
+_cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="codeql-cleanup")
+
+
+def remove_dir_async(path: Path) -> None:
+    """디렉토리를 백그라운드에서 삭제합니다 (호출부는 삭제 완료를 기다리지 않음)."""
+    _cleanup_executor.submit(shutil.rmtree, path, ignore_errors=True)
 
-    if container_id:
-        logger.warning("Docker execution is not supported in this version. Running locally.")
-        
-    runner = BaseCommander()
-    # 기본적으로 출력을 억제 (quiet=True)
-    res = runner.run(command, timeout=timeout, quiet=True)
 
-    if res.returncode != 0:
-        if res.returncode == -1:
-            raise subprocess.TimeoutExpired(
-                f"Command {' '.join(command)} timed out after {timeout} seconds"
-            )
-        else:
-            raise RuntimeError(
-                f"Command {' '.join(command)} failed with return code {res.returncode}"
-            )
+# 실패 시 오류 메시지에 포함할 CodeQL 출력 마지막 줄 수
+_OUTPUT_TAIL_LINES = 20
 
-    return res
 
+def run(args, *, container_id: str | None = None, timeout: int | None = None) -> ProcessRunRet:
+    """
+    CodeQL 명령을 실행합니다.
+    출력은 한 줄씩 읽어 TRACE 레벨로 로깅하고 마지막 몇 줄만 보관하므로,
+    분석 로그가 길어도 메모리를 쌓지 않고 실패 시 원인을 오류 메시지에 남길 수 있습니다.
+
+    Raises:
+        subprocess.TimeoutExpired: timeout(초) 안에 끝나지 않은 경우
+        RuntimeError: 종료 코드가 0이 아닌 경우
+    """
+    command = [codeql_path()] + list(map(str, args))
+    # Database.create가 빌드 명령을 셸 인용 형태로 넘기므로 셸을 통해 실행
+    command_str = " ".join(command)
+
+    if container_id:
+        logger.warning("Docker execution is not supported in this version. Running locally.")
 
+    logger.debug(f"Running command: {command_str}")
+    tail: Deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+    proc = subprocess.Popen(
+        command_str,
+        shell=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        start_new_session=True,  # 셸과 CodeQL(JVM)을 함께 종료할 수 있도록 별도 프로세스 그룹
+    )
+    timed_out = threading.Event()
+
+    def _on_timeout():
+        timed_out.set()
+        kill_process_group(proc)
+
+    # 출력이 멈춘 채 프로세스가 끝나지 않아도 timeout이 지나면 종료
+    timer = threading.Timer(timeout, _on_timeout) if timeout else None
+    try:
+        if timer:
+            timer.start()
+        for line in proc.stdout:
+            line = line.rstrip()
+            tail.append(line)
+            logger.trace(line)
+        returncode = proc.wait()
+    except BaseException:
+        # Ctrl-C 등으로 중단되면 CodeQL 프로세스도 함께 종료
+        kill_process_group(proc)
+        proc.wait()
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+        proc.stdout.close()
+
+    output = "\n".join(tail)
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command_str, timeout, output=output)
+    if returncode != 0:
+        raise RuntimeError(
+            f"Command {command_str} failed with return code {returncode}"
+            + (f"\n{output}" if output else "")
+        )
+
+    return ProcessRunRet(returncode, output, "")
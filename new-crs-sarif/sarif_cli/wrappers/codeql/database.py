@@ -36,8 +36,9 @@ class Database(object):
         if not path.is_dir():
             raise ValueError(f"Database is not a directory: {path}")
 
+        # --db-cluster로 만든 경우 언어별 데이터베이스가 <path>/<lang>/db-<lang>에 위치
         if not any(
-            path.joinpath(f"db-{lang}").exists()
+            path.joinpath(f"db-{lang}").exists() or path.joinpath(lang, f"db-{lang}").exists()
             for lang in ["java", "cpp", "c", "python", "javascript"]
         ):
             raise ValueError(f"Database is not a CodeQL database: {path}")
@@ -1,14 +1,23 @@
 
-import json
-import shutil
 from pathlib import Path
-from typing import List, Dict, Any, Literal
+from typing import List, Dict, Any, Iterator, Literal, Optional, Tuple
 
 from loguru import logger
 
 from .database import Database
-from .analyze import run_codeql_analysis
-from .common import temporary_dir, codeql_path
+from .analyze import LANG_TO_SUITE, query_suite_digest, run_codeql_analysis
+from .common import codeql_path, remove_dir_async, temporary_dir
+from sarif_cli.config.settings import config
+from sarif_cli.core.cache import (
+    DirectoryCache,
+    files_fingerprint,
+    load_parsed_report,
+    report_digest,
+    save_parsed_report,
+)
+from sarif_cli.core.cmd import get_tool_version
+from sarif_cli.core.detector import LANGUAGE_EXTENSIONS, get_file_index
+from sarif_cli.core.sarif_reader import SARIF_DECODE_ERRORS, iter_sarif_results, rule_short_descriptions
 
 
 class CodeQLWrapper:
@@ -17,133 +26,272 @@ class CodeQLWrapper:
     def __init__(self):
         import os
         # codeql_path가 절대 경로인지 확인
-        if not os.path.exists(codeql_path):
+        if not os.path.exists(codeql_path()):
             raise FileNotFoundError(
-                f"CodeQL 실행 파일을 찾을 수 없습니다: {codeql_path}\\n"
+                f"CodeQL 실행 파일을 찾을 수 없습니다: {codeql_path()}\\n"
                 "설치하려면 install_codeql.sh를 실행하거나 PATH에 추가하세요."
             )
-        logger.info(f"CodeQL 실행 파일 확인 완료: {codeql_path}")
+        logger.info(f"CodeQL 실행 파일 확인 완료: {codeql_path()}")
 
     def analyze(
         self,
         project_dir: Path,
         language: Literal["c", "cpp", "java", "python", "javascript"],
         build_command: str | List[str] | None = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
-        주어진 프로젝트에 대해 CodeQL 분석을 실행하고 결과를 반환합니다.
+        주어진 프로젝트에 대해 CodeQL 분석을 실행하고 결과를 하나씩 반환합니다.
+        제너레이터이므로 결과를 끝까지 소비해야 임시 파일이 정리됩니다.
 
         Args:
             project_dir: 분석할 소스 코드가 있는 프로젝트 디렉토리.
             language: 분석할 언어 ("c", "cpp", "java", "python", "javascript").
             build_command: 프로젝트 빌드 명령어 (선택 사항).
 
-        Returns:
-            발견된 취약점 목록.
+        Yields:
+            발견된 취약점 정보.
         """
         logger.info(f"{language} 프로젝트 분석 시작: {project_dir}")
 
         db_dir = temporary_dir(prefix="codeql_db_")
         results_dir = temporary_dir(prefix="codeql_results_")
-        db_path = db_dir / f"{project_dir.name}-db"
         sarif_output_path = results_dir / f"{project_dir.name}-results.sarif"
 
         try:
-            # 1. CodeQL 데이터베이스 생성
-            logger.info("CodeQL 데이터베이스 생성 중...")
-            
-            db = Database.create(
-                language=language,
-                db_path=db_path,
-                src_path=project_dir,
-                command=build_command,
-            )
-            logger.success(f"데이터베이스 생성 완료: {db.path}")
-
-            # 2. CodeQL 분석 실행 및 SARIF 파일 생성
-            logger.info("CodeQL 분석 실행 중...")
-            run_name = f"{project_dir.name}-{language}-run"
-            
-            # C와 C++를 동일하게 처리
-            analysis_lang = "c" if language == "cpp" else language
-            
-            run_codeql_analysis(
-                db=db,
-                run_name=run_name,
-                language=analysis_lang,
-                output=sarif_output_path,
-                extended=True,  # 확장된 쿼리 셋 사용
-            )
-            logger.success(f"분석 완료. SARIF 파일 생성: {sarif_output_path}")
+            # 1. CodeQL 데이터베이스 생성 (증분 분석 시 캐시 재사용)
+            db_path, db_key = self._prepare_database(project_dir, language, build_command, db_dir)
+            db = Database(db_path)
 
-            # 3. SARIF 파일 파싱
-            if sarif_output_path.exists():
-                return self._parse_sarif_report(sarif_output_path)
-            else:
-                logger.warning("SARIF 출력 파일이 생성되지 않았습니다.")
-                return []
+            # 2~3. 분석 실행 및 SARIF 파싱
+            yield from self._analyze_db(db, project_dir, language, sarif_output_path, db_key)
 
         except Exception as e:
             logger.error(f"CodeQL 분석 중 오류 발생: {e}", exc_info=True)
-            return []
         finally:
             # 4. 임시 데이터베이스 및 결과 파일 정리
             logger.info("임시 파일 정리...")
-            shutil.rmtree(db_dir, ignore_errors=True)
-            shutil.rmtree(results_dir, ignore_errors=True)
+            remove_dir_async(db_dir)
+            remove_dir_async(results_dir)
+
+    def analyze_multi(
+        self,
+        project_dir: Path,
+        languages: List[Literal["c", "cpp", "java", "python", "javascript"]],
+        build_command: str | List[str] | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        여러 언어를 하나의 데이터베이스 클러스터(--db-cluster)로 추출한 뒤
+        언어별 하위 데이터베이스에 쿼리를 실행합니다.
+        소스 추출과 빌드는 한 번만 수행됩니다.
+
+        c와 cpp는 같은 cpp 데이터베이스를 사용하므로 먼저 나온 언어로 한 번만 분석합니다.
+        제너레이터이므로 결과를 끝까지 소비해야 임시 파일이 정리됩니다.
+
+        Args:
+            project_dir: 분석할 소스 코드가 있는 프로젝트 디렉토리.
+            languages: 분석할 언어 목록.
+            build_command: 컴파일 언어 전체를 빌드하는 명령어 (선택 사항).
+
+        Yields:
+            발견된 취약점 정보 (결과를 낸 언어가 "language" 키에 포함됨).
+        """
+        # CodeQL 추출기 이름 → 결과를 귀속할 요청 언어 (c/cpp는 cpp 추출기를 공유)
+        extractors: Dict[str, str] = {}
+        for language in languages:
+            extractors.setdefault("cpp" if language == "c" else language, language)
+
+        logger.info(f"{', '.join(extractors.values())} 프로젝트 통합 분석 시작: {project_dir}")
+
+        db_dir = temporary_dir(prefix="codeql_db_")
+        results_dir = temporary_dir(prefix="codeql_results_")
+
+        try:
+            cluster_path, db_key = self._prepare_database(project_dir, list(extractors), build_command, db_dir)
+        except Exception as e:
+            logger.error(f"CodeQL 데이터베이스 클러스터 생성 중 오류 발생: {e}", exc_info=True)
+            remove_dir_async(db_dir)
+            remove_dir_async(results_dir)
+            return
 
+        try:
+            for extractor, language in extractors.items():
+                # 한 언어의 분석 실패가 다른 언어 분석을 막지 않도록 언어별로 처리
+                try:
+                    db = Database(cluster_path / extractor)
+                    sarif_output_path = results_dir / f"{project_dir.name}-{language}-results.sarif"
+                    for result in self._analyze_db(db, project_dir, language, sarif_output_path, db_key):
+                        result["language"] = language
+                        yield result
+                except Exception as e:
+                    logger.error(f"CodeQL 분석 중 오류 발생 ({language}): {e}", exc_info=True)
+        finally:
+            logger.info("임시 파일 정리...")
+            remove_dir_async(db_dir)
+            remove_dir_async(results_dir)
 
-    def _parse_sarif_report(self, report_path: Path) -> List[Dict[str, Any]]:
+    def _prepare_database(
+        self,
+        project_dir: Path,
+        language: str | List[str],
+        build_command: str | List[str] | None,
+        db_dir: Path,
+    ) -> Tuple[Path, Optional[str]]:
         """
-        SARIF 파일을 파싱하여 취약점 정보를 추출합니다.
+        CodeQL 데이터베이스(언어 목록이면 클러스터)를 준비하고 (경로, 캐시 키)를 반환합니다.
+
+        증분 분석이 켜져 있으면 추출 언어의 소스 파일 fingerprint가 같은 데이터베이스를
+        CACHE_DIR/codeql_dbs에서 재사용하고, 새로 만든 데이터베이스도 그곳에 보관합니다.
+        그렇지 않으면 db_dir 아래에 만들며 정리는 호출부에서 합니다 (캐시 키는 None).
+        """
+        languages = language if isinstance(language, list) else [language]
+        if not config.INCREMENTAL:
+            db_path = db_dir / f"{project_dir.name}-db"
+            logger.info("CodeQL 데이터베이스 생성 중...")
+            Database.create(language=language, db_path=db_path, src_path=project_dir, command=build_command)
+            logger.success(f"데이터베이스 생성 완료: {db_path}")
+            return db_path, None
+
+        # 빌드가 트리 안에 산출물(.o, .class, target/classes)을 쓰므로 트리 전체가 아닌
+        # 추출 언어의 소스 파일만 해시함 (cpp 추출기는 c와 cpp 소스를 모두 읽음)
+        # 빌드 명령은 소스 트리로부터 결정되므로 키에 포함하지 않음 (임시 파일 경로가 매번 달라짐)
+        suffixes = {
+            ext
+            for lang in languages
+            for src_lang in (("c", "cpp") if lang in ("c", "cpp") else (lang,))
+            for ext in LANGUAGE_EXTENSIONS.get(src_lang, ())
+        }
+        key = files_fingerprint(
+            project_dir,
+            get_file_index(project_dir).get(*sorted(suffixes)),
+            extra=[str(project_dir.resolve()), get_tool_version(codeql_path()) or "", ",".join(sorted(languages))],
+        )
+        cache = DirectoryCache(config.CACHE_DIR / "codeql_dbs", config.CODEQL_DB_CACHE_SIZE)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"캐시된 CodeQL 데이터베이스 사용: {cached}")
+            return cached, key
+
+        staging = cache.staging_path(key)
+        logger.info("CodeQL 데이터베이스 생성 중...")
+        Database.create(language=language, db_path=staging, src_path=project_dir, command=build_command)
+        db_path = cache.put(key, staging)
+        logger.success(f"데이터베이스 생성 완료 (캐시에 저장): {db_path}")
+        return db_path, key
+
+    def _analyze_db(
+        self,
+        db: Database,
+        project_dir: Path,
+        language: str,
+        sarif_output_path: Path,
+        db_key: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        생성된 데이터베이스에 언어별 쿼리를 실행하고 SARIF 결과를 반환합니다.
+        캐시된 데이터베이스(db_key)에 같은 쿼리 스위트로 분석한 결과가 있으면 분석을 건너뜁니다.
+        """
+        run_name = f"{project_dir.name}-{language}-run"
+        
+        # C와 C++를 동일하게 처리
+        analysis_lang = "c" if language == "cpp" else language
+
+        analysis_key = None
+        if db_key is not None and analysis_lang in LANG_TO_SUITE:
+            suite_digest = query_suite_digest(LANG_TO_SUITE[analysis_lang][1])
+            if suite_digest is not None:
+                analysis_key = f"{db_key}_{analysis_lang}_{suite_digest}"
+                cached = load_parsed_report(config.CACHE_DIR, analysis_key, kind="analyses")
+                if cached is not None:
+                    logger.info(f"캐시된 CodeQL 분석 결과 사용: {len(cached)}개")
+                    yield from cached
+                    return
+
+        logger.info("CodeQL 분석 실행 중...")
+        run_codeql_analysis(
+            db=db,
+            run_name=run_name,
+            language=analysis_lang,
+            output=sarif_output_path,
+            extended=True,  # 확장된 쿼리 셋 사용
+        )
+        logger.success(f"분석 완료. SARIF 파일 생성: {sarif_output_path}")
+
+        if sarif_output_path.exists():
+            yield from self._parse_sarif_report(sarif_output_path, analysis_key)
+        else:
+            logger.warning("SARIF 출력 파일이 생성되지 않았습니다.")
+
+
+    def _parse_sarif_report(
+        self,
+        report_path: Path,
+        analysis_key: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        SARIF 파일을 파싱하여 취약점 정보를 하나씩 추출합니다.
+        증분 분석이 켜져 있으면 보고서 내용 해시로 파싱 결과를 캐시하고,
+        analysis_key가 주어지면 분석 입력(데이터베이스, 쿼리 스위트) 기준으로도 저장합니다.
         """
         logger.info(f"SARIF 파일 파싱: {report_path}")
-        results = []
         try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                sarif_data = json.load(f)
+            if not config.INCREMENTAL:
+                count = 0
+                for r in self._iter_sarif_report(report_path):
+                    count += 1
+                    yield r
+                logger.info(f"{count}개의 결과를 파싱했습니다.")
+                return
 
-            for run in sarif_data.get("runs", []):
-                rules = {
-                    rule['id']: rule for rule in run.get("tool", {}).get("driver", {}).get("rules", [])
-                }
-                
-                for result in run.get("results", []):
-                    rule_id = result.get("ruleId")
-                    message = result.get("message", {}).get("text", "")
-                    level = result.get("level", "warning")
-
-                    if not rule_id or not message:
-                        continue
-
-                    for location in result.get("locations", []):
-                        phys_loc = location.get("physicalLocation", {})
-                        artifact_loc = phys_loc.get("artifactLocation", {})
-                        uri = artifact_loc.get("uri")
-                        
-                        if not uri:
-                            continue
-                            
-                        region = phys_loc.get("region", {})
-                        line = region.get("startLine", 1)
-
-                        rule_info = rules.get(rule_id, {})
-                        rule_name = rule_info.get("shortDescription", {}).get("text", rule_id)
-                        
-                        results.append({
-                            "file": uri,
-                            "line": line,
-                            "rule_id": rule_id,
-                            "rule_name": rule_name,
-                            "message": message,
-                            "severity": level,
-                            "tool_name": "CodeQL",
-                            "tool_metadata": run.get("tool", {}),
-                        })
-            logger.info(f"{len(results)}개의 결과를 파싱했습니다.")
-        except json.JSONDecodeError:
+            digest = report_digest(report_path)
+            results = load_parsed_report(config.CACHE_DIR, digest)
+            if results is not None:
+                logger.info(f"캐시된 SARIF 파싱 결과 사용: {len(results)}개")
+            else:
+                # 끝까지 파싱에 성공한 경우에만 캐시에 저장
+                results = list(self._iter_sarif_report(report_path))
+                logger.info(f"{len(results)}개의 결과를 파싱했습니다.")
+                save_parsed_report(config.CACHE_DIR, digest, results)
+            if analysis_key is not None:
+                save_parsed_report(config.CACHE_DIR, analysis_key, results, kind="analyses")
+            yield from results
+        except SARIF_DECODE_ERRORS:
             logger.error(f"SARIF 파일이 올바른 JSON 형식이 아닙니다: {report_path}")
         except Exception as e:
             logger.exception(f"SARIF 보고서 처리 중 예외 발생: {e}")
-            
-        return results
+
+    def _iter_sarif_report(self, report_path: Path) -> Iterator[Dict[str, Any]]:
+        """SARIF 결과를 래퍼 결과 dict로 변환합니다 (파싱 오류는 호출부로 전달)."""
+        rule_names: Dict[str, str] = {}
+        current_tool = None
+        for tool, result in iter_sarif_results(report_path):
+            # run이 바뀔 때만 규칙 이름 맵을 다시 생성 (결과가 없는 run은 만들지 않음)
+            if tool is not current_tool:
+                current_tool = tool
+                rule_names = rule_short_descriptions(tool)
+
+            rule_id = result.get("ruleId")
+            message = result.get("message", {}).get("text", "")
+            level = result.get("level", "warning")
+
+            if not rule_id or not message:
+                continue
+
+            rule_name = rule_names.get(rule_id, rule_id)
+
+            for location in result.get("locations", []):
+                phys_loc = location.get("physicalLocation", {})
+                uri = phys_loc.get("artifactLocation", {}).get("uri")
+                
+                if not uri:
+                    continue
+
+                yield {
+                    "file": uri,
+                    "line": phys_loc.get("region", {}).get("startLine", 1),
+                    "rule_id": rule_id,
+                    "rule_name": rule_name,
+                    "message": message,
+                    "severity": level,
+                    "tool_name": "CodeQL",
+                    "tool_metadata": tool,
+                }
@@ -2,12 +2,89 @@
 Joern 래퍼 - 기존 crs-sarif의 JoernServer 재사용 (직접 joern-parse 사용)
 """
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Dict, Any, Iterator, Optional
 from loguru import logger
+import hashlib
 import tempfile
 import shutil
 import subprocess
 
+from sarif_cli.config.settings import config
+from sarif_cli.core import fastjson
+from sarif_cli.core.cache import get_result_cache, report_digest
+from sarif_cli.core.cmd import get_tool_version
+
+# 쿼리 스크립트 출력에서 규칙별 결과를 구분하는 마커
+_RULE_MARKER = "#rule"
+_ERROR_MARKER = "#error"
+# 증분 분석 시 쿼리 결과를 저장하는 캐시 네임스페이스
+_CACHE_NAMESPACE = "joern"
+
+
+def _parse_script_output(stdout: bytes, rule_names: Dict[str, str]) -> Dict[str, list]:
+    """
+    쿼리 스크립트 출력을 마커 기준으로 규칙별 응답으로 나눕니다.
+    규칙마다 JSON 라인을 모아 한 번에 파싱하고, 실패한 쿼리의 규칙은 결과에서 제외합니다.
+    마커나 결과 라인이 출력되지 않은 규칙(스크립트 컴파일 오류, 중간 종료 등)도 실패로 보고 제외하므로,
+    반환값에 모든 규칙이 있어야 완료된 실행입니다.
+
+    Args:
+        stdout: joern 표준 출력 (바이트)
+        rule_names: 규칙 ID -> 규칙 이름
+
+    Returns:
+        규칙 ID -> 파싱된 JSON 값 리스트
+    """
+    rule_marker = _RULE_MARKER.encode()
+    error_marker = _ERROR_MARKER.encode()
+    # 마커가 실제로 출력된 규칙만 담음
+    json_lines: Dict[str, list] = {}
+    failed = set()
+    current = None
+    for line in stdout.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(rule_marker):
+            rule_id = line[len(rule_marker):].strip().decode(errors="replace")
+            current = json_lines.setdefault(rule_id, []) if rule_id in rule_names else None
+            continue
+        if line.startswith(error_marker):
+            rule_id, _, message = line[len(error_marker):].strip().decode(errors="replace").partition(" ")
+            logger.warning(f"{rule_names.get(rule_id, rule_id)} 쿼리 실행 실패: {message}")
+            json_lines.pop(rule_id, None)
+            failed.add(rule_id)
+            current = None
+            continue
+        # Skip lines that are not JSON (e.g., Joern log messages)
+        # 출력 라인마다 호출되므로 f-string 대신 loguru 인자 포맷 사용 (레벨이 꺼져 있으면 포맷하지 않음)
+        if current is None or line[:1] not in (b"{", b"["):
+            logger.debug("Skipping non-JSON line: {}", line)
+            continue
+        current.append(line)
+
+    # 성공한 쿼리는 빈 결과도 "[]" 한 줄을 출력하므로 결과 라인이 없으면 끝까지 실행되지 않은 것
+    for rule_id, rule_name in rule_names.items():
+        if rule_id not in failed and not json_lines.get(rule_id):
+            json_lines.pop(rule_id, None)
+            logger.warning(f"{rule_name} 쿼리 결과가 출력되지 않았습니다.")
+
+    responses: Dict[str, list] = {}
+    for rule_id, lines in json_lines.items():
+        try:
+            # 라인을 JSON 배열 하나로 이어 붙여 파서를 한 번만 호출
+            responses[rule_id] = fastjson.loads(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            # JSON처럼 보이는 로그 라인이 섞인 경우 라인별로 파싱하여 해당 라인만 무시
+            responses[rule_id] = []
+            for line in lines:
+                try:
+                    responses[rule_id].append(fastjson.loads(line))
+                except ValueError:
+                    logger.debug("JSON 파싱 실패 (무시): {}", line)
+    return responses
+
+
 def ensure_joern_installed() -> bool:
     """joern-parse와 joern 실행 파일이 PATH에 있는지 확인"""
     for cmd in ("joern-parse", "joern"):
@@ -95,128 +172,177 @@ class JoernAnalyzer:
         logger.warning("CPG가 없어서 Joern을 사용할 수 없습니다.")
         return False
     
-    def query_vulnerabilities(self) -> List[Dict[str, Any]]:
+    def query_vulnerabilities(self) -> Iterator[Dict[str, Any]]:
         """
         Joern 쿼리를 사용하여 취약점 탐지
         
-        Returns:
-            취약점 정보 리스트
+        Yields:
+            취약점 정보
         """
         # 직접 joern CLI를 사용해 쿼리를 실행합니다.
         if not self.cpg_path:
             logger.warning("CPG가 없어서 쿼리를 실행할 수 없습니다.")
-            return []
-
-        import json, tempfile
-        vulnerabilities = []
+            return
 
-        # 쿼리 정의 - toJson 호출 후 println으로 출력
+        # 쿼리 정의 - 결과 리스트를 만드는 Scala 표현식
         buffer_overflow_query = """
-        println(cpg.call.name("(strcpy|memcpy|sprintf|gets).*").l.map { c =>
+        cpg.call.name("(strcpy|memcpy|sprintf|gets).*").l.map { c =>
           Map(
             "function" -> c.name,
             "file" -> c.file.name.headOption.getOrElse("unknown"),
             "line" -> c.lineNumber.headOption.getOrElse(0),
             "code" -> c.code
           )
-        }.toJson);
-        """
+        }"""
         uaf_query = """
-        println(cpg.call.name("free").l.map { c =>
+        cpg.call.name("free").l.map { c =>
           Map(
             "function" -> "free",
             "file" -> c.file.name.headOption.getOrElse("unknown"),
             "line" -> c.lineNumber.headOption.getOrElse(0),
             "code" -> c.code
           )
-        }.toJson);
-        """
+        }"""
         null_deref_query = """
-        println(cpg.call.name(".*").where(_.argument.code("NULL")).l.map { c =>
+        cpg.call.name(".*").where(_.argument.code("NULL")).l.map { c =>
           Map(
             "function" -> c.name,
             "file" -> c.file.name.headOption.getOrElse("unknown"),
             "line" -> c.lineNumber.headOption.getOrElse(0),
             "code" -> c.code
           )
-        }.toJson);
-        """
+        }"""
         queries = [
             ("CWE-119", "Buffer Overflow", buffer_overflow_query),
             ("CWE-416", "Use After Free", uaf_query),
             ("CWE-476", "NULL Pointer Dereference", null_deref_query),
         ]
+        rule_names = {rule_id: rule_name for rule_id, rule_name, _ in queries}
+
+        # JVM 기동과 CPG 로딩이 쿼리 실행보다 훨씬 비싸므로 모든 쿼리를 스크립트 하나로 실행
+        # 각 쿼리 결과 앞에 "#rule <id>" 마커를 출력하고, 실패한 쿼리는 "#error <id>"로 표시
+        script = "".join(
+            f"""
+        println("{_RULE_MARKER} {rule_id}")
+        try {{
+          println(({query}).toJson)
+        }} catch {{
+          case e: Throwable => println("{_ERROR_MARKER} {rule_id} " + e.getMessage)
+        }}
+        """
+            for rule_id, _, query in queries
+        )
 
-        # Execute each query via joern CLI
-        for rule_id, rule_name, query in queries:
+        responses = self._run_cached(script, rule_names, timeout=60 * len(queries))
+        if responses is None:
+            return
+
+        for rule_id, rule_name, _ in queries:
+            aggregated = []
+            for data in responses.get(rule_id, []):
+                # Joern output via println(....toJson) returns the list directly
+                if isinstance(data, list):
+                    aggregated.extend(data)
+                elif isinstance(data, dict) and "response" in data:
+                    aggregated.extend(data["response"])
+            logger.info(f"{rule_name}: {len(aggregated)}개 발견")
+            for item in aggregated:
+                if isinstance(item, dict):
+                    yield {
+                        "rule_id": rule_id,
+                        "rule_name": rule_name,
+                        "file": item.get("file", "unknown"),
+                        "line": item.get("line", 0),
+                        "function": item.get("function", "unknown"),
+                        "code": item.get("code", ""),
+                    }
+    
+    def _cache_key(self, script: str) -> Optional[str]:
+        """CPG 내용, 쿼리 스크립트, Joern 버전으로 만든 쿼리 결과 캐시 키 (CPG를 읽을 수 없으면 None)"""
+        try:
+            cpg_digest = report_digest(self.cpg_path)
+        except OSError as e:
+            logger.debug(f"CPG 해시 계산 실패: {e}")
+            return None
+        h = hashlib.blake2b(digest_size=16)
+        for value in (cpg_digest, get_tool_version("joern") or "", script):
+            h.update(value.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _run_cached(
+        self,
+        script: str,
+        rule_names: Dict[str, str],
+        timeout: int,
+    ) -> Optional[Dict[str, list]]:
+        """
+        쿼리 스크립트를 실행하고 규칙별 응답을 반환합니다.
+        증분 분석이 켜져 있으면 같은 CPG와 스크립트의 결과를 캐시에서 재사용하여 JVM 기동과 CPG 로딩을 생략합니다.
+        """
+        key = self._cache_key(script) if config.INCREMENTAL else None
+        if key is not None:
+            cache = get_result_cache(config.CACHE_DIR)
+            cached = cache.get_value(_CACHE_NAMESPACE, key)
+            if cached is not None:
+                logger.info("캐시된 Joern 쿼리 결과 사용")
+                return cached
+
+        responses = self._run_script(script, rule_names, timeout)
+        # 일부 쿼리가 실패했거나 결과를 출력하지 않은 실행은 다음 실행에서 다시 시도하도록 저장하지 않음
+        if key is not None and responses is not None and len(responses) == len(rule_names):
+            cache.put_value(_CACHE_NAMESPACE, key, responses)
+        return responses
+
+    def _run_script(
+        self,
+        script: str,
+        rule_names: Dict[str, str],
+        timeout: int,
+    ) -> Optional[Dict[str, list]]:
+        """
+        joern CLI로 쿼리 스크립트를 실행하고 마커 기준으로 규칙별 응답을 수집합니다.
+        실행 자체가 실패하면 None, 실패한 쿼리의 규칙은 결과에서 제외합니다.
+        """
+        try:
+            # Write query to temporary file
+            with tempfile.NamedTemporaryFile('w', delete=False, suffix='.sc') as f:
+                f.write(script)
+                query_file = f.name
+            # Run joern CLI: joern --script script.sc --nocolors cpg.bin
+            cmd = [
+                "joern",
+                "--script", query_file,
+                "--nocolors",
+                str(self.cpg_path)
+            ]
             try:
-                # Write query to temporary file
-                with tempfile.NamedTemporaryFile('w', delete=False, suffix='.sc') as f:
-                    f.write(query)
-                    query_file = f.name
-                # Run joern CLI: joern --script script.sc --nocolors cpg.bin
-                cmd = [
-                    "joern",
-                    "--script", query_file,
-                    "--nocolors",
-                    str(self.cpg_path)
-                ]
                 result = subprocess.run(
                     cmd,
+                    # 출력은 바이트로 받아 그대로 JSON 파서에 넘김 (큰 출력 전체를 str로 디코딩하지 않음)
                     capture_output=True,
-                    text=True,
-                    timeout=60,
+                    timeout=timeout,
                 )
+            finally:
                 # Clean up temp file
                 try:
                     Path(query_file).unlink()
                 except Exception:
                     pass
-                if result.returncode != 0:
-                    logger.warning(f"{rule_name} 쿼리 실행 실패: {result.stderr.strip()}")
-                    continue
-                stdout = result.stdout.strip()
-                if not stdout:
-                    logger.warning(f"{rule_name} 쿼리 결과가 비어 있습니다.")
-                    continue
-                # Parse possible multiple JSON objects
-                responses = []
-                for line in stdout.splitlines():
-                    line = line.strip()
-                    if not line:
-                        continue
-                    # Skip lines that are not JSON (e.g., Joern log messages)
-                    if not (line.startswith('{') or line.startswith('[')):
-                        logger.debug(f"Skipping non-JSON line: {line}")
-                        continue
-                    try:
-                        data = json.loads(line)
-                        responses.append(data)
-                    except json.JSONDecodeError:
-                        logger.debug(f"JSON 파싱 실패 (무시): {line}")
-                aggregated = []
-                for data in responses:
-                    # Joern output via println(....toJson) returns the list directly
-                    if isinstance(data, list):
-                        aggregated.extend(data)
-                    elif isinstance(data, dict) and "response" in data:
-                        aggregated.extend(data["response"])
-                logger.info(f"{rule_name}: {len(aggregated)}개 발견")
-                for item in aggregated:
-                    if isinstance(item, dict):
-                        vulnerabilities.append({
-                            "rule_id": rule_id,
-                            "rule_name": rule_name,
-                            "file": item.get("file", "unknown"),
-                            "line": item.get("line", 0),
-                            "function": item.get("function", "unknown"),
-                            "code": item.get("code", ""),
-                        })
-            except Exception as e:
-                logger.warning(f"{rule_name} 쿼리 실행 중 오류: {e}")
-                continue
-        return vulnerabilities
-    
+        except Exception as e:
+            logger.warning(f"Joern 쿼리 실행 중 오류: {e}")
+            return None
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            logger.warning(f"Joern 쿼리 실행 실패: {stderr}")
+            return None
+        stdout = result.stdout.strip()
+        if not stdout:
+            logger.warning("Joern 쿼리 결과가 비어 있습니다.")
+            return None
+        return _parse_script_output(stdout, rule_names)
+
     def stop_server(self):
         """현재 구현에서는 별도 서버가 없으므로 아무 작업도 하지 않음"""
     
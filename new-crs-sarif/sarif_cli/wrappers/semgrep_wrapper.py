@@ -2,12 +2,25 @@
 Semgrep 래퍼 - JavaScript/TypeScript 보안 취약점 분석
 """
 import subprocess
-import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from loguru import logger
 import shutil
 
+from sarif_cli.core.cmd import get_tool_version
+from sarif_cli.core.sarif_reader import SARIF_DECODE_ERRORS, iter_sarif_bytes
+
+
+# 큰 파일이나 느린 규칙 몇 개가 전체 분석 시간을 좌우하지 않도록 제한
+MAX_TARGET_BYTES = 1_000_000  # 이보다 큰 파일은 분석하지 않음
+RULE_TIMEOUT = 5  # 파일당 규칙 하나의 제한 시간(초)
+TIMEOUT_THRESHOLD = 3  # 한 파일에서 이 횟수만큼 규칙이 시간 초과되면 해당 파일을 건너뜀
+# 사람이 작성하지 않은 코드 (minified 번들 등)
+EXCLUDE_PATTERNS = ("*.min.js", "*.bundle.js")
+
+# 규칙 정보가 없는 결과의 severity (security-severity 기본값 5.0에 해당)
+_DEFAULT_SEVERITY = "warning"
+
 
 def ensure_semgrep_installed() -> bool:
     """Semgrep이 설치되어 있는지 확인"""
@@ -22,20 +35,35 @@ class SemgrepAnalyzer:
     
     def __init__(self):
         self.semgrep_cmd = shutil.which("semgrep")
+        # 마지막 analyze가 출력을 끝까지 파싱했는지 (실패한 실행의 빈 결과를 캐시하지 않도록)
+        self.completed = False
     
-    def analyze(self, project_dir: Path, language: str = "auto") -> List[Dict[str, Any]]:
+    def version(self) -> Optional[str]:
+        """설치된 Semgrep 버전 (캐시 무효화 키로 사용)"""
+        return get_tool_version(self.semgrep_cmd) if self.semgrep_cmd else None
+
+    def analyze(
+        self,
+        project_dir: Path,
+        language: str = "auto",
+        targets: Optional[List[Path]] = None,
+    ) -> Iterator[Dict[str, Any]]:
         """
         Semgrep을 사용하여 코드 분석
         
         Args:
             project_dir: 프로젝트 디렉토리
             language: 분석할 언어 ("javascript", "python", "java", "auto")
+            targets: 분석할 파일 목록 (지정 시 project_dir 전체 대신 해당 파일만 분석)
         
-        Returns:
-            취약점 정보 리스트 (경량화된 형식)
+        Yields:
+            취약점 정보 (경량화된 형식)
         """
+        self.completed = False
         if not ensure_semgrep_installed():
-            return []
+            return
+        if targets is not None and not targets:
+            return
         
         logger.info(f"Semgrep 분석 시작: {project_dir} (언어: {language})")
         
@@ -45,100 +73,112 @@ class SemgrepAnalyzer:
             "--config=auto",  # 자동 규칙 선택
             "--sarif",        # SARIF 형식 출력
             "--quiet",        # 불필요한 출력 제거
-            str(project_dir),
+            f"--max-target-bytes={MAX_TARGET_BYTES}",
+            f"--timeout={RULE_TIMEOUT}",
+            f"--timeout-threshold={TIMEOUT_THRESHOLD}",
+            *(f"--exclude={pattern}" for pattern in EXCLUDE_PATTERNS),
+            *([str(t) for t in targets] if targets is not None else [str(project_dir)]),
         ]
         
         try:
+            # SARIF 출력은 바이트 그대로 파서에 넘김 (큰 출력 전체를 str로 디코딩하지 않음)
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
                 timeout=180,
             )
             
             # Semgrep은 취약점을 발견하면 exit code 1을 반환
             if result.returncode not in [0, 1]:
                 logger.warning(f"Semgrep 실행 중 오류 발생 (Exit code: {result.returncode})")
-                logger.warning(f"stderr: {result.stderr}")
-                return []
-            
-            # SARIF 파싱 (경량화)
-            try:
-                sarif_data = json.loads(result.stdout)
-            except json.JSONDecodeError as e:
-                logger.error(f"Semgrep SARIF 출력 파싱 실패: {e}")
-                logger.debug(f"stdout: {result.stdout[:500]}")
-                return []
-            
-            # 경량화된 결과 추출
-            vulnerabilities = self._parse_sarif_lightweight(sarif_data, project_dir)
-            
-            logger.info(f"Semgrep 분석 완료: {len(vulnerabilities)}개 발견")
-            return vulnerabilities
+                logger.warning(f"stderr: {result.stderr.decode('utf-8', errors='replace')}")
+                return
             
         except subprocess.TimeoutExpired:
             logger.error("Semgrep 실행 시간 초과 (180초)")
-            return []
+            return
         except Exception as e:
             logger.exception(f"Semgrep 실행 중 오류: {e}")
-            return []
+            return
+
+        # 경량화된 결과 추출 (큰 출력은 스트리밍 파싱)
+        count = 0
+        try:
+            for vulnerability in self._parse_sarif_lightweight(iter_sarif_bytes(result.stdout), project_dir):
+                count += 1
+                yield vulnerability
+        except SARIF_DECODE_ERRORS as e:
+            logger.error(f"Semgrep SARIF 출력 파싱 실패: {e}")
+            logger.opt(lazy=True).debug("stdout: {}", lambda: result.stdout[:500])
+            return
+
+        self.completed = True
+        logger.info(f"Semgrep 분석 완료: {count}개 발견")
     
-    def _parse_sarif_lightweight(self, sarif_data: Dict[str, Any], project_dir: Path) -> List[Dict[str, Any]]:
+    def _parse_sarif_lightweight(
+        self,
+        sarif_results: Iterator[Tuple[Dict[str, Any], Dict[str, Any]]],
+        project_dir: Path,
+    ) -> Iterator[Dict[str, Any]]:
         """
         Semgrep SARIF에서 필요한 정보만 추출 (경량화)
         
         LLM에 전달할 때 불필요한 메타데이터를 제거하고 핵심 정보만 추출
+
+        Args:
+            sarif_results: (run.tool, result) 쌍 (sarif_reader.iter_sarif_bytes)
+            project_dir: 프로젝트 디렉토리
         """
-        vulnerabilities = []
-        
-        for run in sarif_data.get("runs", []):
-            # 규칙 정보 추출 (간소화)
-            rules = {}
-            for rule in run.get("tool", {}).get("driver", {}).get("rules", []):
-                rule_id = rule.get("id")
-                rules[rule_id] = {
-                    "name": rule.get("shortDescription", {}).get("text", rule_id),
-                    "severity": rule.get("properties", {}).get("security-severity", "5.0"),
-                    # 긴 설명은 제외 (LLM에 불필요)
+        rules: Dict[str, Dict[str, Any]] = {}
+        current_tool = None
+        for tool, result in sarif_results:
+            # run이 바뀔 때만 규칙 정보를 다시 추출 (간소화)
+            if tool is not current_tool:
+                current_tool = tool
+                rules = {
+                    rule.get("id"): {
+                        "name": rule.get("shortDescription", {}).get("text", rule.get("id")),
+                        # 결과마다 점수를 파싱하지 않도록 규칙 단위로 한 번만 매핑
+                        "severity": self._map_severity(rule.get("properties", {}).get("security-severity", "5.0")),
+                        # 긴 설명은 제외 (LLM에 불필요)
+                    }
+                    for rule in tool.get("driver", {}).get("rules", [])
                 }
-            
+
             # 결과 추출 (핵심 정보만)
-            for result in run.get("results", []):
-                rule_id = result.get("ruleId")
-                message = result.get("message", {}).get("text", "")
+            rule_id = result.get("ruleId")
+            message = result.get("message", {}).get("text", "")
+            
+            # 위치 정보
+            for location in result.get("locations", []):
+                phys_loc = location.get("physicalLocation", {})
+                artifact_loc = phys_loc.get("artifactLocation", {})
+                uri = artifact_loc.get("uri", "")
                 
-                # 위치 정보
-                for location in result.get("locations", []):
-                    phys_loc = location.get("physicalLocation", {})
-                    artifact_loc = phys_loc.get("artifactLocation", {})
-                    uri = artifact_loc.get("uri", "")
-                    
-                    if not uri:
-                        continue
-                    
-                    region = phys_loc.get("region", {})
-                    line = region.get("startLine", 1)
-                    
-                    # 코드 스니펫 (짧게)
-                    snippet = region.get("snippet", {}).get("text", "")
-                    if len(snippet) > 200:
-                        snippet = snippet[:200] + "..."
-                    
-                    rule_info = rules.get(rule_id, {})
-                    
-                    vulnerabilities.append({
-                        "file": uri,
-                        "line": line,
-                        "rule_id": rule_id,
-                        "rule_name": rule_info.get("name", rule_id),
-                        "message": message,
-                        "severity": self._map_severity(rule_info.get("severity", "5.0")),
-                        "code": snippet,  # 짧은 스니펫만
-                        "tool_name": "Semgrep",
-                        "tool_metadata": run.get("tool", {}),
-                    })
-        
-        return vulnerabilities
+                if not uri:
+                    continue
+                
+                region = phys_loc.get("region", {})
+                line = region.get("startLine", 1)
+                
+                # 코드 스니펫 (짧게)
+                snippet = region.get("snippet", {}).get("text", "")
+                if len(snippet) > 200:
+                    snippet = snippet[:200] + "..."
+                
+                rule_info = rules.get(rule_id, {})
+                
+                yield {
+                    "file": uri,
+                    "line": line,
+                    "rule_id": rule_id,
+                    "rule_name": rule_info.get("name", rule_id),
+                    "message": message,
+                    "severity": rule_info.get("severity", _DEFAULT_SEVERITY),
+                    "code": snippet,  # 짧은 스니펫만
+                    "tool_name": "Semgrep",
+                    "tool_metadata": tool,
+                }
     
     def _map_severity(self, semgrep_severity: str) -> str:
         """Semgrep severity (0-10)를 표준 severity로 매핑"""
@@ -1,34 +1,72 @@
 
 import subprocess
-import json
+import tempfile
 from pathlib import Path
 import os
 import shutil
-from typing import List, Dict, Any
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional
 from loguru import logger
 
+from sarif_cli.core.cmd import get_tool_version, write_javac_argfile
+from sarif_cli.core.detector import FileIndex, get_file_index
+from sarif_cli.core.sarif_reader import SARIF_DECODE_ERRORS, iter_sarif_results, rule_short_descriptions
+
+# 소스가 이 개수 이상이면 javac를 패키지 단위로 나누어 병렬 실행 (작은 프로젝트는 JVM 기동 비용이 더 큼)
+PARALLEL_JAVAC_THRESHOLD = 500
+# 병렬 javac 프로세스 수 상한 (javac마다 JVM 힙을 따로 사용)
+MAX_JAVAC_WORKERS = 4
+
+
+def _shard_sources(java_files: List[Path], shards: int) -> List[List[Path]]:
+    """
+    소스를 디렉토리(패키지) 단위로 묶어 파일 수가 비슷한 shards개 묶음으로 나눕니다.
+    큰 패키지부터 가장 작은 묶음에 배정합니다.
+    """
+    packages: Dict[Path, List[Path]] = defaultdict(list)
+    for f in java_files:
+        packages[f.parent].append(f)
+    buckets: List[List[Path]] = [[] for _ in range(shards)]
+    for files in sorted(packages.values(), key=len, reverse=True):
+        min(buckets, key=len).extend(files)
+    return [b for b in buckets if b]
+
+
+@lru_cache(maxsize=1)
+def _detect_spotbugs_home() -> Optional[Path]:
+    """
+    SPOTBUGS_HOME 또는 홈 디렉토리의 spotbugs-* 중 이름이 가장 큰(최신) 디렉토리 (프로세스당 한 번 탐색)
+    """
+    env_home = os.environ.get("SPOTBUGS_HOME")
+    if env_home and Path(env_home).exists():
+        return Path(env_home)
+
+    # 정렬 없이 한 번 순회하여 최댓값 선택 (압축 파일 등 디렉토리가 아닌 항목은 제외)
+    latest = max((p for p in Path.home().glob("spotbugs-*") if p.is_dir()), key=lambda p: p.name, default=None)
+    if latest is not None:
+        logger.info(f"자동 감지된 SpotBugs 설치 경로: {latest}")
+    return latest
+
+
 class SpotBugsWrapper:
     """SpotBugs 실행 및 SARIF 결과 파싱을 위한 래퍼"""
 
     def __init__(self, spotbugs_home: str = ""):
         self.spotbugs_home = self._find_spotbugs_home(spotbugs_home)
         self.spotbugs_cmd = self._get_spotbugs_cmd()
+        # 마지막 analyze가 보고서를 끝까지 파싱했는지 (실패한 실행의 빈 결과를 캐시하지 않도록)
+        self.completed = False
+
+    def version(self) -> Optional[str]:
+        """설치된 SpotBugs 버전 (캐시 무효화 키로 사용)"""
+        return get_tool_version(self.spotbugs_cmd, "-version") if self.spotbugs_cmd else None
 
     def _find_spotbugs_home(self, provided_home: str) -> Path:
         if provided_home and Path(provided_home).exists():
             return Path(provided_home)
-        
-        env_home = os.environ.get("SPOTBUGS_HOME")
-        if env_home and Path(env_home).exists():
-            return Path(env_home)
-
-        home_dir = Path.home()
-        spotbugs_dirs = sorted(list(home_dir.glob("spotbugs-*")), reverse=True)
-        if spotbugs_dirs:
-            logger.info(f"자동 감지된 SpotBugs 설치 경로: {spotbugs_dirs[0]}")
-            return spotbugs_dirs[0]
-
-        return None
+        return _detect_spotbugs_home()
 
     def _get_spotbugs_cmd(self) -> str:
         if self.spotbugs_home:
@@ -50,8 +88,10 @@ class SpotBugsWrapper:
         logger.error("또는 ./install_spotbugs.sh 스크립트를 실행하여 설치할 수 있습니다.")
         return False
 
-    def _compile_java_files(self, project_dir: Path) -> Path:
-        java_files = list(project_dir.rglob("*.java"))
+    def _compile_java_files(self, project_dir: Path, file_index: Optional[FileIndex] = None) -> Path:
+        if file_index is None:
+            file_index = get_file_index(project_dir)
+        java_files = file_index.get(".java")
         if not java_files:
             logger.warning("컴파일할 Java 소스 파일이 없습니다.")
             return None
@@ -61,105 +101,159 @@ class SpotBugsWrapper:
         
         logger.info(f"Java 파일 컴파일 시작... ({len(java_files)}개)")
         
-        cmd = ["javac", "-d", str(compile_dir), "-sourcepath", str(project_dir)] + [str(f) for f in java_files]
-        
+        workers = 1
+        if len(java_files) >= PARALLEL_JAVAC_THRESHOLD:
+            workers = min(MAX_JAVAC_WORKERS, os.cpu_count() or 1)
+        shards = _shard_sources(java_files, workers) if workers > 1 else [java_files]
+
+        # 소스 목록은 인자 파일로 넘겨 명령줄 길이 제한(ARG_MAX)을 피함
+        with tempfile.TemporaryDirectory(prefix="spotbugs_javac_") as tmp_dir:
+            if len(shards) == 1:
+                ok = self._run_javac(project_dir, compile_dir, shards[0], Path(tmp_dir) / "sources.txt")
+            else:
+                logger.info(f"javac {len(shards)}개 프로세스로 병렬 컴파일")
+                with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                    futures = [
+                        executor.submit(
+                            self._run_javac,
+                            project_dir,
+                            compile_dir,
+                            shard,
+                            Path(tmp_dir) / f"sources_{idx}.txt",
+                            # 다른 묶음의 소스는 참조 해석에만 사용하고 class 파일은 만들지 않음 (같은 파일을 동시에 쓰지 않도록)
+                            ["-implicit:none"],
+                        )
+                        for idx, shard in enumerate(shards)
+                    ]
+                    ok = all([f.result() for f in futures])
+
+        if not ok:
+            return None
+        logger.info("Java 파일 컴파일 성공.")
+        return compile_dir
+
+    def _run_javac(
+        self,
+        project_dir: Path,
+        compile_dir: Path,
+        sources: List[Path],
+        argfile: Path,
+        extra_args: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        javac 한 번으로 sources를 compile_dir에 컴파일합니다.
+
+        Args:
+            project_dir: 프로젝트 디렉토리 (-sourcepath)
+            compile_dir: class 파일 출력 디렉토리
+            sources: 컴파일할 소스 파일
+            argfile: 소스 목록을 기록할 javac 인자 파일 경로
+            extra_args: 추가 javac 옵션
+
+        Returns:
+            컴파일 성공 여부
+        """
+        write_javac_argfile(argfile, sources)
+        cmd = ["javac", "-d", str(compile_dir), "-sourcepath", str(project_dir), *(extra_args or []), f"@{argfile}"]
+
         try:
             process = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
-            logger.info("Java 파일 컴파일 성공.")
-            logger.debug(f"javac stdout: {process.stdout}")
-            return compile_dir
+            logger.debug("javac stdout: {}", process.stdout)
+            return True
         except FileNotFoundError:
             logger.error("`javac` 명령을 찾을 수 없습니다. JDK가 설치되어 있고 PATH에 등록되어 있는지 확인하세요.")
-            return None
+            return False
         except subprocess.CalledProcessError as e:
             logger.error(f"Java 컴파일 실패. 반환 코드: {e.returncode}")
             logger.error(f"javac stderr: {e.stderr}")
-            return None
+            return False
 
-    def analyze(self, project_dir: Path) -> List[Dict[str, Any]]:
-        classes_dir = self._compile_java_files(project_dir)
+    def analyze(self, project_dir: Path, file_index: Optional[FileIndex] = None) -> Iterator[Dict[str, Any]]:
+        self.completed = False
+        classes_dir = self._compile_java_files(project_dir, file_index)
         if not classes_dir:
-            return []
+            return
 
-        output_sarif = project_dir / "spotbugs_report.sarif"
-        
-        spotbugs_command = [
-            self.spotbugs_cmd,
-            "-sarif",
-            f"-output",
-            str(output_sarif),
-            "-sourcepath",
-            str(project_dir),
-            str(classes_dir)
-        ]
-
-        logger.info("SpotBugs 분석 실행 중 (SARIF 모드)...")
-        try:
-            process = subprocess.run(spotbugs_command, capture_output=True, text=True, check=False, encoding='utf-8')
-            if process.returncode != 0:
-                 logger.warning(f"SpotBugs 실행 중 오류 발생 (Exit code: {process.returncode})")
-                 logger.warning(f"SpotBugs stdout: {process.stdout}")
-                 logger.warning(f"SpotBugs stderr: {process.stderr}")
+        # 보고서는 임시 디렉토리(보통 tmpfs/page cache)에 쓰고 파싱 후 삭제 -
+        # 프로젝트 디렉토리를 더럽히지 않고, 이전 실행이 남긴 보고서를 잘못 파싱하지 않음
+        with tempfile.TemporaryDirectory(prefix="spotbugs_report_") as report_dir:
+            output_sarif = Path(report_dir) / "spotbugs_report.sarif"
+            
+            spotbugs_command = [
+                self.spotbugs_cmd,
+                "-sarif",
+                f"-output",
+                str(output_sarif),
+                "-sourcepath",
+                str(project_dir),
+                str(classes_dir)
+            ]
 
-        except FileNotFoundError:
-            logger.error("SpotBugs 실행 파일을 찾을 수 없습니다.")
-            return []
+            logger.info("SpotBugs 분석 실행 중 (SARIF 모드)...")
+            try:
+                process = subprocess.run(spotbugs_command, capture_output=True, text=True, check=False, encoding='utf-8')
+                if process.returncode != 0:
+                     logger.warning(f"SpotBugs 실행 중 오류 발생 (Exit code: {process.returncode})")
+                     logger.warning(f"SpotBugs stdout: {process.stdout}")
+                     logger.warning(f"SpotBugs stderr: {process.stderr}")
+
+            except FileNotFoundError:
+                logger.error("SpotBugs 실행 파일을 찾을 수 없습니다.")
+                return
         
-        if not output_sarif.exists():
-            logger.error("SpotBugs가 SARIF 보고서 파일을 생성하지 않았습니다.")
-            return []
+            if not output_sarif.exists():
+                logger.error("SpotBugs가 SARIF 보고서 파일을 생성하지 않았습니다.")
+                return
 
-        logger.info(f"SpotBugs SARIF 보고서 파싱: {output_sarif}")
-        return self._parse_sarif_report(output_sarif, project_dir)
+            logger.info(f"SpotBugs SARIF 보고서 파싱: {output_sarif}")
+            yield from self._parse_sarif_report(output_sarif, project_dir)
 
-    def _parse_sarif_report(self, report_path: Path, project_dir: Path) -> List[Dict[str, Any]]:
-        results = []
+    def _parse_sarif_report(self, report_path: Path, project_dir: Path) -> Iterator[Dict[str, Any]]:
         try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                sarif_data = json.load(f)
-
-            for run in sarif_data.get("runs", []):
-                rules = {rule['id']: rule for rule in run.get("tool", {}).get("driver", {}).get("rules", [])}
-                
-                for result in run.get("results", []):
-                    rule_id = result.get("ruleId")
-                    message = result.get("message", {}).get("text", "")
-                    level = result.get("level", "warning")
-
-                    if not rule_id or not message:
-                        continue
+            rule_names: Dict[str, str] = {}
+            current_tool = None
+            for tool, result in iter_sarif_results(report_path):
+                # run이 바뀔 때만 규칙 이름 맵을 다시 생성 (결과가 없는 run은 만들지 않음)
+                if tool is not current_tool:
+                    current_tool = tool
+                    rule_names = rule_short_descriptions(tool)
 
-                    for location in result.get("locations", []):
-                        phys_loc = location.get("physicalLocation", {})
-                        artifact_loc = phys_loc.get("artifactLocation", {})
-                        uri = artifact_loc.get("uri")
-                        
-                        if not uri:
-                            continue
-                            
-                        region = phys_loc.get("region", {})
-                        line = region.get("startLine", 1)
-
-                        rule_info = rules.get(rule_id, {})
-                        rule_name = rule_info.get("shortDescription", {}).get("text", rule_id)
+                rule_id = result.get("ruleId")
+                message = result.get("message", {}).get("text", "")
+                level = result.get("level", "warning")
+
+                if not rule_id or not message:
+                    continue
+
+                rule_name = rule_names.get(rule_id, rule_id)
+
+                for location in result.get("locations", []):
+                    phys_loc = location.get("physicalLocation", {})
+                    artifact_loc = phys_loc.get("artifactLocation", {})
+                    uri = artifact_loc.get("uri")
+                    
+                    if not uri:
+                        continue
                         
-                        results.append({
-                            "file": uri,
-                            "line": line,
-                            "rule_id": rule_id,
-                            "rule_name": rule_name,
-                            "message": message,
-                            "severity": self._map_severity(level),
-                        })
+                    region = phys_loc.get("region", {})
+                    line = region.get("startLine", 1)
+
+                    yield {
+                        "file": uri,
+                        "line": line,
+                        "rule_id": rule_id,
+                        "rule_name": rule_name,
+                        "message": message,
+                        "severity": self._map_severity(level),
+                    }
+            self.completed = True
 
         except FileNotFoundError:
             logger.error(f"SARIF 파일을 찾을 수 없습니다: {report_path}")
-        except json.JSONDecodeError:
+        except SARIF_DECODE_ERRORS:
             logger.error(f"SARIF 파일이 올바른 JSON 형식이 아닙니다: {report_path}")
         except Exception as e:
             logger.exception(f"SARIF 보고서 처리 중 예외 발생: {e}")
-            
-        return results
 
     def _map_severity(self, level: str) -> str:
         if level == "error":